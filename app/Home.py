@@ -10,7 +10,8 @@ from app_pages import (
     point_based_fit,
     parameter_based_fit,
     historical_data_fit,
-    fmea_based_fit
+    fmea_based_fit,
+    llm_admin
 )
 
 # Set page configuration
@@ -42,8 +43,10 @@ with st.sidebar:
             "Historical Data Fit"
         ])
     elif selected_section == "FMEA Tools":
+        # The admin page is only offered when the deployment enables it
         selected_page = st.radio("", [
-            "FMEA Generation"
+            "FMEA Generation",
+            *(["LLM Metrics"] if llm_admin.ADMIN_ENABLED else [])
         ])
 
 # Page routing
@@ -60,6 +63,8 @@ if selected_section == "Curve Fitting":
 elif selected_section == "FMEA Tools":
     if selected_page == "FMEA Generation":
         fmea_based_fit.show()
+    elif selected_page == "LLM Metrics":
+        llm_admin.show()
 
 else:
     # Default home content
@@ -1,19 +1,533 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 import os
 import json
 import io
+from collections.abc import Mapping
 from datetime import datetime
 
-from utils.openai_service import generate_fmea_with_gpt
-from utils.weibull import generate_weibull_data
+from utils.openai_service import generate_fmea_with_gpt, stream_fmea_with_gpt, find_stored_fmea
+from utils.fmea_cache import fmea_cache
+from utils.fmea_library import fmea_library, DEFAULT_MIN_SIMILARITY
+from components.fmea_batch_generation import batch_generation_interface
+from utils.fmea_results import FMEAResultStore, DEFAULT_BETA, DEFAULT_ETA
+from utils.weibull import (
+    generate_weibull_data,
+    renewal_function,
+    optimize_replacement,
+    competing_risks,
+    simulate_fleet_failures,
+)
 from utils.asset_data import (
     get_asset_types,
     get_operating_characteristics,
     get_default_failure_modes,
+    get_temperature_profiles,
 )
+from utils.operating_profile import arrhenius_factor, profile_reliability
+from utils.export import get_columnar_download, COLUMNAR_FORMATS, COLUMNAR_AVAILABLE
+
+# Horizon for the with-replacement failure forecast in the exports (10 years, in hours)
+RENEWAL_HORIZON_HOURS = 10 * 8760
+
+def stream_failure_modes(asset_type, characteristics, use_cache=True, use_library=True,
+                         min_similarity=DEFAULT_MIN_SIMILARITY):
+    """Stream an FMEA, rendering each failure mode's table row and reliability curve as it completes."""
+    failure_modes = []
+    weibull_data = {}
+    table_placeholder = st.empty()
+    chart_placeholder = st.empty()
+    fig = go.Figure()
+    fig.update_layout(
+        title="Reliability by Failure Mode (generating...)",
+        xaxis_title="Time (hours)",
+        yaxis_title="Reliability",
+        width=800
+    )
+
+    for mode in stream_fmea_with_gpt(asset_type, characteristics, use_cache=use_cache,
+                                     use_library=use_library, min_similarity=min_similarity):
+        mode_name = mode["failure_mode"]
+        data = generate_weibull_data(mode.get("weibull_beta", DEFAULT_BETA), mode.get("weibull_eta", DEFAULT_ETA))
+        failure_modes.append(mode)
+        weibull_data[mode_name] = data
+
+        fig.add_trace(go.Scatter(x=data["time"], y=data["reliability"], name=mode_name))
+        table_placeholder.dataframe(pd.DataFrame(failure_modes), use_container_width=True)
+        chart_placeholder.plotly_chart(fig)
+
+    return failure_modes, weibull_data
+
+def characteristic_input(char_name, char_options):
+    """Render the input widget for one catalog characteristic and return its value."""
+    if isinstance(char_options, Mapping) and char_options.get("type") == "range":
+        # Handle range with step size
+        return st.slider(
+            f"{char_name}",
+            min_value=char_options.get("min", 0),
+            max_value=char_options.get("max", 100),
+            value=char_options.get("default", char_options.get("min", 0)),
+            step=char_options.get("step", 1),
+            key=f"char_{char_name}"
+        )
+    if isinstance(char_options, bool):
+        # Handle boolean options
+        return st.checkbox(
+            f"{char_name}",
+            value=char_options,
+            key=f"char_{char_name}"
+        )
+    # Handle options list
+    return st.selectbox(
+        f"{char_name}",
+        options=char_options,
+        key=f"char_{char_name}"
+    )
+
+# View-models for the results tabs. Each takes the FMEA result store and is memoized
+# on it through FMEAResultStore.view(), so a figure is built once per FMEA and inputs.
+
+def rpn_chart_view(fmea_store):
+    """RPN bar chart, highest first; None when the FMEA has no RPNs."""
+    fmea_df = fmea_store.display_table
+    if 'rpn' not in fmea_df.columns or 'failure_mode' not in fmea_df.columns:
+        return None
+    return px.bar(
+        fmea_df.sort_values(by='rpn', ascending=False),
+        x='rpn',
+        y='failure_mode',
+        orientation='h',
+        color='rpn',
+        color_continuous_scale=[(0, "green"), (0.5, "yellow"), (1, "red")],
+        labels={'rpn': 'Risk Priority Number', 'failure_mode': 'Failure Mode'}
+    )
+
+def failure_probability_view(fmea_store):
+    """Failure probability curves of every mode on one chart."""
+    fig = go.Figure()
+    colors = px.colors.qualitative.Plotly  # Get a color palette
+    
+    for i, (mode_name, data) in enumerate(fmea_store.curves.items()):
+        color_idx = i % len(colors)  # Cycle through colors if more modes than colors
+        fig.add_trace(go.Scatter(
+            x=data['time'],
+            y=data['failure_probability'],
+            mode='lines',
+            name=mode_name,
+            line=dict(color=colors[color_idx]),
+        ))
+    
+    fig.update_layout(
+        xaxis_title="Time (hours)",
+        yaxis_title="Failure Probability",
+        legend_title="Failure Modes",
+        hovermode="x unified"
+    )
+    return fig
+
+def system_reliability_view(fmea_store):
+    """Competing-risks figure and the dominant mode by age range."""
+    colors = px.colors.qualitative.Plotly
+    mode_names = list(fmea_store.curves.keys())
+    mode_betas, mode_etas = fmea_store.parameters(mode_names)
+    
+    # The system fails no later than its earliest mode, so stop where that mode is nearly certain to have failed
+    system_max_time = np.min(mode_etas * np.log(1000) ** (1 / mode_betas))
+    risks = competing_risks(mode_betas, mode_etas, np.linspace(0, system_max_time, 500))
+    
+    fig = go.Figure()
+    for i, mode_name in enumerate(mode_names):
+        fig.add_trace(go.Scatter(
+            x=risks['time'],
+            y=risks['cumulative_incidence'][i],
+            mode='lines',
+            name=mode_name,
+            stackgroup='incidence',
+            line=dict(color=colors[i % len(colors)]),
+        ))
+    fig.add_trace(go.Scatter(
+        x=risks['time'],
+        y=risks['system_reliability'],
+        mode='lines',
+        name='System Reliability',
+        line=dict(color='black', width=3),
+    ))
+    fig.update_layout(
+        xaxis_title="Time (hours)",
+        yaxis_title="Probability",
+        legend_title="Cumulative Incidence by Mode",
+        hovermode="x unified"
+    )
+    
+    # Summarize which mode has the highest hazard over each age range
+    dominant = risks['dominant_mode']
+    change_points = np.flatnonzero(np.diff(dominant)) + 1
+    starts = np.concatenate(([0], change_points))
+    ends = np.concatenate((change_points, [len(dominant)])) - 1
+    dominant_df = pd.DataFrame({
+        "From (hours)": risks['time'][starts].round(0),
+        "To (hours)": risks['time'][ends].round(0),
+        "Dominant Failure Mode": [mode_names[i] for i in dominant[starts]],
+    })
+    return fig, dominant_df
+
+def mode_detail_view(fmea_store, selected_mode):
+    """Failure probability/reliability figure and life table of one mode."""
+    mode_details = fmea_store.row(selected_mode)
+    data = fmea_store.curves[selected_mode]
+    
+    # Create figure with 2 y-axes
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=data['time'],
+        y=data['failure_probability'],
+        name='Failure Probability',
+        line=dict(color='red')
+    ))
+    fig.add_trace(go.Scatter(
+        x=data['time'],
+        y=data['reliability'],
+        name='Reliability',
+        line=dict(color='green'),
+        yaxis="y2"
+    ))
+    
+    fig.update_layout(
+        xaxis=dict(title="Time (hours)"),
+        yaxis=dict(
+            title=dict(
+                text="Failure Probability",
+                font=dict(color="red")
+            ),
+            tickfont=dict(color="red")
+        ),
+        yaxis2=dict(
+            title=dict(
+                text="Reliability",
+                font=dict(color="green")
+            ),
+            tickfont=dict(color="green"),
+            anchor="x",
+            overlaying="y",
+            side="right"
+        ),
+        legend=dict(x=0.01, y=0.99, bordercolor="Black", borderwidth=1),
+        hovermode="x unified"
+    )
+    
+    # Life characteristics; first grid point reaching each level (the first point when none does)
+    failure_probability = np.asarray(data['failure_probability'])
+    time_points = np.asarray(data['time'])
+    mttf = mode_details.get('mttf', time_points[-1] * 0.5)  # Default to a sensible value if not provided
+    b10_index = int(np.argmax(failure_probability >= 0.10))
+    b50_index = int(np.argmax(failure_probability >= 0.50))
+    reached = time_points >= 10000
+    index_10k = int(np.argmax(reached)) if reached.any() else -1
+    
+    life_df = pd.DataFrame([
+        {"metric": "Mean Time To Failure (MTTF)", "value": f"{mttf:.2f} hours"},
+        {"metric": "B10 Life (10% fail)", "value": f"{time_points[b10_index]:.2f} hours"},
+        {"metric": "B50 Life (50% fail)", "value": f"{time_points[b50_index]:.2f} hours"},
+        {"metric": "Reliability at 10,000 hours", "value": f"{data['reliability'][index_10k] * 100:.2f}%"},
+    ])
+    return fig, life_df
+
+def operating_profile_view(fmea_store, selected_mode, profile_name, reference_temperature, activation_energy):
+    """Reliability of one mode under a seasonal temperature profile vs constant stress."""
+    data = fmea_store.curves[selected_mode]
+    (beta,), (eta,) = fmea_store.parameters([selected_mode])
+    monthly_factors = arrhenius_factor(get_temperature_profiles()[profile_name], reference_temperature, activation_energy)
+    profile_time = np.asarray(data['time'])
+    profile_rel = profile_reliability(beta, eta, np.full(12, 8760 / 12), monthly_factors, profile_time)
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=data['time'],
+        y=data['reliability'],
+        name='Constant Reference Stress',
+        line=dict(color='green')
+    ))
+    fig.add_trace(go.Scatter(
+        x=profile_time,
+        y=profile_rel,
+        name=f'{profile_name} Profile',
+        line=dict(color='orange')
+    ))
+    fig.update_layout(
+        xaxis=dict(title="Time (hours)"),
+        yaxis=dict(title="Reliability"),
+        hovermode="x unified"
+    )
+    return fig, float(np.mean(monthly_factors))
+
+def replacement_view(fmea_store, cost_preventive, cost_failure, policy):
+    """Cost-optimal preventive replacement of every mode, in one batched call."""
+    mode_names = list(fmea_store.curves.keys())
+    mode_betas, mode_etas = fmea_store.parameters(mode_names)
+    replacement = optimize_replacement(
+        mode_betas,
+        mode_etas,
+        cost_preventive,
+        cost_failure,
+        policy="age" if policy == "Age Replacement" else "block"
+    )
+    
+    replacement_df = pd.DataFrame({
+        "Failure Mode": mode_names,
+        "Optimal Interval (hours)": [f"{age:,.0f}" if np.isfinite(age) else "Run to failure" for age in replacement["optimal_age"]],
+        "Cost Rate at Optimum": replacement["optimal_cost_rate"],
+        "Run-to-failure Cost Rate": replacement["run_to_failure_cost_rate"],
+    })
+    return replacement, replacement_df
+
+def replacement_cost_view(fmea_store, selected_mode, cost_preventive, cost_failure, policy):
+    """Cost rate against replacement interval for one mode, with its optimum."""
+    replacement, _ = fmea_store.view("replacement", replacement_view, cost_preventive, cost_failure, policy)
+    row = list(fmea_store.curves.keys()).index(selected_mode)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=replacement["ages"][row, 1:],
+        y=replacement["cost_rate"][row, 1:],
+        name="Cost Rate"
+    ))
+    if np.isfinite(replacement["optimal_age"][row]):
+        fig.add_trace(go.Scatter(
+            x=[replacement["optimal_age"][row]],
+            y=[replacement["optimal_cost_rate"][row]],
+            mode="markers",
+            name="Optimum",
+            marker=dict(size=12, color="red")
+        ))
+    fig.update_layout(
+        title=f"Long-run Cost Rate: {selected_mode}",
+        xaxis_title="Replacement Interval (hours)",
+        yaxis_title="Cost per Hour",
+        yaxis=dict(range=[0, replacement["run_to_failure_cost_rate"][row] * 3])
+    )
+    return fig
+
+def fleet_simulation_view(fmea_store, n_assets, horizon_years, current_age_years, n_replications, downtime_hours):
+    """Monte Carlo failure forecast for a fleet of identical assets, one renewal process per mode."""
+    mode_names = list(fmea_store.curves.keys())
+    mode_betas, mode_etas = fmea_store.parameters(mode_names)
+    fleet = [
+        {"name": mode_name, "beta": mode_betas[i], "eta": mode_etas[i], "count": n_assets,
+         "ages": current_age_years * 8760, "downtime": downtime_hours}
+        for i, mode_name in enumerate(mode_names)
+    ]
+    # Fixed seed so reruns with the same inputs show the same forecast
+    forecast = simulate_fleet_failures(fleet, horizon_years * 8760, period=8760,
+                                       n_replications=n_replications, seed=0)
+    years = forecast["period_start"] / 8760 + 1
+    total = forecast["total"]
+    
+    colors = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for i, mode_name in enumerate(mode_names):
+        fig.add_trace(go.Bar(
+            x=years,
+            y=forecast["classes"][mode_name]["failures_mean"],
+            name=mode_name,
+            marker_color=colors[i % len(colors)],
+        ))
+    fig.add_trace(go.Scatter(
+        x=years,
+        y=total["failures_mean"],
+        mode='markers',
+        name='Total (5th-95th percentile)',
+        marker=dict(color='black'),
+        error_y=dict(
+            type='data',
+            symmetric=False,
+            array=total["failures_p95"] - total["failures_mean"],
+            arrayminus=total["failures_mean"] - total["failures_p05"],
+        ),
+    ))
+    fig.update_layout(
+        barmode='stack',
+        xaxis_title="Year",
+        yaxis_title="Failures per Year",
+        legend_title="Failure Mode",
+        hovermode="x unified"
+    )
+    
+    forecast_df = pd.DataFrame({
+        "Year": years.astype(int),
+        "Expected Failures": total["failures_mean"].round(2),
+        "5th Percentile": total["failures_p05"],
+        "95th Percentile": total["failures_p95"],
+        "Expected Downtime (hours)": total["downtime_mean"].round(1),
+    })
+    return fig, forecast_df
+
+def export_tables_view(fmea_store):
+    """Per-mode Weibull summary (as records and a table) and the renewal function table."""
+    weibull_summary = []
+    renewal_years = np.arange(0, RENEWAL_HORIZON_HOURS // 8760 + 1)
+    renewal_table = {"time_hours": renewal_years * 8760}
+    mode_names = list(fmea_store.curves.keys())
+    export_betas, export_etas = fmea_store.parameters(mode_names)
+    for i, mode_name in enumerate(mode_names):
+        data = fmea_store.curves[mode_name]
+        failure_probability = np.asarray(data['failure_probability'])
+        
+        # First grid points reaching 10% and 50% failure probability (B10 and B50 life)
+        idx_10pct = int(np.argmax(failure_probability >= 0.10))
+        idx_50pct = int(np.argmax(failure_probability >= 0.50))
+        
+        # Find MTTF from the corresponding failure mode
+        mode_details = fmea_store.row(mode_name)
+        mttf = mode_details.get('mttf', data['time'][-1] * 0.5)
+        
+        # Expected failures per installed position when failed units are replaced
+        renewal = renewal_function(export_betas[i], export_etas[i], RENEWAL_HORIZON_HOURS)
+        renewal_table[mode_name] = np.interp(
+            renewal_table["time_hours"], renewal["time"], renewal["renewal_function"]
+        )
+        
+        weibull_summary.append({
+            "failure_mode": mode_name,
+            "beta": mode_details.get('weibull_beta', 'N/A'),
+            "eta": mode_details.get('weibull_eta', 'N/A'),
+            "mttf": mttf,
+            "b10_life": data['time'][idx_10pct],
+            "b50_life": data['time'][idx_50pct],
+            "expected_failures_10y_with_replacement": float(renewal["renewal_function"][-1]),
+        })
+    
+    return weibull_summary, pd.DataFrame(weibull_summary), pd.DataFrame(renewal_table)
+
+@st.fragment
+def mode_analysis_section(fmea_store, temperature_profile):
+    """
+    Detailed analysis of the selected failure mode and the replacement policy table.
+    
+    Runs as a fragment: selecting a mode or changing an input reruns only this section,
+    and only the views whose inputs changed are rebuilt.
+    """
+    # 3. Allow individual Weibull curve analysis
+    st.subheader("Detailed Analysis by Failure Mode")
+    selected_mode = st.selectbox(
+        "Select Failure Mode",
+        options=list(fmea_store.curves.keys())
+    )
+    
+    if selected_mode:
+        # Get failure mode details from FMEA results
+        mode_details = fmea_store.row(selected_mode)
+        
+        # Display mode details
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Severity", mode_details.get("severity", "N/A"))
+        with col2:
+            st.metric("Occurrence", mode_details.get("occurrence", "N/A"))
+        with col3:
+            st.metric("Detection", mode_details.get("detection", "N/A"))
+        
+        # Display Weibull parameters
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Weibull Shape (β)", f"{mode_details.get('weibull_beta', 'N/A')}")
+        with col2:
+            st.metric("Weibull Scale (η)", f"{mode_details.get('weibull_eta', 'N/A')} hours")
+        
+        # Show individual Weibull curve and life characteristics
+        fig, life_df = fmea_store.view("mode_detail", mode_detail_view, selected_mode)
+        st.plotly_chart(fig, use_container_width=True)
+        st.subheader("Life Characteristics")
+        st.table(life_df)
+        
+        # Reliability under a seasonal temperature profile (cumulative damage)
+        with st.expander("Operating Profile Adjustment"):
+            temperature_profiles = get_temperature_profiles()
+            profile_names = list(temperature_profiles.keys())
+            prof_col1, prof_col2, prof_col3 = st.columns(3)
+            with prof_col1:
+                profile_name = st.selectbox(
+                    "Seasonal Temperature Profile",
+                    options=profile_names,
+                    index=profile_names.index(temperature_profile) if temperature_profile in profile_names else 0,
+                    key="fmea_profile_name"
+                )
+            with prof_col2:
+                reference_temperature = st.number_input(
+                    "Reference Temperature (°C)",
+                    value=float(np.mean(temperature_profiles["Normal"])),
+                    help="Ambient temperature at which the FMEA eta applies",
+                    key="fmea_reference_temperature"
+                )
+            with prof_col3:
+                activation_energy = st.slider(
+                    "Activation Energy (eV)",
+                    min_value=0.1,
+                    max_value=1.5,
+                    value=0.7,
+                    step=0.05,
+                    key="fmea_activation_energy"
+                )
+            
+            fig, mean_factor = fmea_store.view(
+                "operating_profile", operating_profile_view,
+                selected_mode, profile_name, reference_temperature, activation_energy
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            st.write(f"Average acceleration factor over the year: {mean_factor:.2f}")
+    
+    # 4. Cost-optimal preventive replacement for every mode in one batched call
+    st.subheader("Preventive Replacement by Failure Mode")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        cost_preventive = st.number_input("Planned replacement cost", min_value=0.0, value=1.0, key="fmea_cost_preventive")
+    with col2:
+        cost_failure = st.number_input("Unplanned (failure) replacement cost", min_value=0.0, value=10.0, key="fmea_cost_failure")
+    with col3:
+        policy = st.radio("Policy", ["Age Replacement", "Block Replacement"], key="fmea_policy")
+    
+    _, replacement_df = fmea_store.view("replacement", replacement_view, cost_preventive, cost_failure, policy)
+    st.dataframe(replacement_df, use_container_width=True)
+    
+    if selected_mode:
+        st.plotly_chart(
+            fmea_store.view("replacement_cost", replacement_cost_view, selected_mode, cost_preventive, cost_failure, policy),
+            use_container_width=True
+        )
+
+@st.fragment
+def fleet_simulation_section(fmea_store):
+    """
+    Fleet failure forecast from the FMEA modes; changing an input reruns only this section.
+    """
+    st.subheader("Fleet Failure Forecast")
+    st.write(
+        "Simulated failures for a fleet of this asset, treating each failure mode as a "
+        "renewal process: a failed unit is repaired or replaced and the mode starts a new life."
+    )
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        n_assets = st.number_input("Number of assets", min_value=1, max_value=10_000, value=100, step=10,
+                                   key="fmea_fleet_assets")
+        current_age_years = st.number_input("Current age (years)", min_value=0.0, value=0.0, step=1.0,
+                                            key="fmea_fleet_age")
+    with col2:
+        horizon_years = st.slider("Planning horizon (years)", min_value=1, max_value=40, value=10,
+                                  key="fmea_fleet_horizon")
+        downtime_hours = st.number_input("Downtime per failure (hours)", min_value=0.0, value=24.0,
+                                         key="fmea_fleet_downtime")
+    with col3:
+        n_replications = st.select_slider("Simulation runs", options=[100, 200, 500, 1000], value=200,
+                                          key="fmea_fleet_replications")
+    
+    with st.spinner("Simulating fleet failures..."):
+        fig, forecast_df = fmea_store.view(
+            "fleet_simulation", fleet_simulation_view,
+            int(n_assets), int(horizon_years), float(current_age_years), int(n_replications), float(downtime_hours)
+        )
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(forecast_df, use_container_width=True)
 
 def show():
 
@@ -65,83 +579,11 @@ def show():
         char_items = list(characteristics.items())
         half = len(char_items) // 2 + len(char_items) % 2  # Ceiling division for odd numbers
         
-        # First half in left column
-        with col1:
-            for char_name, char_options in char_items[:half]:
-                if isinstance(char_options, list):
-                    # Handle options list
-                    selected_characteristics[char_name] = st.selectbox(
-                        f"{char_name}",
-                        options=char_options,
-                        key=f"char_{char_name}"
-                    )
-                elif isinstance(char_options, tuple) and len(char_options) == 3:
-                    # Handle numeric ranges with (min, max, default)
-                    min_val, max_val, default = char_options
-                    selected_characteristics[char_name] = st.slider(
-                        f"{char_name}",
-                        min_value=min_val,
-                        max_value=max_val,
-                        value=default,
-                        key=f"char_{char_name}"
-                    )
-                elif isinstance(char_options, dict) and char_options.get("type") == "range":
-                    # Handle range with step size
-                    range_options = char_options
-                    selected_characteristics[char_name] = st.slider(
-                        f"{char_name}",
-                        min_value=range_options.get("min", 0),
-                        max_value=range_options.get("max", 100),
-                        value=range_options.get("default", range_options.get("min", 0)),
-                        step=range_options.get("step", 1),
-                        key=f"char_{char_name}"
-                    )
-                elif isinstance(char_options, bool):
-                    # Handle boolean options
-                    selected_characteristics[char_name] = st.checkbox(
-                        f"{char_name}",
-                        value=char_options,
-                        key=f"char_{char_name}"
-                    )
-        
-        # Second half in right column
-        with col2:
-            for char_name, char_options in char_items[half:]:
-                if isinstance(char_options, list):
-                    # Handle options list
-                    selected_characteristics[char_name] = st.selectbox(
-                        f"{char_name}",
-                        options=char_options,
-                        key=f"char_{char_name}"
-                    )
-                elif isinstance(char_options, tuple) and len(char_options) == 3:
-                    # Handle numeric ranges with (min, max, default)
-                    min_val, max_val, default = char_options
-                    selected_characteristics[char_name] = st.slider(
-                        f"{char_name}",
-                        min_value=min_val,
-                        max_value=max_val,
-                        value=default,
-                        key=f"char_{char_name}"
-                    )
-                elif isinstance(char_options, dict) and char_options.get("type") == "range":
-                    # Handle range with step size
-                    range_options = char_options
-                    selected_characteristics[char_name] = st.slider(
-                        f"{char_name}",
-                        min_value=range_options.get("min", 0),
-                        max_value=range_options.get("max", 100),
-                        value=range_options.get("default", range_options.get("min", 0)),
-                        step=range_options.get("step", 1),
-                        key=f"char_{char_name}"
-                    )
-                elif isinstance(char_options, bool):
-                    # Handle boolean options
-                    selected_characteristics[char_name] = st.checkbox(
-                        f"{char_name}",
-                        value=char_options,
-                        key=f"char_{char_name}"
-                    )
+        # First half in left column, second half in right column
+        for column, column_items in ((col1, char_items[:half]), (col2, char_items[half:])):
+            with column:
+                for char_name, char_options in column_items:
+                    selected_characteristics[char_name] = characteristic_input(char_name, char_options)
         
         # Advanced options in expandable section
         with st.expander("Advanced Options"):
@@ -150,7 +592,7 @@ def show():
             with adv_col1:
                 temperature_profile = st.selectbox(
                     "Temperature Profile",
-                    options=["Normal", "Extreme Hot", "Extreme Cold", "Highly Variable"],
+                    options=list(get_temperature_profiles()),
                     index=0
                 )
             
@@ -167,6 +609,43 @@ def show():
                     options=["Urban", "Rural", "Coastal", "Industrial", "Desert"],
                     index=0
                 )
+
+            use_cache = st.checkbox(
+                "Reuse a cached FMEA for identical configurations",
+                value=True,
+                help="FMEAs are cached on disk by model, prompt version, asset type and characteristics",
+                key="fmea_use_cache"
+            )
+            stream_results = st.checkbox(
+                "Show failure modes as they are generated",
+                value=True,
+                help="Stream the response and render each failure mode as soon as it is complete",
+                key="fmea_stream_results"
+            )
+            use_library = st.checkbox(
+                "Reuse the FMEA of the nearest stored configuration",
+                value=True,
+                help="Match against past generations and curated FMEAs of the same asset type before calling the LLM",
+                key="fmea_use_library"
+            )
+            min_similarity = st.slider(
+                "Minimum configuration similarity",
+                min_value=0.5,
+                max_value=1.0,
+                value=DEFAULT_MIN_SIMILARITY,
+                step=0.01,
+                help="Share of characteristics that must match (numeric ones partially, by distance)",
+                disabled=not use_library,
+                key="fmea_library_similarity"
+            )
+            cache_stats = fmea_cache.stats()
+            library_stats = fmea_library.stats()
+            st.caption(
+                f"FMEA cache: {cache_stats['entries']} configurations, "
+                f"{cache_stats['stored_hits']} hits saving about {cache_stats['stored_seconds_saved']:.0f} s of generation. "
+                f"FMEA library: {library_stats['entries']} configurations "
+                f"({library_stats['curated']} curated) across {library_stats['asset_types']} asset types"
+            )
         
         # Generate button - centered
         col1, col2, col3 = st.columns([1, 2, 1])
@@ -183,28 +662,51 @@ def show():
                     
                     # Get response from OpenAI
                     try:
-                        fmea_data = generate_fmea_with_gpt(asset_type, all_characteristics)
+                        stored = find_stored_fmea(
+                            asset_type, all_characteristics,
+                            use_cache=use_cache, use_library=use_library, min_similarity=min_similarity
+                        )
+                        if stored is not None:
+                            fmea_data, cache_info = stored
+                            failure_modes = fmea_data.get("failure_modes", [])
+                            weibull_data = None
+                        elif stream_results:
+                            failure_modes, weibull_data = stream_failure_modes(
+                                asset_type, all_characteristics, use_cache=use_cache,
+                                use_library=use_library, min_similarity=min_similarity
+                            )
+                            fmea_data = {"failure_modes": failure_modes}
+                            cache_info = {"hit": False}
+                        else:
+                            fmea_data, cache_info = generate_fmea_with_gpt(
+                                asset_type, all_characteristics,
+                                use_cache=use_cache, return_cache_info=True,
+                                use_library=use_library, min_similarity=min_similarity
+                            )
+                            failure_modes = fmea_data.get("failure_modes", [])
+                            weibull_data = None
                         st.session_state.raw_llm_response = fmea_data
                         
-                        # Extract FMEA data
-                        failure_modes = fmea_data.get("failure_modes", [])
-                        
                         # If no failure modes returned, use defaults and show warning
                         if not failure_modes:
                             st.warning("No failure modes returned from LLM. Using default failure modes for this asset type.")
-                            failure_modes = get_default_failure_modes(asset_type)
+                            failure_modes = [dict(mode) for mode in get_default_failure_modes(asset_type)]
+                            weibull_data = None
                         
-                        # Generate Weibull data for each failure mode
-                        weibull_data = {}
-                        for mode in failure_modes:
-                            mode_name = mode["failure_mode"]
-                            beta = mode.get("weibull_beta", 1.5)  # Shape parameter
-                            eta = mode.get("weibull_eta", 10000)  # Scale parameter (hours)
-                            weibull_data[mode_name] = generate_weibull_data(beta, eta)
+                        # Index the failure modes once for every tab and export
+                        fmea_store = FMEAResultStore(failure_modes)
+                        
+                        # Generate Weibull data for each failure mode (already done while streaming)
+                        if weibull_data is None:
+                            weibull_data = {}
+                            for mode_name, beta, eta in zip(fmea_store.names, fmea_store.beta, fmea_store.eta):
+                                weibull_data[mode_name] = generate_weibull_data(beta, eta)
+                        fmea_store.curves = weibull_data
                         
                         # Store data in session state
                         st.session_state.fmea_results = failure_modes
                         st.session_state.weibull_data = weibull_data
+                        st.session_state.fmea_store = fmea_store
                         
                         # Store input parameters for later use in export
                         st.session_state.asset_type = asset_type
@@ -214,10 +716,34 @@ def show():
                         st.session_state.environment = environment
                         
                         # Success message
-                        st.success("FMEA generated successfully!")
+                        if cache_info.get("source") == "library":
+                            st.success(
+                                f"Loaded the FMEA of the nearest stored configuration "
+                                f"({cache_info['similarity']:.0%} similar) in {cache_info['lookup_seconds'] * 1000:.0f} ms"
+                            )
+                            differences = {
+                                name: cache_info["matched_characteristics"].get(name)
+                                for name, value in all_characteristics.items()
+                                if cache_info["matched_characteristics"].get(name) != value
+                            }
+                            if differences:
+                                st.caption("Matched configuration differs in: " + ", ".join(
+                                    f"{name} = {value}" for name, value in differences.items()
+                                ))
+                        elif cache_info["hit"]:
+                            st.success(
+                                f"Loaded cached FMEA in {cache_info['lookup_seconds'] * 1000:.0f} ms "
+                                f"(saved about {cache_info['seconds_saved']:.1f} s of generation)"
+                            )
+                        else:
+                            st.success("FMEA generated successfully!")
                     except Exception as e:
                         st.error(f"Error generating FMEA: {str(e)}")
 
+        # Batch mode for every distinct configuration in a register
+        with st.expander("Batch Generation from Asset Register"):
+            batch_generation_interface()
+
     # Main content area - shown when results are available
     if st.session_state.fmea_results:
         # Make sure these variables are available in this scope for the export functionality
@@ -227,6 +753,14 @@ def show():
         maintenance_regime = st.session_state.get("maintenance_regime", "Standard")
         environment = st.session_state.get("environment", "Urban")
         
+        # Columnar, indexed FMEA shared by the tabs and exports
+        fmea_store = st.session_state.get("fmea_store")
+        if (fmea_store is None or fmea_store.records is not st.session_state.fmea_results
+                or fmea_store.curves is not st.session_state.weibull_data):
+            fmea_store = st.session_state.fmea_store = FMEAResultStore(
+                st.session_state.fmea_results, st.session_state.weibull_data
+            )
+        
         # Create tabs for different views
         tab1, tab2, tab3 = st.tabs(["FMEA Results", "Weibull Analysis", "Export"])
         
@@ -234,144 +768,36 @@ def show():
         with tab1:
             st.header("Failure Mode and Effects Analysis (FMEA)")
             
-            # Convert FMEA results to DataFrame for display
-            fmea_df = pd.DataFrame(st.session_state.fmea_results)
-            
-            # Allow column reordering for better display
-            if not fmea_df.empty and set(['failure_mode', 'effect', 'cause', 'severity', 'occurrence', 'detection', 'rpn']).issubset(fmea_df.columns):
-                fmea_df = fmea_df[['failure_mode', 'effect', 'cause', 'severity', 'occurrence', 'detection', 'rpn'] + 
-                                [col for col in fmea_df.columns if col not in ['failure_mode', 'effect', 'cause', 'severity', 'occurrence', 'detection', 'rpn', 'weibull_beta', 'weibull_eta']]]
-            
-            # Display the DataFrame
-            st.dataframe(fmea_df, use_container_width=True)
+            # FMEA table with the key columns first, built once with the store
+            st.dataframe(fmea_store.display_table, use_container_width=True)
             
             # Display RPN breakdown as a horizontal bar chart
-            if 'rpn' in fmea_df.columns and 'failure_mode' in fmea_df.columns:
+            fig = fmea_store.view("rpn_chart", rpn_chart_view)
+            if fig is not None:
                 st.subheader("Risk Priority Number (RPN) by Failure Mode")
-                fig = px.bar(
-                    fmea_df.sort_values(by='rpn', ascending=False),
-                    x='rpn',
-                    y='failure_mode',
-                    orientation='h',
-                    color='rpn',
-                    color_continuous_scale=[(0, "green"), (0.5, "yellow"), (1, "red")],
-                    labels={'rpn': 'Risk Priority Number', 'failure_mode': 'Failure Mode'}
-                )
                 st.plotly_chart(fig, use_container_width=True)
         
         # Tab 2: Weibull Analysis
         with tab2:
             st.header("Weibull Reliability Analysis")
             
-            if st.session_state.weibull_data:
+            if fmea_store.curves:
                 # 1. Show combined Weibull curves
                 st.subheader("Failure Probability over Time")
+                st.plotly_chart(fmea_store.view("failure_probability", failure_probability_view), use_container_width=True)
                 
-                fig = go.Figure()
-                colors = px.colors.qualitative.Plotly  # Get a color palette
-                
-                for i, (mode_name, data) in enumerate(st.session_state.weibull_data.items()):
-                    color_idx = i % len(colors)  # Cycle through colors if more modes than colors
-                    fig.add_trace(go.Scatter(
-                        x=data['time'],
-                        y=data['failure_probability'],
-                        mode='lines',
-                        name=mode_name,
-                        line=dict(color=colors[color_idx]),
-                    ))
-                
-                fig.update_layout(
-                    xaxis_title="Time (hours)",
-                    yaxis_title="Failure Probability",
-                    legend_title="Failure Modes",
-                    hovermode="x unified"
-                )
+                # 2. Asset-level view combining all failure modes as competing risks
+                st.subheader("System Reliability (All Failure Modes Combined)")
+                fig, dominant_df = fmea_store.view("system_reliability", system_reliability_view)
                 st.plotly_chart(fig, use_container_width=True)
+                st.write("Dominant failure mode by age (highest hazard rate)")
+                st.table(dominant_df)
                 
-                # 2. Allow individual Weibull curve analysis
-                st.subheader("Detailed Analysis by Failure Mode")
-                selected_mode = st.selectbox(
-                    "Select Failure Mode",
-                    options=list(st.session_state.weibull_data.keys())
-                )
+                # 3 and 4. Per-mode analysis; changing its inputs reruns only this section
+                mode_analysis_section(fmea_store, temperature_profile)
                 
-                if selected_mode:
-                    # Get failure mode details from FMEA results
-                    mode_details = next((mode for mode in st.session_state.fmea_results 
-                                        if mode["failure_mode"] == selected_mode), {})
-                    
-                    # Display mode details
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Severity", mode_details.get("severity", "N/A"))
-                    with col2:
-                        st.metric("Occurrence", mode_details.get("occurrence", "N/A"))
-                    with col3:
-                        st.metric("Detection", mode_details.get("detection", "N/A"))
-                    
-                    # Display Weibull parameters
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.metric("Weibull Shape (β)", f"{mode_details.get('weibull_beta', 'N/A')}")
-                    with col2:
-                        st.metric("Weibull Scale (η)", f"{mode_details.get('weibull_eta', 'N/A')} hours")
-                    
-                    # Show individual Weibull curve
-                    data = st.session_state.weibull_data[selected_mode]
-                    
-                    # Create figure with 2 y-axes
-                    fig = go.Figure()
-                    fig.add_trace(go.Scatter(
-                        x=data['time'],
-                        y=data['failure_probability'],
-                        name='Failure Probability',
-                        line=dict(color='red')
-                    ))
-                    fig.add_trace(go.Scatter(
-                        x=data['time'],
-                        y=data['reliability'],
-                        name='Reliability',
-                        line=dict(color='green'),
-                        yaxis="y2"
-                    ))
-                    
-                    fig.update_layout(
-                        xaxis=dict(title="Time (hours)"),
-                        yaxis=dict(
-                            title=dict(
-                                text="Failure Probability",
-                                font=dict(color="red")
-                            ),
-                            tickfont=dict(color="red")
-                        ),
-                        yaxis2=dict(
-                            title=dict(
-                                text="Reliability",
-                                font=dict(color="green")
-                            ),
-                            tickfont=dict(color="green"),
-                            anchor="x",
-                            overlaying="y",
-                            side="right"
-                        ),
-                        legend=dict(x=0.01, y=0.99, bordercolor="Black", borderwidth=1),
-                        hovermode="x unified"
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Life characteristics
-                    st.subheader("Life Characteristics")
-                    mttf = mode_details.get('mttf', data['time'][-1] * 0.5)  # Default to a sensible value if not provided
-                    
-                    life_data = [
-                        {"metric": "Mean Time To Failure (MTTF)", "value": f"{mttf:.2f} hours"},
-                        {"metric": "B10 Life (10% fail)", "value": f"{data['time'][next((i for i, p in enumerate(data['failure_probability']) if p >= 0.10), 0)]:.2f} hours"},
-                        {"metric": "B50 Life (50% fail)", "value": f"{data['time'][next((i for i, p in enumerate(data['failure_probability']) if p >= 0.50), 0)]:.2f} hours"},
-                        {"metric": "Reliability at 10,000 hours", "value": f"{data['reliability'][next((i for i, t in enumerate(data['time']) if t >= 10000), -1)] * 100:.2f}%"},
-                    ]
-                    
-                    life_df = pd.DataFrame(life_data)
-                    st.table(life_df)
+                # 5. Failures, replacements and downtime for a fleet of this asset
+                fleet_simulation_section(fmea_store)
         
         # Tab 3: Export
         with tab3:
@@ -380,7 +806,7 @@ def show():
             # Create options for export
             export_format = st.radio(
                 "Select export format:",
-                options=["CSV", "JSON", "Excel"],
+                options=["CSV", "JSON", "Excel"] + (["Parquet", "Feather"] if COLUMNAR_AVAILABLE else []),
                 index=0
             )
             
@@ -389,32 +815,11 @@ def show():
                     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                     filename_base = f"FMEA_{timestamp}"
                     
-                    # Create FMEA DataFrame
-                    fmea_df = pd.DataFrame(st.session_state.fmea_results)
-                    
-                    # Create Weibull DataFrame (summarized)
-                    weibull_summary = []
-                    for mode_name, data in st.session_state.weibull_data.items():
-                        # Get index of 10% failure probability
-                        idx_10pct = next((i for i, p in enumerate(data['failure_probability']) if p >= 0.10), 0)
-                        
-                        # Get index of 50% failure probability (B50 life)
-                        idx_50pct = next((i for i, p in enumerate(data['failure_probability']) if p >= 0.50), 0)
-                        
-                        # Find MTTF from the corresponding failure mode
-                        mode_details = next((mode for mode in st.session_state.fmea_results if mode["failure_mode"] == mode_name), {})
-                        mttf = mode_details.get('mttf', data['time'][-1] * 0.5)
-                        
-                        weibull_summary.append({
-                            "failure_mode": mode_name,
-                            "beta": mode_details.get('weibull_beta', 'N/A'),
-                            "eta": mode_details.get('weibull_eta', 'N/A'),
-                            "mttf": mttf,
-                            "b10_life": data['time'][idx_10pct],
-                            "b50_life": data['time'][idx_50pct],
-                        })
+                    # FMEA table shared with the results tab
+                    fmea_df = fmea_store.table
                     
-                    weibull_df = pd.DataFrame(weibull_summary)
+                    # Weibull summary and renewal tables, computed once per FMEA
+                    weibull_summary, weibull_df, renewal_df = fmea_store.view("export_tables", export_tables_view)
                     
                     if export_format == "CSV":
                         # For CSV, create two separate files
@@ -442,8 +847,9 @@ def show():
                     elif export_format == "JSON":
                         # For JSON, combine everything into one file
                         export_data = {
-                            "fmea": st.session_state.fmea_results,
+                            "fmea": fmea_store.records,
                             "weibull_summary": weibull_summary,
+                            "renewal_function": renewal_df.to_dict(orient="list"),
                             "asset_type": asset_type,
                             "timestamp": timestamp
                         }
@@ -463,6 +869,7 @@ def show():
                         with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
                             fmea_df.to_excel(writer, sheet_name='FMEA', index=False)
                             weibull_df.to_excel(writer, sheet_name='Weibull_Summary', index=False)
+                            renewal_df.to_excel(writer, sheet_name='Renewal_Function', index=False)
                             
                             # Create a sheet for asset characteristics
                             char_df = pd.DataFrame([{
@@ -484,6 +891,37 @@ def show():
                             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                         )
                     
+                    elif export_format in ("Parquet", "Feather"):
+                        # One file per table, with the asset configuration in the schema metadata
+                        file_format = export_format.lower()
+                        export_metadata = {
+                            "asset_type": asset_type,
+                            "characteristics": selected_characteristics,
+                            "temperature_profile": temperature_profile,
+                            "maintenance_regime": maintenance_regime,
+                            "environment": environment,
+                            "timestamp": timestamp
+                        }
+                        tables = [
+                            ("FMEA", "FMEA", fmea_df, {}),
+                            ("Weibull", "FMEA_Weibull", weibull_df, {}),
+                            ("Renewal", "FMEA_Renewal", renewal_df, {"renewal_horizon_hours": RENEWAL_HORIZON_HOURS}),
+                        ]
+                        
+                        # get_columnar_download adds the timestamp to the file name
+                        for column, (name, prefix, table, table_metadata) in zip(st.columns(len(tables)), tables):
+                            data, filename = get_columnar_download(
+                                table, prefix, file_format,
+                                metadata={**export_metadata, **table_metadata}
+                            )
+                            with column:
+                                st.download_button(
+                                    label=f"Download {name} ({export_format})",
+                                    data=data,
+                                    file_name=filename,
+                                    mime=COLUMNAR_FORMATS[file_format][1],
+                                )
+                    
                     st.success("Export files generated successfully!")
                 
                 except Exception as e:
@@ -1,5 +1,6 @@
 import streamlit as st
 from components.mle_fitting import mle_fitting_interface
+from components.repairable_fitting import repairable_fitting_interface
 
 def show():
     st.title("Historical Data Fit")
@@ -10,8 +11,18 @@ def show():
     st.title("Maximum Likelihood Estimation (MLE) Fitting")
     st.write("Upload a CSV file with asset data and fit a Weibull curve using statistical Maximum Likelihood Estimation.")
 
-    # Call the MLE fitting interface
-    mle_fitting_interface()
+    record_type = st.radio(
+        "Asset records",
+        ["Non-repairable (one lifetime per asset)", "Repairable (failure event log)"],
+        help="Repairable assets fail and are returned to service many times, so asset_identifier repeats",
+        key="historical_record_type"
+    )
+
+    # Call the matching fitting interface
+    if record_type.startswith("Repairable"):
+        repairable_fitting_interface()
+    else:
+        mle_fitting_interface()
 
     # Add footer
     st.markdown("""
@@ -0,0 +1,96 @@
+import json
+import os
+import streamlit as st
+import pandas as pd
+from utils.llm_client import llm_client_pool, llm_metrics
+from utils.fmea_cache import fmea_cache
+from utils.fmea_library import fmea_library
+
+# The page clears the FMEA cache and library and adds curated FMEAs for every user of
+# the server, so it is only listed and rendered when the deployment enables it
+ADMIN_ENABLED = os.environ.get("LLM_ADMIN_ENABLED", "").lower() in ("1", "true", "yes")
+
+def show():
+    st.title("LLM Metrics")
+    if not ADMIN_ENABLED:
+        st.error("The LLM admin page is disabled; set LLM_ADMIN_ENABLED=1 on the server to enable it")
+        return
+    st.write("Latency, token usage and failures of the LLM calls made by this server process.")
+
+    # Client configuration (the API key is never displayed)
+    config = {key: value for key, value in llm_client_pool.config.items() if key != "api_key"}
+    config["base_url"] = config["base_url"] or "OpenAI default"
+    with st.expander("Client Configuration"):
+        st.json(config)
+
+    records = llm_metrics.records()
+    if not records:
+        st.info("No LLM calls recorded yet")
+    else:
+        calls_df = pd.DataFrame(records)
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Calls", len(calls_df))
+        col2.metric("Error rate", f"{(calls_df['status'] != 'ok').mean():.1%}")
+        col3.metric("Retries", int(calls_df['retries'].sum()))
+        col4.metric("Tokens", int(calls_df[['prompt_tokens', 'completion_tokens']].fillna(0).to_numpy().sum()))
+
+        # Latency percentiles per operation
+        latency_df = (
+            calls_df.groupby('operation')[['queue_seconds', 'ttfb_seconds', 'total_seconds']]
+            .quantile([0.5, 0.95, 0.99])
+            .unstack()
+        )
+        latency_df.columns = [f"{metric}_p{int(q * 100)}" for metric, q in latency_df.columns]
+        st.write("Latency by operation (seconds)")
+        st.dataframe(latency_df, use_container_width=True)
+
+        st.write("Recent calls")
+        st.dataframe(calls_df.iloc[::-1], use_container_width=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="Download Call Log (JSON Lines)",
+                data="\n".join(json.dumps(record, default=str) for record in records),
+                file_name="llm_calls.jsonl",
+                mime="application/jsonl"
+            )
+        with col2:
+            if st.button("Clear Call Log", key="llm_admin_clear_metrics"):
+                llm_metrics.clear()
+                st.rerun()
+
+    st.subheader("FMEA Cache")
+    cache_stats = fmea_cache.stats()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Configurations", cache_stats["entries"])
+    col2.metric("Hits", cache_stats["stored_hits"])
+    col3.metric("Generation time saved", f"{cache_stats['stored_seconds_saved']:.0f} s")
+    st.write(f"Size: {cache_stats['bytes'] / 1024:.0f} KB of {cache_stats['max_bytes'] / 1024 ** 2:.0f} MB")
+    if st.button("Clear FMEA Cache", key="llm_admin_clear_cache"):
+        fmea_cache.clear()
+        st.rerun()
+
+    st.subheader("FMEA Library")
+    st.write("Past generations and curated FMEAs, matched to new requests by configuration similarity.")
+    library_stats = fmea_library.stats()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Configurations", library_stats["entries"])
+    col2.metric("Curated", library_stats["curated"])
+    col3.metric("Asset types", library_stats["asset_types"])
+    st.write(f"Size: {library_stats['bytes'] / 1024:.0f} KB of {library_stats['max_bytes'] / 1024 ** 2:.0f} MB")
+    curated_file = st.file_uploader(
+        "Add curated FMEAs (JSON list of asset_type, characteristics and failure_modes)",
+        type=["json"],
+        key="llm_admin_curated_upload"
+    )
+    if curated_file is not None and st.button("Add to Library", key="llm_admin_add_curated"):
+        try:
+            added = fmea_library.load_curated(curated_file)
+            st.success(f"Added {added} curated configurations")
+        except Exception as e:
+            st.error(f"Error loading curated FMEAs: {str(e)}")
+    if st.button("Clear Generated Library Entries", key="llm_admin_clear_library"):
+        fmea_library.clear(source="generated")
+        st.rerun()
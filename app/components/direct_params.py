@@ -1,7 +1,9 @@
 import streamlit as st
 import plotly.graph_objects as go
-from utils.weibull_functions import generate_weibull_curve, validate_parameters
+from utils.weibull_functions import validate_parameters
+from utils.curve_cache import get_weibull_curve
 from utils.export import export_curve_data, get_csv_download, get_excel_download
+from components.replacement_policy import replacement_policy_interface
 
 def direct_params_interface():
     """Interface for direct parameter input."""
@@ -41,7 +43,7 @@ def direct_params_interface():
     valid, message = validate_parameters(shape, scale)
 
     if valid:
-        x_curve, y_curve = generate_weibull_curve(shape, scale, curve_type=curve_type)
+        x_curve, y_curve = get_weibull_curve(shape, scale, curve_type=curve_type)
 
         fig = go.Figure()
         fig.add_trace(go.Scatter(x=x_curve, y=y_curve))
@@ -116,5 +118,7 @@ def direct_params_interface():
                 file_name=excel_filename,
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
+
+        replacement_policy_interface(shape, scale, key_prefix="direct_params")
     else:
         st.error(message)
\ No newline at end of file
@@ -0,0 +1,96 @@
+import json
+import streamlit as st
+import pandas as pd
+from utils.fmea_batch import generate_fmea_batch, unique_configurations
+from utils.fmea_cache import normalize_characteristics
+from utils.export import get_csv_download
+
+def register_configurations(register_df):
+    """
+    Turn each register row into an (asset_type, characteristics) pair; other columns are characteristics.
+
+    Values are normalized like the FMEA page's (e.g. 138.0 read from a column with gaps
+    becomes 138), so a row shares its cache entry with the same configuration entered there.
+    """
+    characteristic_columns = [col for col in register_df.columns if col not in ("asset_type", "asset_identifier")]
+    records = register_df[characteristic_columns].to_dict(orient="records")
+    return [
+        (asset_type, normalize_characteristics({key: value for key, value in characteristics.items() if pd.notna(value)}))
+        for asset_type, characteristics in zip(register_df["asset_type"], records)
+    ]
+
+def batch_generation_interface():
+    """Generate FMEAs for every distinct asset configuration in an uploaded register."""
+    st.write("""
+    Upload a CSV with an asset_type column. Every other column (except asset_identifier) is treated as an
+    operating characteristic. Each distinct configuration is generated once; configurations already in
+    the FMEA cache are reused. Results are cached as they complete, so an interrupted batch resumes
+    where it stopped.
+    """)
+
+    uploaded_file = st.file_uploader("Asset register (CSV)", type="csv", key="fmea_batch_upload")
+    if uploaded_file is None:
+        return
+
+    register_df = pd.read_csv(uploaded_file)
+    if "asset_type" not in register_df.columns:
+        st.error("CSV must contain an asset_type column")
+        return
+
+    configurations = register_configurations(register_df)
+    n_unique = len(unique_configurations(configurations))
+    st.write(f"{len(configurations)} rows, {n_unique} distinct configurations")
+
+    max_concurrency = st.slider("Concurrent requests", min_value=1, max_value=32, value=8, key="fmea_batch_concurrency")
+
+    if st.button("Generate Batch", key="fmea_batch_run"):
+        progress = st.progress(0.0, text="Generating FMEAs...")
+        completed = []
+
+        def on_result(record):
+            completed.append(record)
+            progress.progress(len(completed) / n_unique, text=f"{len(completed)} of {n_unique} configurations")
+
+        try:
+            st.session_state.fmea_batch_records = generate_fmea_batch(
+                configurations, on_result=on_result, max_concurrency=max_concurrency
+            )
+        except Exception as e:
+            st.error(f"Error generating FMEA batch: {str(e)}")
+            return
+
+    records = st.session_state.get("fmea_batch_records")
+    if not records:
+        return
+
+    status_counts = pd.Series([record["status"] for record in records]).value_counts()
+    st.write(", ".join(f"{status}: {count}" for status, count in status_counts.items()))
+    for record in records:
+        if record["status"] == "failed":
+            st.warning(f"{record['asset_type']} {record['characteristics']}: {record['error']}")
+
+    # One row per failure mode, prefixed with the configuration it belongs to
+    rows = [
+        {"asset_type": record["asset_type"], **record["characteristics"], **mode}
+        for record in records if record["fmea"]
+        for mode in record["fmea"].get("failure_modes", [])
+    ]
+    batch_df = pd.DataFrame(rows)
+    st.dataframe(batch_df, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        batch_csv, batch_filename = get_csv_download(batch_df, "fmea_batch")
+        st.download_button(
+            label="Download Batch FMEA (CSV)",
+            data=batch_csv,
+            file_name=batch_filename,
+            mime="text/csv"
+        )
+    with col2:
+        st.download_button(
+            label="Download Batch FMEA (JSON Lines)",
+            data="\n".join(json.dumps(record, default=str) for record in records),
+            file_name=batch_filename.replace(".csv", ".jsonl"),
+            mime="application/jsonl"
+        )
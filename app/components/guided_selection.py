@@ -1,7 +1,8 @@
 import streamlit as st
 import plotly.graph_objects as go
-from utils.weibull_functions import generate_weibull_curve
+from utils.curve_cache import get_weibull_curve
 from utils.export import export_curve_data, get_csv_download, get_excel_download
+from components.replacement_policy import replacement_policy_interface
 
 def guided_selection_interface():
     """Interface for guided parameter selection."""
@@ -67,7 +68,7 @@ def guided_selection_interface():
 
     # Generate and plot curve with current parameters
     with plot_container:
-        x_curve, y_curve = generate_weibull_curve(initial_shape, initial_scale, curve_type=curve_type)
+        x_curve, y_curve = get_weibull_curve(initial_shape, initial_scale, curve_type=curve_type)
         fig = go.Figure()
         fig.add_trace(go.Scatter(x=x_curve, y=y_curve))
 
@@ -163,4 +164,6 @@ def guided_selection_interface():
             data=excel_data,
             file_name=excel_filename,
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
\ No newline at end of file
+        )
+
+    replacement_policy_interface(shape, scale, key_prefix="guided")
\ No newline at end of file
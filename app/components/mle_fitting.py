@@ -1,13 +1,25 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from datetime import datetime
-from io import BytesIO
 import plotly.graph_objects as go
 from scipy.optimize import minimize
 from scipy.special import gamma
-from utils.weibull_functions import generate_weibull_curve
-from utils.export import export_curve_data, get_csv_download, get_excel_download
+from utils.curve_cache import get_weibull_curve
+from utils.kernels import weibull_loglik_sums
+from utils.weibull import conditional_failure_probability, forecast_expected_failures, renewal_function
+from utils.capital_planning import plan_capital_replacement
+from utils.spares import spares_demand_forecast
+from utils.export import (
+    export_curve_data,
+    curve_columns,
+    get_csv_download,
+    get_excel_download,
+    get_columnar_download,
+    CSV_COMPRESSION_FORMATS,
+    COLUMNAR_FORMATS,
+    COLUMNAR_AVAILABLE,
+)
+from components.replacement_policy import replacement_policy_interface
 
 def calculate_lifetimes(df):
     """Calculate lifetime for each asset."""
@@ -16,6 +28,14 @@ def calculate_lifetimes(df):
     df['lifetime'] = (df['retirement_date'] - df['in_service_date']).dt.total_seconds() / (365.25 * 24 * 60 * 60)  # Convert to years
     return df[df['lifetime'] > 0]  # Filter out negative or zero lifetimes
 
+def calculate_current_ages(df, as_of=None):
+    """Calculate current age in years for each asset still in service."""
+    as_of = pd.Timestamp(as_of) if as_of is not None else pd.Timestamp.now().normalize()
+    in_service = df[df['retirement_date'].isna()].copy()
+    in_service['in_service_date'] = pd.to_datetime(in_service['in_service_date'])
+    in_service['current_age'] = (as_of - in_service['in_service_date']).dt.total_seconds() / (365.25 * 24 * 60 * 60)  # Convert to years
+    return in_service[in_service['current_age'] >= 0]  # Filter out future in-service dates
+
 def weibull_loglik(params, lifetimes):
     """Calculate negative log-likelihood for Weibull distribution."""
     shape, scale = params
@@ -23,15 +43,14 @@ def weibull_loglik(params, lifetimes):
         return float('inf')
 
     try:
-        # Add small constant to prevent log(0)
-        eps = 1e-10
-        lifetimes_safe = np.maximum(lifetimes, eps)
+        # Lifetimes are clamped to a small constant inside the kernel to prevent log(0)
+        sum_log_x, sum_z, _ = weibull_loglik_sums(lifetimes, shape, scale)
 
         n = len(lifetimes)
         log_likelihood = (n * np.log(shape) - 
                          n * shape * np.log(scale) + 
-                         (shape - 1) * np.sum(np.log(lifetimes_safe)) - 
-                         np.sum((lifetimes_safe / scale) ** shape))
+                         (shape - 1) * sum_log_x - 
+                         sum_z)
 
         if not np.isfinite(log_likelihood):
             return float('inf')
@@ -40,6 +59,20 @@ def weibull_loglik(params, lifetimes):
     except:
         return float('inf')
 
+def weibull_loglik_grad(params, lifetimes):
+    """Calculate the gradient of the negative log-likelihood for Weibull distribution."""
+    shape, scale = params
+    if shape <= 0 or scale <= 0:
+        return np.zeros(2)
+
+    sum_log_x, sum_z, sum_z_log_z = weibull_loglik_sums(lifetimes, shape, scale)
+
+    n = len(lifetimes)
+    d_shape = n / shape - n * np.log(scale) + sum_log_x - sum_z_log_z
+    d_scale = (shape / scale) * (sum_z - n)
+
+    return -np.array([d_shape, d_scale])
+
 def fit_weibull_mle(lifetimes):
     """Fit Weibull parameters using Maximum Likelihood Estimation."""
     if len(lifetimes) < 2:
@@ -48,11 +81,26 @@ def fit_weibull_mle(lifetimes):
     if np.any(lifetimes <= 0):
         raise ValueError("All lifetimes must be positive")
 
+    # Optimize log(shape) and log(scale) in units of the median lifetime, so the
+    # problem is equally conditioned whatever the time unit; the per-record
+    # objective keeps the gradient magnitude independent of the sample size
+    unit = np.median(lifetimes)
+    scaled = np.asarray(lifetimes, dtype=float) / unit
+    n = len(scaled)
+
+    def objective(log_params):
+        return weibull_loglik(np.exp(log_params), scaled) / n
+
+    def gradient(log_params):
+        params = np.exp(log_params)
+        return weibull_loglik_grad(params, scaled) * params / n
+
     # Better initial guess using percentiles
-    p25, p50, p75 = np.percentile(lifetimes, [25, 50, 75])
+    p25, p50, p75 = np.percentile(scaled, [25, 50, 75])
 
-    # Estimate initial shape parameter using IQR method
-    shape_guess = np.log(np.log(4)) / np.log(p75/p25)
+    # Estimate initial shape parameter using IQR method: the quartiles satisfy
+    # (p75/p25)^shape = ln(4) / ln(4/3)
+    shape_guess = np.log(np.log(4) / np.log(4/3)) / np.log(p75/p25)
     shape_guess = max(0.5, min(5.0, shape_guess))  # Bound initial shape
 
     # Estimate scale parameter using median
@@ -60,18 +108,20 @@ def fit_weibull_mle(lifetimes):
 
     try:
         result = minimize(
-            weibull_loglik,
-            x0=[shape_guess, scale_guess],
-            args=(lifetimes,),
-            bounds=[(0.1, 50), (0.1, np.max(lifetimes) * 2)],
-            method='Nelder-Mead',
+            objective,
+            x0=np.log([shape_guess, scale_guess]),
+            jac=gradient,
+            bounds=[(np.log(0.1), np.log(50)),
+                    (np.log(scaled.min() / 2), np.log(scaled.max() * 2))],
+            method='L-BFGS-B',
             options={'maxiter': 1000}
         )
 
         if not result.success:
             raise ValueError(f"Optimization failed: {result.message}")
 
-        shape, scale = result.x
+        shape, scale = np.exp(result.x)
+        scale *= unit
         if not (np.isfinite(shape) and np.isfinite(scale)):
             raise ValueError("Optimization resulted in invalid parameters")
 
@@ -80,6 +130,75 @@ def fit_weibull_mle(lifetimes):
     except Exception as e:
         raise ValueError(f"Fitting error: {str(e)}")
 
+def fit_weibull_mle_competing_risks(times, cause_codes, n_modes, max_iter=100, tol=1e-10):
+    """
+    Fit a Weibull distribution per failure mode with all other records censored.
+
+    For mode m, failures from other causes and in-service assets are right-censored.
+    The scale is profiled out (scale^shape = sum(t^shape) / d_m), leaving a 1-D score
+    equation in the shape per mode. The sums over all records depend only on the
+    shape, so every mode is solved together by safeguarded Newton iteration over one
+    shared, de-duplicated array of sorted times.
+
+    Args:
+        times (array): Exposure time of every record (lifetime or current age)
+        cause_codes (array): Failure mode index per record, -1 for censored records
+        n_modes (int): Number of failure modes
+        max_iter (int): Maximum Newton iterations
+        tol (float): Convergence tolerance on the shape parameters
+
+    Returns:
+        tuple: (shapes, scales, failures) arrays, one entry per mode. Modes with fewer
+               than two failures get NaN parameters.
+    """
+    times = np.asarray(times, dtype=float)
+    cause_codes = np.asarray(cause_codes, dtype=np.int64)
+    if np.any(times <= 0):
+        raise ValueError("All exposure times must be positive")
+
+    # Normalize to avoid overflow in t^shape; the scale is rescaled at the end
+    t_max = times.max()
+    unique_times, counts = np.unique(times / t_max, return_counts=True)
+    log_unique = np.log(unique_times)
+
+    events = cause_codes >= 0
+    failures = np.bincount(cause_codes[events], minlength=n_modes).astype(float)
+    sum_log_events = np.bincount(cause_codes[events], weights=np.log(times[events] / t_max), minlength=n_modes)
+    valid = failures >= 2
+    mean_log_events = np.where(valid, sum_log_events / np.maximum(failures, 1), 0.0)
+
+    shapes = np.ones(n_modes)
+    lower = np.full(n_modes, 0.02)
+    upper = np.full(n_modes, 100.0)
+    for _ in range(max_iter):
+        weights = counts * np.exp(shapes[:, None] * log_unique[None, :])
+        a = weights.sum(axis=1)
+        b = weights @ log_unique
+        c = weights @ (log_unique ** 2)
+        mean_log = b / a
+
+        # Profile score: 1/k + mean(log t_events) - sum(t^k log t) / sum(t^k), decreasing in k
+        score = 1 / shapes + mean_log_events - mean_log
+        slope = -1 / shapes**2 - (c / a - mean_log**2)
+        lower = np.where(score > 0, shapes, lower)
+        upper = np.where(score > 0, upper, shapes)
+
+        step = shapes - score / slope
+        outside = ~((step > lower) & (step < upper))
+        new_shapes = np.where(outside, 0.5 * (lower + upper), step)
+        converged = np.all(np.abs(new_shapes - shapes)[valid] < tol * shapes[valid])
+        shapes = new_shapes
+        if converged:
+            break
+
+    weights = counts * np.exp(shapes[:, None] * log_unique[None, :])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scales = (weights.sum(axis=1) / failures) ** (1 / shapes) * t_max
+
+    shapes = np.where(valid, shapes, np.nan)
+    scales = np.where(valid, scales, np.nan)
+    return shapes, scales, failures.astype(int)
+
 def mle_fitting_interface():
     """Interface for MLE-based Weibull fitting from CSV data."""
     st.subheader("Maximum Likelihood Estimation from Asset Records")
@@ -90,6 +209,9 @@ def mle_fitting_interface():
     - asset_identifier: Unique identifier for each asset
     - in_service_date: Date when the asset was put into service (YYYY-MM-DD)
     - retirement_date: Date when the asset was retired (YYYY-MM-DD). If the asset is still in service, this field should be left blank.
+
+    Optional columns:
+    - failure_mode: Cause of retirement. When present, a separate Weibull curve is fitted for each failure mode.
     """)
 
     uploaded_file = st.file_uploader("Choose a CSV file", type="csv")
@@ -97,15 +219,15 @@ def mle_fitting_interface():
     if uploaded_file is not None:
         try:
             # Read and validate the CSV
-            df = pd.read_csv(uploaded_file)
+            register_df = pd.read_csv(uploaded_file)
             required_columns = ['asset_identifier', 'in_service_date', 'retirement_date']
 
-            if not all(col in df.columns for col in required_columns):
+            if not all(col in register_df.columns for col in required_columns):
                 st.error("CSV must contain columns: asset_identifier, in_service_date, and retirement_date")
                 return
 
             # Calculate lifetimes
-            df = calculate_lifetimes(df)
+            df = calculate_lifetimes(register_df)
 
             if len(df) == 0:
                 st.error("No valid lifetime data found after processing")
@@ -139,7 +261,7 @@ def mle_fitting_interface():
                 ))
 
                 # Generate fitted curve
-                x_curve, y_curve = generate_weibull_curve(shape, scale, curve_type='pdf')
+                x_curve, y_curve = get_weibull_curve(shape, scale, curve_type='pdf')
                 fig.add_trace(go.Scatter(
                     x=x_curve,
                     y=y_curve,
@@ -184,7 +306,7 @@ def mle_fitting_interface():
                 view_curve_type = dist_type.lower().replace(" function", "")
                 
                 # Show the selected curve type
-                x_view, y_view = generate_weibull_curve(shape, scale, curve_type=view_curve_type)
+                x_view, y_view = get_weibull_curve(shape, scale, curve_type=view_curve_type)
                 
                 view_fig = go.Figure()
                 view_fig.add_trace(go.Scatter(
@@ -227,41 +349,71 @@ def mle_fitting_interface():
                 # Generate export data
                 export_df = export_curve_data(shape, scale, curve_type=export_curve_type)
                 
+                # Fit details stored in the schema metadata of Parquet and Feather exports
+                fit_metadata = {
+                    'shape_parameter': shape,
+                    'scale_parameter': scale,
+                    'fit_method': 'MLE',
+                    'n_lifetimes': len(df),
+                    'time_unit': 'years',
+                    'curve_type': export_curve_type
+                }
+                
                 # Also export the raw data used for fitting
                 if st.checkbox("Include raw data in export"):
-                    original_data_df = pd.DataFrame({
-                        'asset_identifier': df['asset_identifier'],
-                        'in_service_date': df['in_service_date'],
-                        'retirement_date': df['retirement_date'],
-                        'lifetime_years': df['lifetime']
-                    })
-                    
-                    # Create a dictionary for Excel writer to handle multiple sheets
-                    excel_dfs = {
-                        'Fitted_Curve': export_df,
-                        'Raw_Data': original_data_df
-                    }
-                    
-                    # Custom Excel export for multiple sheets
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    excel_filename = f"weibull_mle_fit_{timestamp}.xlsx"
-                    
-                    output = BytesIO()
-                    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                        for sheet_name, sheet_df in excel_dfs.items():
-                            sheet_df.to_excel(writer, sheet_name=sheet_name, index=False)
-                        
-                        # Add parameters sheet
-                        params_df = pd.DataFrame({
-                            'Parameter': ['Shape (k)', 'Scale (λ)'],
-                            'Value': [shape, scale]
-                        })
-                        params_df.to_excel(writer, sheet_name='Parameters', index=False)
-                    
-                    excel_data = output.getvalue()
+                    # The workbook holds the fitted curve and parameters only; the raw register
+                    # is exported below in chunks, since it can exceed Excel's row limit
+                    excel_data, excel_filename = get_excel_download(export_df, "weibull_mle_fit")
                     
                     # Single CSV with just the curve data
                     csv_data, csv_filename = get_csv_download(export_df, f"weibull_mle_fit")
+                    
+                    # Raw data as its own file: a CSV streamed in chunks and compressed on the
+                    # fly, or Parquet/Feather with the fit in the file metadata. Prepared on
+                    # request, since large registers take a while to write; session state keeps
+                    # the spooled file object rather than a copy of its bytes.
+                    raw_formats = {
+                        "CSV (gzip)": ("csv", "gzip"),
+                        "CSV (zip)": ("csv", "zip"),
+                        "CSV": ("csv", None),
+                    }
+                    if COLUMNAR_AVAILABLE:
+                        raw_formats.update({"Parquet": ("columnar", "parquet"), "Feather": ("columnar", "feather")})
+                    raw_format = st.radio(
+                        "Raw data export format",
+                        list(raw_formats),
+                        horizontal=True,
+                        key="mle_raw_format"
+                    )
+                    raw_kind, raw_option = raw_formats[raw_format]
+                    raw_columns = {
+                        'asset_identifier': 'asset_identifier',
+                        'in_service_date': 'in_service_date',
+                        'retirement_date': 'retirement_date',
+                        'lifetime': 'lifetime_years'
+                    }
+                    raw_export_key = (raw_format, len(df), shape, scale)
+                    if st.button("Prepare Raw Data Export", key="mle_raw_prepare"):
+                        with st.spinner("Writing raw data export..."):
+                            if raw_kind == "csv":
+                                raw_data, raw_filename = get_csv_download(
+                                    df, "weibull_mle_raw_data", compression=raw_option, columns=raw_columns
+                                )
+                            else:
+                                raw_data, raw_filename = get_columnar_download(
+                                    df, "weibull_mle_raw_data", raw_option, metadata=fit_metadata, columns=raw_columns
+                                )
+                        st.session_state.mle_raw_export = (raw_export_key, raw_data, raw_filename)
+                    raw_export = st.session_state.get("mle_raw_export")
+                    if raw_export is not None and raw_export[0] == raw_export_key:
+                        formats = CSV_COMPRESSION_FORMATS if raw_kind == "csv" else COLUMNAR_FORMATS
+                        st.download_button(
+                            label=f"Download Raw Data ({raw_format})",
+                            data=raw_export[1],
+                            file_name=raw_export[2],
+                            mime=formats[raw_option][1],
+                            key="mle_raw_download"
+                        )
                 else:
                     # Standard export
                     csv_data, csv_filename = get_csv_download(export_df, f"weibull_curve_shape{shape:.2f}_scale{scale:.2f}")
@@ -285,8 +437,412 @@ def mle_fitting_interface():
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                     )
 
+                # Columnar curve export, written straight from the curve arrays
+                if COLUMNAR_AVAILABLE:
+                    columnar_format = st.radio(
+                        "Columnar format",
+                        ["Parquet", "Feather"],
+                        horizontal=True,
+                        key="mle_columnar_format"
+                    )
+                    columnar_data, columnar_filename = get_columnar_download(
+                        curve_columns(shape, scale, curve_type=export_curve_type),
+                        f"weibull_curve_shape{shape:.2f}_scale{scale:.2f}",
+                        columnar_format.lower(),
+                        metadata=fit_metadata
+                    )
+                    st.download_button(
+                        label=f"Download {columnar_format}",
+                        data=columnar_data,
+                        file_name=columnar_filename,
+                        mime=COLUMNAR_FORMATS[columnar_format.lower()][1],
+                        key="mle_columnar_download"
+                    )
+
+                # Expected failures with replacement for a single installed position
+                renewal_section(shape, scale)
+
+                # Cost-optimal preventive replacement for the fitted curve
+                replacement_policy_interface(shape, scale, key_prefix="mle", time_label="years")
+
+                # Forecast for the assets still in service
+                fleet_forecast_section(register_df, required_columns, shape, scale)
+
+                # Stock levels covering the forecast demand for replacement units
+                spares_section(register_df, required_columns, shape, scale)
+
+                # Budget-constrained, risk-based replacement plan for the in-service fleet
+                capital_plan_section(register_df, required_columns, shape, scale)
+
+                # Per-cause fits when the register records why assets were retired
+                if 'failure_mode' in register_df.columns:
+                    cause_specific_section(df, calculate_current_ages(register_df))
+
             except ValueError as ve:
                 st.error(f"Error fitting Weibull distribution: {str(ve)}")
 
         except Exception as e:
-            st.error(f"Error processing file: {str(e)}")
\ No newline at end of file
+            st.error(f"Error processing file: {str(e)}")
+
+def renewal_section(shape, scale):
+    """Renewal function (expected failures with replacement) for the fitted distribution."""
+    st.subheader("Expected Failures with Replacement")
+
+    horizon = st.number_input(
+        "Horizon (years)",
+        min_value=1.0,
+        value=float(max(10.0, np.ceil(scale * 3))),
+        key="mle_renewal_horizon"
+    )
+
+    renewal = renewal_function(shape, scale, horizon)
+    renewal_df = pd.DataFrame({
+        'Time': renewal['time'],
+        'Expected_Failures': renewal['renewal_function'],
+        'Renewal_Density': renewal['renewal_density']
+    })
+    renewal_df.attrs['shape_parameter'] = shape
+    renewal_df.attrs['scale_parameter'] = scale
+
+    renewal_fig = go.Figure()
+    renewal_fig.add_trace(go.Scatter(
+        x=renewal['time'],
+        y=renewal['renewal_function'],
+        name='Renewal Function M(t)'
+    ))
+    renewal_fig.update_layout(
+        title="Expected Cumulative Failures per Position (failed units replaced)",
+        xaxis_title="Time (years)",
+        yaxis_title="Expected Failures",
+        width=800
+    )
+    st.plotly_chart(renewal_fig)
+    st.write(f"Expected failures over {horizon:g} years: {renewal['renewal_function'][-1]:.3f} per position")
+
+    renewal_csv, renewal_filename = get_csv_download(renewal_df, f"weibull_renewal_shape{shape:.2f}_scale{scale:.2f}")
+    st.download_button(
+        label="Download Renewal Function (CSV)",
+        data=renewal_csv,
+        file_name=renewal_filename,
+        mime="text/csv"
+    )
+
+def prepared_exports(label, state_key, export_key, build):
+    """
+    Export files written only when the user clicks "Prepare <label>".
+
+    build() is called on the click and its result is kept in session state under
+    state_key together with export_key, the inputs it was built from; it is
+    returned on later reruns while export_key still matches, else None.
+    """
+    if st.button(f"Prepare {label}", key=f"{state_key}_prepare"):
+        with st.spinner(f"Writing {label.lower()}..."):
+            st.session_state[state_key] = (export_key, build())
+    prepared = st.session_state.get(state_key)
+    if prepared is None or prepared[0] != export_key:
+        return None
+    return prepared[1]
+
+def fleet_forecast_section(register_df, required_columns, shape, scale):
+    """Conditional failure forecast for the in-service assets of the uploaded register."""
+    st.subheader("Fleet Failure Forecast")
+
+    in_service_df = calculate_current_ages(register_df)
+    if len(in_service_df) == 0:
+        st.info("No in-service assets (blank retirement_date) found in the register")
+        return
+
+    st.write(f"In-service assets: {len(in_service_df)}")
+    st.write(f"Average current age: {in_service_df['current_age'].mean():.2f} years")
+
+    group_options = ["None"] + [col for col in register_df.columns if col not in required_columns + ['lifetime']]
+    group_column = st.selectbox("Aggregate forecast by", group_options, key="mle_forecast_group")
+
+    ages = in_service_df['current_age'].to_numpy()
+    horizons = [1, 5, 10]
+
+    if group_column == "None":
+        group_labels = np.array(["All assets"])
+        group_codes = np.zeros(len(ages), dtype=np.int64)
+    else:
+        group_codes, group_labels = pd.factorize(in_service_df[group_column].fillna("Unknown"))
+        group_codes = group_codes.astype(np.int64)
+
+    expected_failures = forecast_expected_failures(
+        shape, scale, ages, n_periods=max(horizons),
+        group_codes=group_codes, n_groups=len(group_labels)
+    )
+
+    summary_df = pd.DataFrame(
+        expected_failures,
+        columns=[f'year_{i + 1}' for i in range(expected_failures.shape[1])]
+    )
+    summary_df.insert(0, 'group', group_labels)
+    summary_df.insert(1, 'in_service_assets', np.bincount(group_codes, minlength=len(group_labels)))
+
+    st.write("Expected failures per year (without replacement)")
+    st.dataframe(summary_df, use_container_width=True)
+
+    def build_exports():
+        # One row per in-service asset, so only built when the export is requested
+        asset_forecast_df = pd.DataFrame({
+            'asset_identifier': in_service_df['asset_identifier'].to_numpy(),
+            'current_age_years': ages,
+            **{f'p_fail_{h}y': conditional_failure_probability(shape, scale, ages, h) for h in horizons}
+        })
+        if group_column != "None":
+            asset_forecast_df.insert(1, group_column, in_service_df[group_column].to_numpy())
+        return (
+            get_csv_download(summary_df, "weibull_fleet_forecast_summary"),
+            get_csv_download(asset_forecast_df, "weibull_fleet_forecast_assets"),
+        )
+
+    exports = prepared_exports(
+        "Forecast Export", "mle_forecast_export",
+        (group_column, len(in_service_df), shape, scale), build_exports
+    )
+    if exports is not None:
+        (summary_csv, summary_filename), (asset_csv, asset_filename) = exports
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="Download Forecast Summary (CSV)",
+                data=summary_csv,
+                file_name=summary_filename,
+                mime="text/csv"
+            )
+
+        with col2:
+            st.download_button(
+                label="Download Asset Forecast (CSV)",
+                data=asset_csv,
+                file_name=asset_filename,
+                mime="text/csv"
+            )
+
+def spares_section(register_df, required_columns, shape, scale):
+    """Spare-part demand distributions and stock levels meeting a target fill rate."""
+    st.subheader("Spares Provisioning")
+    st.write("Stock needed per period so that the expected fraction of replacement demand met from stock reaches the target.")
+
+    in_service_df = calculate_current_ages(register_df)
+    if len(in_service_df) == 0:
+        st.info("No in-service assets (blank retirement_date) found in the register")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        class_options = ["None"] + [col for col in register_df.columns if col not in required_columns + ['lifetime']]
+        class_column = st.selectbox("Asset class", class_options, key="mle_spares_class")
+    with col2:
+        target_fill_rate = st.slider(
+            "Target fill rate",
+            min_value=0.50,
+            max_value=0.999,
+            value=0.95,
+            help="Expected fraction of demand met from stock",
+            key="mle_spares_fill_rate"
+        )
+    with col3:
+        n_periods = st.slider("Periods (years)", min_value=1, max_value=10, value=5, key="mle_spares_periods")
+
+    if class_column == "None":
+        class_codes = np.zeros(len(in_service_df), dtype=np.int64)
+        class_labels = np.array(["All assets"])
+    else:
+        class_codes, class_labels = pd.factorize(in_service_df[class_column].fillna("Unknown"))
+
+    ages = in_service_df['current_age'].to_numpy()
+    rows = []
+    distributions = {}
+    for code, label in enumerate(class_labels):
+        forecast = spares_demand_forecast(
+            shape, scale, ages[class_codes == code],
+            n_periods=n_periods, target_fill_rate=target_fill_rate
+        )
+        distributions[label] = forecast[0]["pmf"]
+        rows.extend({
+            'asset_class': label,
+            'year': period["period"],
+            'expected_demand': period["mean_demand"],
+            'stock_level': period["stock_level"],
+            'fill_rate': period["fill_rate"],
+            'no_stockout_probability': period["no_stockout_probability"],
+        } for period in forecast)
+    spares_df = pd.DataFrame(rows)
+
+    fig = go.Figure()
+    for label, pmf in distributions.items():
+        fig.add_trace(go.Bar(x=np.arange(len(pmf)), y=pmf, name=str(label)))
+    fig.update_layout(
+        title="Demand Distribution, Year 1",
+        xaxis_title="Units Demanded",
+        yaxis_title="Probability",
+        barmode='overlay',
+        width=800
+    )
+    st.plotly_chart(fig)
+    st.dataframe(spares_df, use_container_width=True)
+
+    exports = prepared_exports(
+        "Spares Export", "mle_spares_export",
+        (class_column, target_fill_rate, n_periods, len(in_service_df), shape, scale),
+        lambda: get_csv_download(spares_df, "weibull_spares_forecast")
+    )
+    if exports is not None:
+        spares_csv, spares_filename = exports
+        st.download_button(
+            label="Download Spares Forecast (CSV)",
+            data=spares_csv,
+            file_name=spares_filename,
+            mime="text/csv"
+        )
+
+def capital_plan_section(register_df, required_columns, shape, scale):
+    """Risk-based capital replacement plan for the in-service assets under an annual budget."""
+    st.subheader("Capital Replacement Plan")
+    st.write("Select assets to replace each year to maximise risk reduction (consequence × probability of failure) within budget.")
+
+    in_service_df = calculate_current_ages(register_df)
+    if len(in_service_df) == 0:
+        st.info("No in-service assets (blank retirement_date) found in the register")
+        return
+
+    numeric_columns = [col for col in in_service_df.select_dtypes(include='number').columns
+                       if col not in required_columns + ['lifetime', 'current_age']]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        consequence_column = st.selectbox(
+            "Consequence of failure",
+            ["Uniform (1 per failure)"] + numeric_columns,
+            help="Register column holding the consequence of each asset's failure, e.g. FMEA severity or RPN",
+            key="mle_plan_consequence"
+        )
+        cost_column = st.selectbox(
+            "Replacement cost",
+            ["Uniform (1 per asset)"] + numeric_columns,
+            key="mle_plan_cost"
+        )
+    with col2:
+        annual_budget = st.number_input(
+            "Annual budget (in replacement cost units)",
+            min_value=0.0,
+            value=float(max(1, len(in_service_df) // 50)),
+            key="mle_plan_budget"
+        )
+        n_years = st.slider("Planning horizon (years)", min_value=1, max_value=40, value=20, key="mle_plan_years")
+
+    consequence = 1.0 if consequence_column not in numeric_columns else in_service_df[consequence_column].fillna(0).to_numpy()
+    replacement_cost = 1.0 if cost_column not in numeric_columns else in_service_df[cost_column].fillna(0).to_numpy()
+
+    result = plan_capital_replacement(
+        in_service_df['current_age'].to_numpy(), shape, scale,
+        consequence=consequence,
+        replacement_cost=replacement_cost,
+        annual_budget=annual_budget,
+        n_years=n_years,
+        seed=0
+    )
+
+    summary_df = pd.DataFrame(result["summary"])[
+        ['year', 'replacements', 'spend', 'risk_before', 'risk_after', 'expected_failures', 'simulated_failures']
+    ]
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=summary_df['year'], y=summary_df['risk_before'], name='Risk Before Replacement'))
+    fig.add_trace(go.Scatter(x=summary_df['year'], y=summary_df['risk_after'], name='Risk After Replacement'))
+    fig.add_trace(go.Bar(x=summary_df['year'], y=summary_df['replacements'], name='Planned Replacements', yaxis='y2', opacity=0.4))
+    fig.update_layout(
+        title="Fleet Risk and Planned Replacements by Year",
+        xaxis_title="Year",
+        yaxis=dict(title="Annual Risk"),
+        yaxis2=dict(title="Replacements", overlaying='y', side='right'),
+        width=800
+    )
+    st.plotly_chart(fig)
+    st.dataframe(summary_df, use_container_width=True)
+
+    def build_exports():
+        plan = result["plan"]
+        plan_df = pd.DataFrame({
+            'year': plan['year'],
+            'asset_identifier': in_service_df['asset_identifier'].to_numpy()[plan['asset_index']],
+            'age_at_replacement_years': plan['age'],
+            'risk_reduction': plan['risk_reduction'],
+            'replacement_cost': plan['cost'],
+        })
+        return (
+            get_csv_download(plan_df, "weibull_capital_plan"),
+            get_csv_download(summary_df, "weibull_capital_plan_summary"),
+        )
+
+    exports = prepared_exports(
+        "Plan Export", "mle_plan_export",
+        (consequence_column, cost_column, annual_budget, n_years, len(in_service_df), shape, scale),
+        build_exports
+    )
+    if exports is not None:
+        (plan_csv, plan_filename), (plan_summary_csv, plan_summary_filename) = exports
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="Download Replacement Plan (CSV)",
+                data=plan_csv,
+                file_name=plan_filename,
+                mime="text/csv"
+            )
+        with col2:
+            st.download_button(
+                label="Download Plan Summary (CSV)",
+                data=plan_summary_csv,
+                file_name=plan_summary_filename,
+                mime="text/csv"
+            )
+
+def cause_specific_section(retired_df, in_service_df):
+    """Competing-risks fit of one Weibull curve per recorded failure mode."""
+    st.subheader("Cause-Specific Fits by Failure Mode")
+    st.write("Each failure mode is fitted with retirements from other causes and in-service assets treated as censored.")
+
+    causes = retired_df['failure_mode'].fillna("Unspecified").astype(str)
+    cause_codes, mode_names = pd.factorize(causes)
+
+    times = np.concatenate([retired_df['lifetime'].to_numpy(), in_service_df['current_age'].to_numpy()])
+    codes = np.concatenate([cause_codes, np.full(len(in_service_df), -1)])
+    times_positive = times > 0
+
+    shapes, scales, failures = fit_weibull_mle_competing_risks(
+        times[times_positive], codes[times_positive], len(mode_names)
+    )
+
+    # Same layout as the FMEA page's fmea_results (eta and MTTF in hours) for side-by-side comparison
+    cause_results = [
+        {
+            "failure_mode": mode_name,
+            "failures": int(n_failures),
+            "weibull_beta": float(beta),
+            "weibull_eta": float(eta * 8760),
+            "mttf": float(eta * gamma(1 + 1 / beta) * 8760),
+        }
+        for mode_name, n_failures, beta, eta in zip(mode_names, failures, shapes, scales)
+    ]
+    cause_df = pd.DataFrame(cause_results)
+    st.dataframe(cause_df, use_container_width=True)
+    if np.any(failures < 2):
+        st.info("Modes with fewer than two recorded failures cannot be fitted and are shown without parameters")
+
+    fmea_results = st.session_state.get("fmea_results")
+    if fmea_results:
+        st.write("Comparison with the generated FMEA (matched on failure mode name)")
+        fmea_df = pd.DataFrame(fmea_results).reindex(columns=['failure_mode', 'weibull_beta', 'weibull_eta'])
+        comparison_df = cause_df.merge(fmea_df, on='failure_mode', how='outer', suffixes=('_fitted', '_fmea'))
+        st.dataframe(comparison_df, use_container_width=True)
+
+    cause_csv, cause_filename = get_csv_download(cause_df, "weibull_cause_specific_fit")
+    st.download_button(
+        label="Download Cause-Specific Fits (CSV)",
+        data=cause_csv,
+        file_name=cause_filename,
+        mime="text/csv"
+    )
@@ -1,48 +1,122 @@
 import streamlit as st
 import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
-from utils.weibull_functions import fit_weibull_to_points, generate_weibull_curve
+from utils.weibull_functions import fit_weibull_to_points
+from utils.curve_cache import get_weibull_curve
+from utils.uncertainty import sample_expert_points, fit_expert_scenarios, weibull_curve_bands
 from utils.export import export_curve_data, get_csv_download, get_excel_download
+from components.replacement_policy import replacement_policy_interface
 
 def point_fitting_interface():
     """Interface for point-based Weibull fitting."""
     st.subheader("Point-Based Fitting")
     st.write("Enter the age at which you expect specific percentages of assets to have failed.")
 
+    input_mode = st.radio(
+        "Input Mode",
+        ["Standard (25% / 50% / 75%)", "Custom Points"],
+        horizontal=True,
+        key="point_fit_input_mode"
+    )
+
     col1, col2 = st.columns(2)
+    use_ranges = False
 
-    with col1:
-        # Age inputs for specific failure percentages
-        st.write("### Asset Failure Ages")
-        x1 = st.number_input(
-            "At what age do you expect 25% of assets to have failed?",
-            min_value=0.1,
-            value=1.0,
-            help="Enter the age at which 25% of assets are expected to fail"
-        )
+    if input_mode == "Custom Points":
+        with col1:
+            st.write("### Asset Failure Points")
+            points_df = st.data_editor(
+                pd.DataFrame({"Age": [1.0, 2.0, 3.0], "Percent Failed": [25.0, 50.0, 75.0]}),
+                num_rows="dynamic",
+                column_config={
+                    "Age": st.column_config.NumberColumn(min_value=0.0),
+                    "Percent Failed": st.column_config.NumberColumn(min_value=0.0, max_value=100.0),
+                },
+                key="point_fit_custom_points"
+            ).dropna()
 
-        x2 = st.number_input(
-            "At what age do you expect 50% of assets to have failed?",
-            min_value=0.1,
-            value=2.0,
-            help="Enter the age at which 50% of assets are expected to fail"
-        )
+        if len(points_df) < 2:
+            st.error("Enter at least two points")
+            return
+
+        x_points = points_df["Age"].to_numpy(dtype=float)
+        y_points = points_df["Percent Failed"].to_numpy(dtype=float) / 100.0
 
-        x3 = st.number_input(
-            "At what age do you expect 75% of assets to have failed?",
-            min_value=0.1,
-            value=3.0,
-            help="Enter the age at which 75% of assets are expected to fail"
+        if np.any(x_points <= 0) or np.any((y_points <= 0) | (y_points >= 1)):
+            st.error("Ages must be positive and percentages strictly between 0 and 100")
+            return
+    else:
+        use_ranges = st.checkbox(
+            "Specify age ranges (min / most likely / max)",
+            value=False,
+            help="Capture expert uncertainty. Scenarios are sampled from the ranges and fitted "
+                 "to show credible bands around the most likely curve.",
+            key="point_fit_use_ranges"
         )
 
-    # Validate age sequence
-    if not (x1 <= x2 <= x3):
-        st.error("Ages must be in ascending order (25% ≤ 50% ≤ 75%)")
-        return
+        if use_ranges:
+            # Age ranges for specific failure percentages
+            st.write("### Asset Failure Age Ranges")
+            range_inputs = []
+            for percent, default in zip([25, 50, 75], [1.0, 2.0, 3.0]):
+                st.write(f"At what age do you expect {percent}% of assets to have failed?")
+                min_col, likely_col, max_col = st.columns(3)
+                with min_col:
+                    low = st.number_input("Min", min_value=0.1, value=default * 0.8, key=f"point_fit_min_{percent}")
+                with likely_col:
+                    likely = st.number_input("Most likely", min_value=0.1, value=default, key=f"point_fit_likely_{percent}")
+                with max_col:
+                    high = st.number_input("Max", min_value=0.1, value=default * 1.2, key=f"point_fit_max_{percent}")
+                range_inputs.append((low, likely, high))
+
+            if not all(low <= likely <= high for low, likely, high in range_inputs):
+                st.error("Each range must satisfy Min ≤ Most likely ≤ Max")
+                return
+
+            min_ages, likely_ages, max_ages = (np.array(col) for col in zip(*range_inputs))
+            x1, x2, x3 = likely_ages
+        else:
+            with col1:
+                # Age inputs for specific failure percentages
+                st.write("### Asset Failure Ages")
+                x1 = st.number_input(
+                    "At what age do you expect 25% of assets to have failed?",
+                    min_value=0.1,
+                    value=1.0,
+                    help="Enter the age at which 25% of assets are expected to fail"
+                )
+
+                x2 = st.number_input(
+                    "At what age do you expect 50% of assets to have failed?",
+                    min_value=0.1,
+                    value=2.0,
+                    help="Enter the age at which 50% of assets are expected to fail"
+                )
+
+                x3 = st.number_input(
+                    "At what age do you expect 75% of assets to have failed?",
+                    min_value=0.1,
+                    value=3.0,
+                    help="Enter the age at which 75% of assets are expected to fail"
+                )
+
+        # Validate age sequence
+        if not (x1 <= x2 <= x3):
+            st.error("Ages must be in ascending order (25% ≤ 50% ≤ 75%)")
+            return
 
-    # Fixed y-values for CDF points
-    x_points = np.array([x1, x2, x3])
-    y_points = np.array([0.25, 0.50, 0.75])
+        # Fixed y-values for CDF points
+        x_points = np.array([x1, x2, x3])
+        y_points = np.array([0.25, 0.50, 0.75])
+
+    refine = st.checkbox(
+        "Refine with nonlinear least squares",
+        value=False,
+        help="The closed-form quantile-line fit is used by default. "
+             "Refinement minimizes the error on the CDF itself, starting from that solution.",
+        key="point_fit_refine"
+    )
 
     # Distribution type selector
     curve_type = st.radio(
@@ -59,7 +133,7 @@ def point_fitting_interface():
 
     try:
         # Always fit using CDF points
-        shape, scale = fit_weibull_to_points(x_points, y_points)
+        shape, scale = fit_weibull_to_points(x_points, y_points, refine=refine)
 
         if shape is None or scale is None:
             st.error("Could not fit Weibull curve to provided points")
@@ -86,7 +160,7 @@ def point_fitting_interface():
             ))
 
         # Generate initial curve
-        x_curve, y_curve = generate_weibull_curve(shape, scale, curve_type=curve_type)
+        x_curve, y_curve = get_weibull_curve(shape, scale, curve_type=curve_type)
         fig.add_trace(go.Scatter(
             x=x_curve,
             y=y_curve,
@@ -124,6 +198,62 @@ def point_fitting_interface():
         # Display the initial plot
         plot_placeholder.plotly_chart(fig)
 
+        if use_ranges:
+            st.subheader("Uncertainty Bands")
+            n_samples = st.select_slider(
+                "Number of sampled scenarios",
+                options=[5000, 10000, 20000, 50000],
+                value=20000,
+                key="point_fit_n_samples"
+            )
+
+            sampled_ages = sample_expert_points(min_ages, likely_ages, max_ages, n_samples=n_samples, seed=0)
+            shapes, scales = fit_expert_scenarios(sampled_ages, y_points)
+
+            if len(shapes) == 0:
+                st.error("None of the sampled scenarios could be fitted")
+            else:
+                # Shared grid wide enough for the upper band of the sampled scales
+                x_band = np.linspace(0, get_weibull_curve(shape, np.percentile(scales, 95), curve_type=curve_type)[0][-1], 100)
+                lower, median, upper = weibull_curve_bands(shapes, scales, x_band, curve_type=curve_type)
+
+                band_fig = go.Figure()
+                band_fig.add_trace(go.Scatter(
+                    x=x_band,
+                    y=upper,
+                    line=dict(width=0),
+                    showlegend=False,
+                    hoverinfo='skip'
+                ))
+                band_fig.add_trace(go.Scatter(
+                    x=x_band,
+                    y=lower,
+                    fill='tonexty',
+                    fillcolor='rgba(255, 0, 0, 0.2)',
+                    line=dict(width=0),
+                    name='90% Credible Band'
+                ))
+                band_fig.add_trace(go.Scatter(
+                    x=x_band,
+                    y=median,
+                    name='Median',
+                    line=dict(color='red', width=2)
+                ))
+
+                band_fig.update_layout(
+                    title=f"Weibull {curve_type.upper()} Credible Bands ({len(shapes):,} scenarios)",
+                    xaxis_title="Time",
+                    yaxis_title=y_axis_title,
+                    showlegend=True,
+                    width=800
+                )
+                st.plotly_chart(band_fig)
+
+                st.write(
+                    f"Shape (k) 90% interval: {np.percentile(shapes, 5):.3f} – {np.percentile(shapes, 95):.3f}  \n"
+                    f"Scale (λ) 90% interval: {np.percentile(scales, 5):.3f} – {np.percentile(scales, 95):.3f}"
+                )
+
         # Fine-tuning sliders below the plot
         st.subheader("Fine-tune Parameters")
 
@@ -146,7 +276,7 @@ def point_fitting_interface():
         # Update plot if parameters change
         if shape_adjusted != shape or scale_adjusted != scale:
             # Update curve data
-            x_curve, y_curve = generate_weibull_curve(shape_adjusted, scale_adjusted, curve_type=curve_type)
+            x_curve, y_curve = get_weibull_curve(shape_adjusted, scale_adjusted, curve_type=curve_type)
             fig.data = []  # Clear existing traces
 
             if curve_type == "cdf":
@@ -215,5 +345,7 @@ def point_fitting_interface():
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
 
+        replacement_policy_interface(shape_adjusted, scale_adjusted, key_prefix="point_fit")
+
     except Exception as e:
         st.error(f"Error fitting curve: {str(e)}")
\ No newline at end of file
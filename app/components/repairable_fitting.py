@@ -0,0 +1,177 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+from utils.repairable import fit_power_law_nhpp, mean_cumulative_function, decimate_curve
+from utils.export import get_csv_download
+
+YEAR_SECONDS = 365.25 * 24 * 60 * 60
+
+def prepare_event_log(events_df, as_of=None):
+    """
+    Convert a failure event log into per-asset observation windows and event ages.
+
+    Returns:
+        tuple: (asset identifiers, asset code per event, event ages in years,
+                observation end age per asset in years)
+    """
+    as_of = pd.Timestamp(as_of) if as_of is not None else pd.Timestamp.now().normalize()
+    codes, assets = pd.factorize(events_df['asset_identifier'])
+
+    in_service = pd.to_datetime(events_df['in_service_date']).to_numpy()
+    event_date = pd.to_datetime(events_df['event_date']).to_numpy()
+    if 'observation_end_date' in events_df.columns:
+        end_date = pd.to_datetime(events_df['observation_end_date']).fillna(as_of).to_numpy()
+    else:
+        end_date = np.full(len(events_df), as_of.to_datetime64())
+
+    # One window per asset; rows of the same asset share these dates
+    start = np.empty(len(assets), dtype=in_service.dtype)
+    start[codes] = in_service
+    end = np.empty(len(assets), dtype=end_date.dtype)
+    end[codes] = end_date
+    end_times = (end - start) / np.timedelta64(1, 's') / YEAR_SECONDS
+
+    event_ages = (event_date - start[codes]) / np.timedelta64(1, 's') / YEAR_SECONDS
+    # Blank event_date rows register assets without failures
+    valid = ~np.isnat(event_date) & (event_ages > 0) & (event_ages <= end_times[codes])
+
+    # Drop assets without an observation window (end before start) and renumber
+    observed = end_times > 0
+    new_codes = np.cumsum(observed) - 1
+    return assets[observed], new_codes[codes[valid]], event_ages[valid], end_times[observed]
+
+def repairable_fitting_interface():
+    """Interface for power-law NHPP (Crow-AMSAA) fitting from repairable-asset event logs."""
+    st.subheader("Repairable Assets: Power-Law NHPP (Crow-AMSAA)")
+    st.write("""
+    Upload a CSV file containing one row per failure event. Assets are repaired and returned to service, so asset_identifier repeats.
+
+    Required columns:
+    - asset_identifier: Identifier of the repaired asset
+    - in_service_date: Date when the asset was put into service (YYYY-MM-DD)
+    - event_date: Date of the failure (YYYY-MM-DD). Leave blank to include an asset with no recorded failures.
+
+    Optional columns:
+    - observation_end_date: End of the observation window for the asset. Defaults to today.
+    """)
+
+    uploaded_file = st.file_uploader("Choose a CSV file", type="csv", key="repairable_upload")
+
+    if uploaded_file is not None:
+        try:
+            events_df = pd.read_csv(uploaded_file)
+            required_columns = ['asset_identifier', 'in_service_date', 'event_date']
+
+            if not all(col in events_df.columns for col in required_columns):
+                st.error("CSV must contain columns: asset_identifier, in_service_date, and event_date")
+                return
+
+            assets, codes, event_ages, end_times = prepare_event_log(events_df)
+            if len(event_ages) == 0:
+                st.error("No valid failure events found after processing")
+                return
+
+            result = fit_power_law_nhpp(codes, event_ages, end_times)
+            fleet = result["fleet"]
+
+            st.write("### Data Summary")
+            st.write(f"Number of assets: {len(assets)}")
+            st.write(f"Number of failure events: {fleet['n_events']}")
+            st.write(f"Total observed time: {end_times.sum():.1f} asset-years")
+
+            st.write("### Fleet Parameters")
+            st.write(f"Shape (β): {fleet['beta']:.3f}")
+            st.write(f"Scale (λ): {fleet['lambda']:.5f}")
+            if fleet['beta'] > 1:
+                st.write("β > 1: failures are becoming more frequent with age (deteriorating).")
+            elif fleet['beta'] < 1:
+                st.write("β < 1: failures are becoming less frequent with age (improving).")
+
+            # Mean cumulative failures per asset against the fitted λ t^β, on Duane (log-log) axes
+            mcf_time, mcf = mean_cumulative_function(event_ages, end_times)
+            plot_time, plot_mcf = decimate_curve(mcf_time, mcf)
+            fitted_time = np.geomspace(plot_time[0], plot_time[-1], 200)
+
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(
+                x=plot_time,
+                y=plot_mcf,
+                name='Observed (MCF)',
+                line=dict(shape='hv')
+            ))
+            fig.add_trace(go.Scatter(
+                x=fitted_time,
+                y=fleet['lambda'] * fitted_time ** fleet['beta'],
+                name='Fitted λt^β',
+                line=dict(color='red', width=2)
+            ))
+            fig.update_layout(
+                title="Mean Cumulative Failures per Asset",
+                xaxis_title="Age (years)",
+                yaxis_title="Cumulative Failures",
+                xaxis_type='log',
+                yaxis_type='log',
+                width=800
+            )
+            st.plotly_chart(fig)
+
+            asset_df = pd.DataFrame({
+                'asset_identifier': np.asarray(assets),
+                'observed_years': end_times,
+                'n_events': result["n_events"],
+                'beta': result["beta"],
+                'beta_unbiased': result["beta_unbiased"],
+                'lambda': result["lambda"],
+            })
+
+            st.write("### Per-Asset Fits")
+            st.write(f"Assets with at least two events: {(result['n_events'] > 1).sum()}")
+            worst_df = asset_df.nlargest(20, 'beta_unbiased')
+            st.write("Fastest-deteriorating assets (largest bias-corrected β)")
+            st.dataframe(worst_df, use_container_width=True)
+
+            asset_id = st.text_input("Show cumulative failures for asset", key="repairable_asset")
+            if asset_id:
+                matches = np.flatnonzero(np.asarray(assets).astype(str) == asset_id)
+                if len(matches) == 0:
+                    st.warning(f"Asset {asset_id} not found in the event log")
+                else:
+                    asset_code = matches[0]
+                    asset_events = np.sort(event_ages[codes == asset_code])
+                    asset_beta = result["beta"][asset_code]
+                    asset_lambda = result["lambda"][asset_code]
+
+                    asset_fig = go.Figure()
+                    asset_fig.add_trace(go.Scatter(
+                        x=np.concatenate(([0.0], asset_events, [end_times[asset_code]])),
+                        y=np.concatenate(([0], np.arange(1, len(asset_events) + 1), [len(asset_events)])),
+                        name='Observed',
+                        line=dict(shape='hv')
+                    ))
+                    if np.isfinite(asset_beta):
+                        asset_time = np.linspace(0, end_times[asset_code], 200)
+                        asset_fig.add_trace(go.Scatter(
+                            x=asset_time,
+                            y=asset_lambda * asset_time ** asset_beta,
+                            name=f'Fitted (β = {asset_beta:.2f})',
+                            line=dict(color='red', width=2)
+                        ))
+                    asset_fig.update_layout(
+                        title=f"Cumulative Failures: {asset_id}",
+                        xaxis_title="Age (years)",
+                        yaxis_title="Cumulative Failures",
+                        width=800
+                    )
+                    st.plotly_chart(asset_fig)
+
+            asset_csv, asset_filename = get_csv_download(asset_df, "crow_amsaa_asset_fits")
+            st.download_button(
+                label="Download Per-Asset Fits (CSV)",
+                data=asset_csv,
+                file_name=asset_filename,
+                mime="text/csv"
+            )
+
+        except Exception as e:
+            st.error(f"Error processing file: {str(e)}")
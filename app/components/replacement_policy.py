@@ -0,0 +1,75 @@
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+from utils.weibull import optimize_replacement
+
+def replacement_policy_interface(shape, scale, key_prefix, time_label="Time"):
+    """Interface for finding the cost-optimal preventive replacement interval of a fitted curve."""
+    st.subheader("Preventive Replacement Optimization")
+    st.write("Compare the long-run cost per unit time of preventive replacement against running to failure.")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        cost_preventive = st.number_input(
+            "Planned replacement cost",
+            min_value=0.0,
+            value=1.0,
+            key=f"{key_prefix}_cost_preventive"
+        )
+    with col2:
+        cost_failure = st.number_input(
+            "Unplanned (failure) replacement cost",
+            min_value=0.0,
+            value=10.0,
+            key=f"{key_prefix}_cost_failure"
+        )
+    with col3:
+        policy = st.radio(
+            "Policy",
+            ["Age Replacement", "Block Replacement"],
+            help="Age: replace at failure or at a fixed age. Block: replace all units at fixed intervals and on failure.",
+            key=f"{key_prefix}_policy"
+        )
+
+    result = optimize_replacement(
+        shape, scale, cost_preventive, cost_failure,
+        policy="age" if policy == "Age Replacement" else "block"
+    )
+    ages = result["ages"][0]
+    cost_rate = result["cost_rate"][0]
+    optimal_age = result["optimal_age"][0]
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=ages[1:],
+        y=cost_rate[1:],
+        name='Cost Rate'
+    ))
+    fig.add_hline(
+        y=result["run_to_failure_cost_rate"][0],
+        line=dict(color='gray', dash='dash'),
+        annotation_text="Run to failure"
+    )
+    if np.isfinite(optimal_age):
+        fig.add_trace(go.Scatter(
+            x=[optimal_age],
+            y=[result["optimal_cost_rate"][0]],
+            mode='markers',
+            name='Optimum',
+            marker=dict(size=12, color='red')
+        ))
+
+    fig.update_layout(
+        title=f"Long-run Cost Rate ({policy})",
+        xaxis_title=f"Replacement Interval ({time_label})",
+        yaxis_title="Cost per Unit Time",
+        yaxis=dict(range=[0, result["run_to_failure_cost_rate"][0] * 3]),
+        width=800
+    )
+    st.plotly_chart(fig)
+
+    if np.isfinite(optimal_age):
+        saving = 1 - result["optimal_cost_rate"][0] / result["run_to_failure_cost_rate"][0]
+        st.write(f"Optimal replacement interval: {optimal_age:.3f} ({saving:.1%} below run-to-failure cost)")
+    else:
+        st.write("Preventive replacement does not reduce cost for this curve; run to failure.")
@@ -0,0 +1,97 @@
+import numpy as np
+
+from utils.weibull import conditional_failure_probability
+
+
+def plan_capital_replacement(ages, beta, eta, consequence=1.0, replacement_cost=1.0,
+                             annual_budget=1.0, n_years=20, simulate_failures=True, seed=None):
+    """
+    Year-by-year risk-based replacement plan for a fleet under an annual budget.
+
+    Each year every asset is scored by risk = consequence x P(fail within the year |
+    current age). Replacing an asset lowers its risk to that of a new unit, so assets
+    are ranked by risk reduction per unit cost and taken greedily until the budget is
+    spent. Taking the ranked prefix is the Lagrangian-relaxation solution of the
+    yearly knapsack. The fleet is then aged one year: replaced assets restart at age
+    0 and, when `simulate_failures` is set, assets that fail in service are replaced
+    reactively (outside the budget).
+
+    Args:
+        ages (array): Current age of each asset, in the same units as eta (years)
+        beta (float or array): Shape parameter, scalar or per asset
+        eta (float or array): Scale parameter, scalar or per asset
+        consequence (float or array): Cost of a failure, e.g. FMEA severity or RPN
+        replacement_cost (float or array): Cost of a planned replacement
+        annual_budget (float): Budget available for planned replacements each year
+        n_years (int): Planning horizon in years
+        simulate_failures (bool): Sample in-service failures when aging the fleet
+        seed (int): Seed for the failure sampling
+
+    Returns:
+        dict: "summary" with one entry per year (arrays of replacements, spend, risk
+              before and after, expected and simulated failures) and "plan" with
+              the planned replacements (year, asset index, age, risk reduction, cost)
+    """
+    ages = np.array(ages, dtype=float)
+    n_assets = len(ages)
+    beta = np.broadcast_to(np.asarray(beta, dtype=float), ages.shape)
+    eta = np.broadcast_to(np.asarray(eta, dtype=float), ages.shape)
+    consequence = np.broadcast_to(np.asarray(consequence, dtype=float), ages.shape)
+    cost = np.broadcast_to(np.asarray(replacement_cost, dtype=float), ages.shape)
+    rng = np.random.default_rng(seed)
+
+    # Risk of a brand-new unit over its first year does not change between years
+    new_unit_p_fail = conditional_failure_probability(beta, eta, np.zeros(n_assets), 1.0)
+    new_unit_risk = consequence * new_unit_p_fail
+
+    positive_costs = cost[cost > 0]
+    max_affordable = n_assets if len(positive_costs) < n_assets else int(annual_budget // positive_costs.min()) + 1
+
+    summary = {key: np.zeros(n_years) for key in
+               ("replacements", "spend", "risk_before", "risk_after", "expected_failures", "simulated_failures")}
+    plan = {key: [] for key in ("year", "asset_index", "age", "risk_reduction", "cost")}
+
+    for year in range(n_years):
+        p_fail = conditional_failure_probability(beta, eta, ages, 1.0)
+        risk = consequence * p_fail
+        reduction = risk - new_unit_risk
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(cost > 0, reduction / cost, np.inf)
+        candidates = np.flatnonzero(reduction > 0)
+        # At most budget / cheapest-cost assets can be funded, so only those need sorting
+        if len(candidates) > max_affordable:
+            top = np.argpartition(-ratio[candidates], max_affordable)[:max_affordable]
+            candidates = candidates[top]
+        order = candidates[np.argsort(-ratio[candidates], kind='stable')]
+        n_selected = np.searchsorted(np.cumsum(cost[order]), annual_budget, side='right')
+        selected = order[:n_selected]
+
+        summary["replacements"][year] = n_selected
+        summary["spend"][year] = cost[selected].sum()
+        summary["risk_before"][year] = risk.sum()
+        summary["risk_after"][year] = risk.sum() - reduction[selected].sum()
+
+        plan["year"].append(np.full(n_selected, year + 1))
+        plan["asset_index"].append(selected)
+        plan["age"].append(ages[selected])
+        plan["risk_reduction"].append(reduction[selected])
+        plan["cost"].append(cost[selected])
+
+        ages[selected] = 0.0
+        p_fail[selected] = new_unit_p_fail[selected]
+        summary["expected_failures"][year] = p_fail.sum()
+
+        if simulate_failures:
+            failed = rng.random(n_assets) < p_fail
+            summary["simulated_failures"][year] = failed.sum()
+            ages += 1.0
+            ages[failed] = 0.0
+        else:
+            ages += 1.0
+
+    summary["year"] = np.arange(1, n_years + 1)
+    return {
+        "summary": summary,
+        "plan": {key: np.concatenate(values) for key, values in plan.items()},
+    }
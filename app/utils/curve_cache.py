@@ -0,0 +1,100 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.weibull_functions import generate_weibull_curve
+
+# Parameters closer than this (relative) share a cache entry
+PARAM_TOLERANCE = 1e-6
+
+# Upper bound on the bytes held by cached curve arrays across all sessions
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def _quantize(value, tolerance=PARAM_TOLERANCE):
+    """Round a positive parameter to a relative grid so near-identical values share a key."""
+    value = float(value)
+    if value <= 0:
+        return value
+    step = 10 ** np.floor(np.log10(value)) * tolerance
+    return round(value / step) * step
+
+
+class CurveCache:
+    """
+    Bounded, thread-safe LRU cache of Weibull curve arrays.
+
+    A single instance is shared by every Streamlit session in the process, so a curve
+    computed for one rerun (or one user) is reused by the next. Entries are evicted in
+    least-recently-used order once the stored arrays exceed `max_bytes`.
+    """
+
+    def __init__(self, max_bytes=MAX_CACHE_BYTES, tolerance=PARAM_TOLERANCE):
+        self.max_bytes = max_bytes
+        self.tolerance = tolerance
+        self.hits = 0
+        self.misses = 0
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_curve(self, shape, scale, curve_type='pdf', num_points=100):
+        """Return read-only (x, y) arrays for the curve, computing them on a miss."""
+        shape = _quantize(shape, self.tolerance)
+        scale = _quantize(scale, self.tolerance)
+        key = (shape, scale, curve_type.lower(), int(num_points))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Compute outside the lock so slow curves don't block other sessions
+        x, y = generate_weibull_curve(shape, scale, num_points=num_points, curve_type=curve_type)
+        x.setflags(write=False)
+        y.setflags(write=False)
+        entry = (x, y)
+        size = x.nbytes + y.nbytes
+
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = entry
+                self.current_bytes += size
+                while self.current_bytes > self.max_bytes:
+                    _, (old_x, old_y) = self._entries.popitem(last=False)
+                    self.current_bytes -= old_x.nbytes + old_y.nbytes
+        return entry
+
+    def stats(self):
+        """Return hit/miss counters and current memory use."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+# Process-wide instance shared across reruns and sessions
+curve_cache = CurveCache()
+
+
+def get_weibull_curve(shape, scale, num_points=100, curve_type='pdf'):
+    """Cached drop-in for generate_weibull_curve. The returned arrays are read-only."""
+    return curve_cache.get_curve(shape, scale, curve_type=curve_type, num_points=num_points)
@@ -1,48 +1,73 @@
+import gzip
+import io
+import json
+import tempfile
+import zipfile
 import pandas as pd
 import numpy as np
 from datetime import datetime
 from io import BytesIO
-from utils.weibull_functions import generate_weibull_curve
+from utils.curve_cache import get_weibull_curve
+
+# Parquet and Feather exports are offered when pyarrow is installed
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    COLUMNAR_AVAILABLE = True
+except ImportError:
+    COLUMNAR_AVAILABLE = False
+
+# Rows formatted per CSV chunk; bounds the text held in memory while exporting
+CSV_CHUNK_ROWS = 100_000
+
+# Exports larger than this spill from memory to a temporary file while being written
+SPOOL_MAX_BYTES = 16 * 1024 * 1024
+
+# File extension and MIME type for each CSV compression option
+CSV_COMPRESSION_FORMATS = {
+    None: (".csv", "text/csv"),
+    "gzip": (".csv.gz", "application/gzip"),
+    "zip": (".zip", "application/zip"),
+}
+
+# File extension and MIME type for each columnar format
+COLUMNAR_FORMATS = {
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+    "feather": (".feather", "application/vnd.apache.arrow.file"),
+}
+
+# Export column for each curve type, and the curves included by each export option
+CURVE_COLUMNS = {
+    'pdf': 'Probability_Density',
+    'cdf': 'Cumulative_Probability',
+    'hazard': 'Hazard_Rate',
+}
+CURVE_TYPES = {
+    'pdf': ('pdf',),
+    'cdf': ('cdf',),
+    'hazard': ('hazard',),
+    'both': ('pdf', 'cdf'),
+    'all': ('pdf', 'cdf', 'hazard'),
+}
+
+def curve_columns(shape, scale, curve_type='both', num_points=1000):
+    """
+    Curve data points as a column name -> NumPy array mapping, in export column order.
+
+    Unknown curve types export the PDF and CDF.
+    """
+    columns = {}
+    for kind in CURVE_TYPES.get(curve_type, CURVE_TYPES['both']):
+        # Use the same function that generates plot points to ensure consistency
+        x, values = get_weibull_curve(shape, scale, num_points=num_points, curve_type=kind)
+        columns.setdefault('Time', x)
+        columns[CURVE_COLUMNS[kind]] = values
+    return columns
 
 def export_curve_data(shape, scale, curve_type='both', num_points=1000):
     """Generate and export curve data points."""
-    # Use the same function that generates plot points to ensure consistency
-    if curve_type == 'pdf':
-        x, pdf = generate_weibull_curve(shape, scale, num_points=num_points, curve_type='pdf')
-        df = pd.DataFrame({
-            'Time': x,
-            'Probability_Density': pdf
-        })
-    elif curve_type == 'cdf':
-        x, cdf = generate_weibull_curve(shape, scale, num_points=num_points, curve_type='cdf')
-        df = pd.DataFrame({
-            'Time': x,
-            'Cumulative_Probability': cdf
-        })
-    elif curve_type == 'hazard':
-        x, hazard = generate_weibull_curve(shape, scale, num_points=num_points, curve_type='hazard')
-        df = pd.DataFrame({
-            'Time': x,
-            'Hazard_Rate': hazard
-        })
-    elif curve_type == 'all':
-        x, pdf = generate_weibull_curve(shape, scale, num_points=num_points, curve_type='pdf')
-        _, cdf = generate_weibull_curve(shape, scale, num_points=num_points, curve_type='cdf')
-        _, hazard = generate_weibull_curve(shape, scale, num_points=num_points, curve_type='hazard')
-        df = pd.DataFrame({
-            'Time': x,
-            'Probability_Density': pdf,
-            'Cumulative_Probability': cdf,
-            'Hazard_Rate': hazard
-        })
-    else:  # both pdf and cdf
-        x, pdf = generate_weibull_curve(shape, scale, num_points=num_points, curve_type='pdf')
-        _, cdf = generate_weibull_curve(shape, scale, num_points=num_points, curve_type='cdf')
-        df = pd.DataFrame({
-            'Time': x,
-            'Probability_Density': pdf,
-            'Cumulative_Probability': cdf
-        })
+    df = pd.DataFrame(curve_columns(shape, scale, curve_type, num_points))
 
     # Add parameters as metadata
     df.attrs['shape_parameter'] = shape
@@ -50,11 +75,79 @@ def export_curve_data(shape, scale, curve_type='both', num_points=1000):
 
     return df
 
-def get_csv_download(df, filename_prefix):
-    """Convert DataFrame to CSV bytes for download."""
+def iter_csv_chunks(df, columns=None, chunk_rows=CSV_CHUNK_ROWS):
+    """
+    Yield a DataFrame's CSV text chunk by chunk, header first.
+
+    Args:
+        df (DataFrame): Data to export
+        columns (dict): Optional source column -> output column name mapping; only
+            these columns are written, selected per chunk rather than copied up front
+        chunk_rows (int): Rows formatted per chunk
+    """
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        if columns is not None:
+            chunk = chunk[list(columns)].rename(columns=columns)
+        yield chunk.to_csv(index=False, header=start == 0)
+
+def write_csv_export(df, filename, compression=None, columns=None, chunk_rows=CSV_CHUNK_ROWS):
+    """
+    Write a DataFrame as CSV, compressed on the fly, into a spooled temporary file.
+
+    Chunks are encoded and compressed as they are produced, so memory use while
+    writing is one chunk plus the spooled output, which moves to disk beyond
+    SPOOL_MAX_BYTES.
+
+    Args:
+        df (DataFrame): Data to export
+        filename (str): Name of the CSV inside a zip archive
+        compression (str): None, "gzip" or "zip"
+        columns (dict): Optional source column -> output column name mapping
+
+    Returns:
+        SpooledTemporaryFile: The export, rewound to the start
+    """
+    if compression not in CSV_COMPRESSION_FORMATS:
+        raise ValueError(f"Unsupported CSV compression: {compression}")
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    if compression == "zip":
+        with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            with archive.open(filename, "w", force_zip64=True) as member:
+                for text in iter_csv_chunks(df, columns, chunk_rows):
+                    member.write(text.encode("utf-8"))
+    else:
+        stream = gzip.GzipFile(fileobj=output, mode="wb", compresslevel=6, mtime=0) if compression == "gzip" else output
+        for text in iter_csv_chunks(df, columns, chunk_rows):
+            stream.write(text.encode("utf-8"))
+        if stream is not output:
+            stream.close()
+    output.seek(0)
+    return output
+
+def download_file(output):
+    """
+    Wrap a written spooled temporary file as a file object for st.download_button.
+
+    The button reads buffered readers directly, so the export is never copied into
+    a bytes object of its own and can be kept (e.g. in session state) while it
+    stays spooled, on disk beyond SPOOL_MAX_BYTES.
+    """
+    output.seek(0)
+    return io.BufferedReader(output)
+
+def get_csv_download(df, filename_prefix, compression=None, columns=None):
+    """
+    Convert DataFrame to a CSV file object for download, optionally gzip- or zip-compressed.
+
+    The CSV is streamed through write_csv_export and handed over as the spooled
+    file, see download_file.
+    """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{filename_prefix}_{timestamp}.csv"
-    return df.to_csv(index=False).encode('utf-8'), filename
+    extension, _ = CSV_COMPRESSION_FORMATS[compression]
+    filename = f"{filename_prefix}_{timestamp}{extension}"
+    output = write_csv_export(df, f"{filename_prefix}_{timestamp}.csv", compression, columns)
+    return download_file(output), filename
 
 def get_excel_download(df, filename_prefix):
     """Convert DataFrame to Excel bytes for download."""
@@ -69,4 +162,74 @@ def get_excel_download(df, filename_prefix):
             'Value': [df.attrs.get('shape_parameter', 'N/A'), df.attrs.get('scale_parameter', 'N/A')]
         })
         params_df.to_excel(writer, sheet_name='Parameters', index=False)
-    return output.getvalue(), filename
\ No newline at end of file
+    return output.getvalue(), filename
+
+def _metadata_value(value):
+    """JSON fallback for NumPy scalars and other non-JSON metadata values."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+def _arrow_column(values):
+    """
+    Arrow array for one export column.
+
+    Object columns (e.g. raw LLM output mixing strings and lists) are written as
+    strings, lists and dicts JSON-encoded, so one column always has one Arrow type.
+    """
+    if getattr(values, "dtype", None) == object or isinstance(values, list):
+        return pa.array(
+            [None if value is None or value is pd.NA or (isinstance(value, float) and np.isnan(value))
+             else json.dumps(value, default=_metadata_value) if isinstance(value, (list, dict))
+             else str(value)
+             for value in values],
+            type=pa.string()
+        )
+    return pa.array(values)
+
+def to_arrow_table(data, metadata=None, columns=None):
+    """
+    Build an Arrow table from a DataFrame or a column name -> array mapping.
+
+    Each column is handed to Arrow directly (numeric NumPy columns without a copy),
+    so no intermediate DataFrame is built; object columns are written as strings. The metadata, and a DataFrame's attrs,
+    are stored JSON-encoded in the schema metadata, which Parquet and Feather keep.
+
+    Args:
+        data (DataFrame or dict): Data to export
+        metadata (dict): Extra key -> value metadata, e.g. fit parameters
+        columns (dict): Optional source column -> output column name mapping
+    """
+    if isinstance(data, pd.DataFrame):
+        metadata = {**data.attrs, **(metadata or {})}
+    if columns is None:
+        columns = {name: name for name in data}
+    table = pa.table({output: _arrow_column(data[source]) for source, output in columns.items()})
+    if metadata:
+        table = table.replace_schema_metadata({
+            str(key): json.dumps(value, default=_metadata_value) for key, value in metadata.items()
+        })
+    return table
+
+def get_columnar_download(data, filename_prefix, file_format="parquet", metadata=None, columns=None):
+    """
+    Convert a DataFrame or column arrays to a Parquet or Feather file object for download.
+
+    Both formats are zstd-compressed and carry the metadata in the file schema, see
+    to_arrow_table. The file is written into a spooled temporary file, see
+    download_file.
+    """
+    if not COLUMNAR_AVAILABLE:
+        raise RuntimeError("Parquet and Feather export require pyarrow")
+    if file_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unsupported columnar format: {file_format}")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    extension, _ = COLUMNAR_FORMATS[file_format]
+    filename = f"{filename_prefix}_{timestamp}{extension}"
+    table = to_arrow_table(data, metadata, columns)
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    if file_format == "parquet":
+        pq.write_table(table, output, compression="zstd")
+    else:
+        feather.write_feather(table, output, compression="zstd")
+    return download_file(output), filename
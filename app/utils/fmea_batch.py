@@ -0,0 +1,166 @@
+import asyncio
+import json
+import random
+import time
+
+import openai
+
+from utils.fmea_cache import fmea_cache, fmea_cache_key
+from utils.fmea_library import fmea_library
+from utils.llm_client import track_call, record_usage
+from utils.openai_service import (
+    MODEL_NAME,
+    PROMPT_VERSION,
+    COMPLETION_OPTIONS,
+    build_fmea_messages,
+    parse_fmea_content,
+    get_async_openai_client,
+)
+
+# Errors worth retrying with backoff; anything else fails the configuration immediately
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+def unique_configurations(configurations):
+    """
+    Drop repeated (asset_type, characteristics) pairs, keyed like the FMEA cache.
+
+    Returns:
+        dict: cache key -> (asset_type, characteristics), in first-seen order
+    """
+    unique = {}
+    for asset_type, characteristics in configurations:
+        key = fmea_cache_key(MODEL_NAME, PROMPT_VERSION, asset_type, characteristics)
+        unique.setdefault(key, (asset_type, characteristics))
+    return unique
+
+
+async def _request_with_backoff(client, semaphore, asset_type, characteristics,
+                                max_retries, base_delay, max_delay):
+    """One FMEA request under the concurrency limit, retried with jittered exponential backoff."""
+    retries = 0
+    while True:
+        queued = time.perf_counter()
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                with track_call("fmea_batch", MODEL_NAME) as call:
+                    call["queue_seconds"] = start - queued
+                    call["retries"] = retries
+                    response = await client.chat.completions.create(
+                        model=MODEL_NAME,
+                        messages=build_fmea_messages(asset_type, characteristics),
+                        **COMPLETION_OPTIONS
+                    )
+                    record_usage(call, response.usage)
+                return parse_fmea_content(response.choices[0].message.content), time.perf_counter() - start, retries
+            except RETRYABLE_ERRORS:
+                if retries >= max_retries:
+                    raise
+        # Sleep outside the semaphore so a backed-off request does not hold a slot
+        delay = min(max_delay, base_delay * 2 ** retries) * random.uniform(0.5, 1.5)
+        retries += 1
+        await asyncio.sleep(delay)
+
+
+async def generate_fmea_batch_async(configurations, max_concurrency=8, max_retries=6, base_delay=1.0,
+                                    max_delay=60.0, use_cache=True, on_result=None, client=None,
+                                    use_library=True):
+    """
+    Generate FMEAs for many asset configurations concurrently.
+
+    Identical configurations are requested once, and configurations already in the
+    FMEA cache are not requested at all. At most `max_concurrency` requests are in
+    flight; rate-limit, timeout and server errors are retried with jittered
+    exponential backoff. Every result is stored in the FMEA cache and passed to
+    `on_result` as soon as it completes, so a long batch can be written out
+    incrementally. Generated FMEAs are also added to the FMEA library; the batch
+    never substitutes a library match, since every configuration gets its own FMEA.
+
+    Args:
+        configurations (iterable): (asset_type, characteristics dict) pairs
+        max_concurrency (int): Maximum number of requests in flight
+        max_retries (int): Retries per configuration before giving up
+        base_delay (float): First backoff delay in seconds
+        max_delay (float): Cap on a single backoff delay in seconds
+        use_cache (bool): Serve and store results through the FMEA cache
+        on_result (callable): Called with each result record as it completes
+        client (AsyncOpenAI): Optional client, e.g. pointed at a local endpoint
+        use_library (bool): Add generated FMEAs to the FMEA library
+
+    Returns:
+        list: One record per unique configuration with "key", "asset_type",
+              "characteristics", "status" ("cached", "generated" or "failed"),
+              "fmea", "error", "seconds" and "retries"
+    """
+    unique = unique_configurations(configurations)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    owns_client = client is None
+    client = client or get_async_openai_client()
+    records = []
+
+    def emit(record):
+        records.append(record)
+        if on_result is not None:
+            on_result(record)
+
+    async def run_one(key, asset_type, characteristics):
+        record = {"key": key, "asset_type": asset_type, "characteristics": characteristics,
+                  "status": "generated", "fmea": None, "error": None, "seconds": 0.0, "retries": 0}
+        try:
+            fmea_data, seconds, retries = await _request_with_backoff(
+                client, semaphore, asset_type, characteristics, max_retries, base_delay, max_delay
+            )
+            record.update(fmea=fmea_data, seconds=seconds, retries=retries)
+            if use_cache:
+                await asyncio.to_thread(fmea_cache.put, key, fmea_data, seconds)
+            if use_library:
+                await asyncio.to_thread(fmea_library.add, asset_type, characteristics, fmea_data, "generated",
+                                        MODEL_NAME, PROMPT_VERSION)
+        except Exception as e:
+            record.update(status="failed", error=str(e))
+        emit(record)
+
+    tasks = []
+    for key, (asset_type, characteristics) in unique.items():
+        cached = fmea_cache.get(key) if use_cache else None
+        if cached is not None:
+            emit({"key": key, "asset_type": asset_type, "characteristics": characteristics,
+                  "status": "cached", "fmea": cached[0], "error": None, "seconds": 0.0, "retries": 0})
+        else:
+            tasks.append(run_one(key, asset_type, characteristics))
+
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        if owns_client:
+            await client.close()
+    return records
+
+
+def generate_fmea_batch(configurations, output_path=None, on_result=None, **kwargs):
+    """
+    Synchronous entry point for batch generation, e.g. from a Streamlit script.
+
+    When `output_path` is given, each record is appended to it as one JSON line as soon
+    as it completes, so partial progress survives an interrupted batch.
+    """
+    output = open(output_path, "a", encoding="utf-8") if output_path else None
+
+    def handle(record):
+        if output is not None:
+            output.write(json.dumps(record, default=str) + "\n")
+            output.flush()
+        if on_result is not None:
+            on_result(record)
+
+    try:
+        return asyncio.run(generate_fmea_batch_async(configurations, on_result=handle, **kwargs))
+    finally:
+        if output is not None:
+            output.close()
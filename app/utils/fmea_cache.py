@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# On-disk location, shared by every session and worker process on the host
+CACHE_PATH = os.environ.get(
+    "FMEA_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "weibullfit", "fmea_cache.sqlite3")
+)
+
+# Cached FMEAs older than this are regenerated
+DEFAULT_TTL_SECONDS = float(os.environ.get("FMEA_CACHE_TTL_SECONDS", 30 * 24 * 60 * 60))
+
+# Upper bound on stored payload bytes before least-recently-used entries are evicted
+MAX_CACHE_BYTES = int(os.environ.get("FMEA_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+
+def normalize_characteristics(characteristics):
+    """
+    Characteristics with plain Python values, as the FMEA page enters them.
+
+    NumPy scalars (e.g. read from a CSV register) become Python values and
+    whole-number floats become ints, since pandas reads an integer column with
+    missing values as floats; 138.0 and 138 then give the same prompt and cache key.
+    """
+    normalized = {}
+    for name, value in characteristics.items():
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        normalized[name] = value
+    return normalized
+
+
+def fmea_cache_key(model, prompt_version, asset_type, characteristics):
+    """
+    Canonical content hash of an FMEA request.
+
+    Characteristics are serialized with sorted keys, so the same configuration entered
+    in a different order maps to the same entry.
+    """
+    canonical = json.dumps(
+        {
+            "model": model,
+            "prompt_version": prompt_version,
+            "asset_type": asset_type,
+            "characteristics": characteristics,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class FMEACache:
+    """
+    Persistent, content-addressed cache of generated FMEAs.
+
+    Entries live in a SQLite database in WAL mode, so concurrent Streamlit sessions and
+    separate worker processes can read and write it safely. Each entry records how long
+    the original generation took, which is reported as latency saved on every hit.
+    Entries expire after `ttl_seconds`; once stored payloads exceed `max_bytes`, the
+    least recently used entries are evicted. Within a process, concurrent misses for
+    the same key wait for a single generation instead of each calling the API.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl_seconds=DEFAULT_TTL_SECONDS, max_bytes=MAX_CACHE_BYTES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            yield connection
+        finally:
+            connection.close()
+
+    def _ensure_schema(self):
+        if self._initialized:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS fmea_cache (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    generation_seconds REAL NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+        self._initialized = True
+
+    def get(self, key):
+        """Return (value, generation_seconds) for a fresh entry, or None."""
+        self._ensure_schema()
+        now = time.time()
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT payload, generation_seconds FROM fmea_cache WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE fmea_cache SET last_access = ?, hit_count = hit_count + 1 WHERE key = ?",
+                (now, key)
+            )
+        return json.loads(row[0]), row[1]
+
+    def put(self, key, value, generation_seconds):
+        """Store a value, then drop expired entries and evict down to max_bytes."""
+        self._ensure_schema()
+        payload = json.dumps(value)
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO fmea_cache "
+                "(key, payload, size, created_at, last_access, generation_seconds) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now, generation_seconds)
+            )
+            connection.execute("DELETE FROM fmea_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+            connection.execute("""
+                DELETE FROM fmea_cache WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY last_access DESC, key) AS cumulative_size
+                        FROM fmea_cache
+                    ) WHERE cumulative_size > ?
+                )
+            """, (self.max_bytes,))
+
+    def lookup(self, key):
+        """
+        Return a cached value with its lookup details, counting the hit, or None.
+
+        Returns:
+            tuple: (value, info) where info has "hit", "lookup_seconds" and
+                   "seconds_saved" (original generation time minus lookup time)
+        """
+        start = time.perf_counter()
+        cached = self.get(key)
+        if cached is None:
+            return None
+        value, generation_seconds = cached
+        lookup_seconds = time.perf_counter() - start
+        seconds_saved = max(generation_seconds - lookup_seconds, 0.0)
+        with self._lock:
+            self.hits += 1
+            self.seconds_saved += seconds_saved
+        return value, {"hit": True, "lookup_seconds": lookup_seconds, "seconds_saved": seconds_saved}
+
+    @contextmanager
+    def single_flight(self, key):
+        """
+        Serialize generation of one key within this process.
+
+        Concurrent callers for the same key wait for the first to finish. Yields the
+        cached (value, info) when another caller stored the key while this one waited;
+        otherwise yields None, counts a miss, and the caller generates and put()s it.
+        """
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                # Another session may have generated it while we waited
+                cached = self.lookup(key)
+                if cached is None:
+                    with self._lock:
+                        self.misses += 1
+                yield cached
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    self._key_locks.pop(key, None)
+
+    def get_or_create(self, key, create):
+        """
+        Return a cached value, calling `create()` to generate and store it on a miss.
+
+        Returns:
+            tuple: (value, info) as returned by lookup(), with "hit" False on a miss
+        """
+        cached = self.lookup(key)
+        if cached is not None:
+            return cached
+        with self.single_flight(key) as cached:
+            if cached is not None:
+                return cached
+            generation_start = time.perf_counter()
+            value = create()
+            generation_seconds = time.perf_counter() - generation_start
+            self.put(key, value, generation_seconds)
+            return value, {"hit": False, "lookup_seconds": 0.0, "seconds_saved": 0.0}
+
+    def stats(self):
+        """Return this process's hit/miss counters and the stored entries' totals."""
+        self._ensure_schema()
+        with self._connect() as connection:
+            entries, size, total_hits, total_saved = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hit_count), 0), "
+                "COALESCE(SUM(hit_count * generation_seconds), 0) FROM fmea_cache"
+            ).fetchone()
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "seconds_saved": self.seconds_saved,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "stored_hits": total_hits,
+                "stored_seconds_saved": total_saved,
+            }
+
+    def clear(self):
+        """Delete all entries and reset the counters."""
+        self._ensure_schema()
+        with self._connect() as connection:
+            connection.execute("DELETE FROM fmea_cache")
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.seconds_saved = 0.0
+
+
+# Process-wide instance backed by the shared database file
+fmea_cache = FMEACache()
@@ -0,0 +1,345 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+
+import numpy as np
+
+from utils.asset_data import get_operating_characteristics
+from utils.fmea_cache import DEFAULT_TTL_SECONDS
+
+# On-disk location, next to the FMEA cache by default
+LIBRARY_PATH = os.environ.get(
+    "FMEA_LIBRARY_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "weibullfit", "fmea_library.sqlite3")
+)
+
+# Optional JSON file of curated entries loaded on first use:
+# [{"asset_type": ..., "characteristics": {...}, "failure_modes": [...]}, ...]
+CURATED_PATH = os.environ.get("FMEA_LIBRARY_CURATED_PATH")
+
+# Matches below this similarity are treated as a miss and go to the LLM
+DEFAULT_MIN_SIMILARITY = float(os.environ.get("FMEA_LIBRARY_MIN_SIMILARITY", 0.85))
+
+# Generated entries older than this are not matched, like FMEA cache entries
+LIBRARY_TTL_SECONDS = float(os.environ.get("FMEA_LIBRARY_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+
+# Upper bound on stored generated payload bytes before the oldest are evicted;
+# curated entries are never evicted
+MAX_LIBRARY_BYTES = int(os.environ.get("FMEA_LIBRARY_MAX_BYTES", 256 * 1024 * 1024))
+
+
+def configuration_key(asset_type, characteristics):
+    """Canonical hash of an asset configuration, independent of characteristic order."""
+    canonical = json.dumps(
+        {"asset_type": asset_type, "characteristics": characteristics},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _numeric_range(spec):
+    """(min, max) of a numeric characteristic spec, or None for a categorical one."""
+    if isinstance(spec, Mapping) and spec.get("type") == "range":
+        return spec["min"], spec["max"]
+    return None
+
+
+class _AssetTypeIndex:
+    """
+    Encoded characteristics of every stored configuration of one asset type.
+
+    Numeric characteristics are kept as a float matrix scaled by their range and
+    categorical ones as integer codes, so a query is scored against all entries with
+    a few array operations (a Gower similarity).
+    """
+
+    def __init__(self, asset_type, entries):
+        schema = get_operating_characteristics(asset_type)
+        self.entries = entries
+        self.features = sorted({name for entry in entries for name in entry["characteristics"]})
+        self.column = {name: i for i, name in enumerate(self.features)}
+        n_entries, n_features = len(entries), len(self.features)
+
+        self.is_numeric = np.zeros(n_features, dtype=bool)
+        self.ranges = np.ones(n_features)
+        self.vocabularies = [{} for _ in self.features]
+        self.numeric = np.full((n_entries, n_features), np.nan)
+        self.codes = np.full((n_entries, n_features), -1, dtype=np.int64)
+
+        for j, name in enumerate(self.features):
+            values = [entry["characteristics"].get(name) for entry in entries]
+            spec_range = _numeric_range(schema.get(name))
+            present = [value for value in values if value is not None]
+            numeric = spec_range is not None or all(
+                isinstance(value, (int, float)) and not isinstance(value, bool) for value in present
+            )
+            if numeric:
+                self.is_numeric[j] = True
+                column = np.array([np.nan if value is None else float(value) for value in values])
+                self.numeric[:, j] = column
+                if spec_range is not None:
+                    low, high = spec_range
+                else:
+                    low, high = np.nanmin(column), np.nanmax(column)
+                self.ranges[j] = high - low if high > low else 1.0
+            else:
+                vocabulary = self.vocabularies[j]
+                for i, value in enumerate(values):
+                    if value is not None:
+                        self.codes[i, j] = vocabulary.setdefault(str(value), len(vocabulary))
+
+        # Curated entries win ties against generated ones, and never expire
+        self.curated = np.array([entry["source"] == "curated" for entry in entries], dtype=int)
+        self.updated_at = np.array([entry["updated_at"] for entry in entries], dtype=float)
+
+    def similarities(self, characteristics):
+        """Similarity in [0, 1] of every entry to a query configuration."""
+        n_query = len(characteristics)
+        if n_query == 0:
+            return np.zeros(len(self.entries))
+        total = np.zeros(len(self.entries))
+        for name, value in characteristics.items():
+            j = self.column.get(name)
+            if j is None or value is None:
+                continue
+            if self.is_numeric[j]:
+                try:
+                    query_value = float(value)
+                except (TypeError, ValueError):
+                    continue
+                score = 1.0 - np.abs(self.numeric[:, j] - query_value) / self.ranges[j]
+                # Entries without this characteristic count as a mismatch
+                total += np.nan_to_num(np.clip(score, 0.0, 1.0), nan=0.0)
+            else:
+                code = self.vocabularies[j].get(str(value), -2)
+                total += self.codes[:, j] == code
+        return total / n_query
+
+    def nearest(self, characteristics, fresh_after=None):
+        """Best entry and its similarity; generated entries updated before `fresh_after` are skipped."""
+        similarities = self.similarities(characteristics)
+        if fresh_after is not None:
+            similarities[(self.curated == 0) & (self.updated_at < fresh_after)] = -1.0
+        # Highest similarity first, then curated entries
+        best = np.lexsort((-self.curated, -similarities))[0]
+        return self.entries[best], float(similarities[best])
+
+
+class FMEALibrary:
+    """
+    Local library of FMEAs for known asset configurations.
+
+    Entries come from past generations (added as they complete) and curated FMEAs,
+    stored in a SQLite database shared by every session and worker process. Lookups
+    score a request against an in-memory index of every stored configuration of the
+    same asset type and return the nearest one, without any network call. The index is
+    rebuilt only when the stored entries change.
+
+    Generated entries follow the FMEA cache's invalidation: they only match requests
+    for the same model and prompt version, stop matching after `ttl_seconds`, and the
+    oldest are evicted once their payloads exceed `max_bytes`. Curated entries match
+    any model and prompt version and are kept until cleared.
+    """
+
+    def __init__(self, path=LIBRARY_PATH, curated_path=CURATED_PATH, ttl_seconds=LIBRARY_TTL_SECONDS,
+                 max_bytes=MAX_LIBRARY_BYTES):
+        self.path = path
+        self.curated_path = curated_path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._initialized = False
+        self._revision = None
+        self._indexes = {}
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            yield connection
+        finally:
+            connection.close()
+
+    def _ensure_schema(self):
+        if self._initialized:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS fmea_library (
+                    key TEXT PRIMARY KEY,
+                    asset_type TEXT NOT NULL,
+                    characteristics TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    model TEXT,
+                    prompt_version TEXT,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(fmea_library)")}
+            if "prompt_version" not in columns:
+                # Libraries created before prompt versions were recorded; their generated
+                # entries no longer match and are replaced as configurations are regenerated
+                connection.execute("ALTER TABLE fmea_library ADD COLUMN prompt_version TEXT")
+        self._initialized = True
+        if self.curated_path and os.path.exists(self.curated_path):
+            self.load_curated(self.curated_path)
+
+    def add(self, asset_type, characteristics, fmea_data, source="generated", model=None, prompt_version=None):
+        """
+        Store an FMEA for a configuration, replacing any entry for the same configuration.
+
+        A generated FMEA never replaces a curated one. Adding a generated entry drops
+        expired ones and evicts the oldest down to max_bytes.
+        """
+        self._ensure_schema()
+        key = configuration_key(asset_type, characteristics)
+        now = time.time()
+        with self._connect() as connection:
+            if source != "curated":
+                row = connection.execute("SELECT source FROM fmea_library WHERE key = ?", (key,)).fetchone()
+                if row is not None and row[0] == "curated":
+                    return
+            connection.execute(
+                "INSERT OR REPLACE INTO fmea_library "
+                "(key, asset_type, characteristics, payload, source, model, prompt_version, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, asset_type, json.dumps(characteristics, default=str), json.dumps(fmea_data),
+                 source, model, prompt_version, now)
+            )
+            if source != "curated":
+                connection.execute(
+                    "DELETE FROM fmea_library WHERE source != 'curated' AND updated_at < ?",
+                    (now - self.ttl_seconds,)
+                )
+                connection.execute("""
+                    DELETE FROM fmea_library WHERE key IN (
+                        SELECT key FROM (
+                            SELECT key, SUM(LENGTH(payload)) OVER (ORDER BY updated_at DESC, key) AS cumulative_size
+                            FROM fmea_library WHERE source != 'curated'
+                        ) WHERE cumulative_size > ?
+                    )
+                """, (self.max_bytes,))
+
+    def load_curated(self, path_or_file):
+        """
+        Add curated entries from a JSON list of
+        {"asset_type", "characteristics", "failure_modes"} objects.
+
+        Returns:
+            int: Number of entries added
+        """
+        if hasattr(path_or_file, "read"):
+            entries = json.load(path_or_file)
+        else:
+            with open(path_or_file) as f:
+                entries = json.load(f)
+        for entry in entries:
+            self.add(entry["asset_type"], entry.get("characteristics", {}),
+                     {"failure_modes": entry["failure_modes"]}, source="curated")
+        return len(entries)
+
+    def _current_revision(self, connection):
+        return connection.execute(
+            "SELECT COUNT(*), COALESCE(MAX(updated_at), 0) FROM fmea_library"
+        ).fetchone()
+
+    def _index(self, asset_type, model, prompt_version):
+        """
+        Return the index of the entries matchable for an asset type, model and prompt
+        version, rebuilding all indexes if entries changed.
+        """
+        self._ensure_schema()
+        index_key = (asset_type, model, prompt_version)
+        with self._connect() as connection:
+            revision = self._current_revision(connection)
+            with self._lock:
+                if revision != self._revision:
+                    self._indexes = {}
+                    self._revision = revision
+                if index_key in self._indexes:
+                    return self._indexes[index_key]
+            rows = connection.execute(
+                "SELECT characteristics, payload, source, updated_at FROM fmea_library "
+                "WHERE asset_type = ? AND (source = 'curated' OR (model IS ? AND prompt_version IS ?))",
+                (asset_type, model, prompt_version)
+            ).fetchall()
+        entries = [
+            {"characteristics": json.loads(characteristics), "payload": payload, "source": source,
+             "updated_at": updated_at}
+            for characteristics, payload, source, updated_at in rows
+        ]
+        index = _AssetTypeIndex(asset_type, entries) if entries else None
+        with self._lock:
+            if self._revision == revision:
+                self._indexes[index_key] = index
+        return index
+
+    def lookup(self, asset_type, characteristics, min_similarity=DEFAULT_MIN_SIMILARITY, model=None,
+               prompt_version=None):
+        """
+        Find the stored FMEA for the configuration nearest to this one.
+
+        Only curated entries and unexpired generated entries from the same model and
+        prompt version are considered.
+
+        Returns:
+            tuple: (fmea_data, match) where match has "similarity", "source" and the
+                   matched "characteristics", or None when nothing is similar enough
+        """
+        start = time.perf_counter()
+        index = self._index(asset_type, model, prompt_version)
+        if index is None:
+            return None
+        entry, similarity = index.nearest(characteristics, fresh_after=time.time() - self.ttl_seconds)
+        if similarity < min_similarity:
+            return None
+        return json.loads(entry["payload"]), {
+            "similarity": similarity,
+            "source": entry["source"],
+            "characteristics": entry["characteristics"],
+            "lookup_seconds": time.perf_counter() - start,
+        }
+
+    def stats(self):
+        """Return the number of stored configurations by source and asset type, and their size."""
+        self._ensure_schema()
+        with self._connect() as connection:
+            by_source = dict(connection.execute(
+                "SELECT source, COUNT(*) FROM fmea_library GROUP BY source"
+            ).fetchall())
+            asset_types, size = connection.execute(
+                "SELECT COUNT(DISTINCT asset_type), COALESCE(SUM(LENGTH(payload)), 0) FROM fmea_library"
+            ).fetchone()
+        return {
+            "entries": sum(by_source.values()),
+            "generated": by_source.get("generated", 0),
+            "curated": by_source.get("curated", 0),
+            "asset_types": asset_types,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self, source=None):
+        """Delete all entries, or only those from one source."""
+        self._ensure_schema()
+        with self._connect() as connection:
+            if source is None:
+                connection.execute("DELETE FROM fmea_library")
+            else:
+                connection.execute("DELETE FROM fmea_library WHERE source = ?", (source,))
+
+
+# Process-wide instance backed by the shared database file
+fmea_library = FMEALibrary()
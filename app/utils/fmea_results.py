@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+# Parameters assumed for failure modes the LLM returned without them
+DEFAULT_BETA = 1.5
+DEFAULT_ETA = 10000.0
+
+RATING_COLUMNS = ["severity", "occurrence", "detection", "rpn"]
+PARAMETER_COLUMNS = ["weibull_beta", "weibull_eta", "mttf"]
+
+# Leading columns of the FMEA table, in display order; Weibull parameters are shown elsewhere
+DISPLAY_COLUMNS = ["failure_mode", "effect", "cause", "severity", "occurrence", "detection", "rpn"]
+
+
+class FMEAResultStore:
+    """
+    Columnar, indexed view of one FMEA, built once when the FMEA arrives.
+
+    Holds the failure modes as a typed DataFrame (numeric ratings and Weibull
+    parameters), float arrays of beta and eta with the page's defaults filled in, and
+    a failure mode name -> row index, so tabs and exports look up a mode in O(1)
+    instead of scanning the list of dicts. The first row wins when an FMEA repeats a
+    failure mode name. `curves` holds the generate_weibull_data() output per mode.
+
+    Derived views (figures, tables) are memoized on the store through view(), so they
+    live exactly as long as the FMEA they were built from.
+    """
+
+    def __init__(self, failure_modes, curves=None):
+        self.curves = curves if curves is not None else {}
+        self._views = {}
+        self.records = failure_modes if isinstance(failure_modes, list) else list(failure_modes)
+        self.names = [str(mode.get("failure_mode", "")) for mode in self.records]
+        self.index = {}
+        for row, name in enumerate(self.names):
+            self.index.setdefault(name, row)
+
+        table = pd.DataFrame(self.records)
+        for column in RATING_COLUMNS + PARAMETER_COLUMNS:
+            if column in table.columns:
+                table[column] = pd.to_numeric(table[column], errors="coerce")
+        self.table = table
+
+        self.beta = self._parameter("weibull_beta", DEFAULT_BETA)
+        self.eta = self._parameter("weibull_eta", DEFAULT_ETA)
+
+        # Display table: the leading columns in order when present, then any others
+        if not table.empty and set(DISPLAY_COLUMNS).issubset(table.columns):
+            display_table = table[DISPLAY_COLUMNS + [
+                column for column in table.columns if column not in DISPLAY_COLUMNS + ["weibull_beta", "weibull_eta"]
+            ]]
+        else:
+            display_table = table
+        self.display_table = display_table
+
+    def _parameter(self, column, default):
+        if column not in self.table.columns:
+            return np.full(len(self.records), default)
+        return self.table[column].fillna(default).to_numpy(dtype=float)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def row(self, name):
+        """Return a failure mode's fields, or an empty dict for an unknown name."""
+        row = self.index.get(name)
+        return self.records[row] if row is not None else {}
+
+    def parameters(self, names):
+        """Return (beta, eta) arrays for the named failure modes, defaulting unknown names."""
+        rows = np.array([self.index.get(name, -1) for name in names], dtype=int)
+        known = rows >= 0
+        betas = np.full(len(rows), DEFAULT_BETA)
+        etas = np.full(len(rows), DEFAULT_ETA)
+        betas[known] = self.beta[rows[known]]
+        etas[known] = self.eta[rows[known]]
+        return betas, etas
+
+    def view(self, name, build, *inputs):
+        """
+        Return build(self, *inputs), rebuilt only when the inputs differ from the last call.
+
+        One result is kept per view name; inputs must be comparable with ==.
+        """
+        cached = self._views.get(name)
+        if cached is None or cached[0] != inputs:
+            cached = self._views[name] = (inputs, build(self, *inputs))
+        return cached[1]
@@ -0,0 +1,110 @@
+import json
+import time
+
+
+class FailureModeStreamParser:
+    """
+    Incremental parser for the "failure_modes" array of a streamed FMEA completion.
+
+    Text deltas are fed in as they arrive; each failure-mode object is returned as soon
+    as its closing brace is seen, while later modes are still being generated. Parsing
+    stops at the array's closing bracket, and objects without a "failure_mode" field
+    are skipped. The scan buffer only holds the unfinished object; the full text is
+    kept separately for validating the complete response (see full_text()).
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._in_array = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._object_start = None
+        self._done = False
+        self.text = []
+
+    def feed(self, delta):
+        """Consume a text delta and return the failure modes completed by it."""
+        self.text.append(delta)
+        completed = []
+        if self._done:
+            return completed
+        self._buffer += delta
+
+        if not self._in_array:
+            key = self._buffer.find('"failure_modes"')
+            bracket = self._buffer.find("[", key) if key >= 0 else -1
+            if bracket < 0:
+                return completed
+            self._in_array = True
+            self._pos = bracket + 1
+
+        buffer = self._buffer
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._object_start = i
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0 and self._object_start is not None:
+                    mode = json.loads(buffer[self._object_start:i + 1])
+                    if isinstance(mode, dict) and "failure_mode" in mode:
+                        completed.append(mode)
+                    self._object_start = None
+            elif char == "]" and self._depth == 0:
+                # End of the failure_modes array; anything after it is not a failure mode
+                self._done = True
+                self._buffer = ""
+                return completed
+
+        # Keep only the unfinished object (if any) for the next delta
+        keep_from = self._object_start if self._object_start is not None else len(buffer)
+        self._buffer = buffer[keep_from:]
+        self._pos = len(self._buffer)
+        if self._object_start is not None:
+            self._object_start = 0
+        return completed
+
+    def full_text(self):
+        """The complete streamed text received so far."""
+        return "".join(self.text)
+
+
+def record_text_stream(text_stream, path):
+    """Pass text deltas through unchanged while saving them to a JSON Lines recording."""
+    with open(path, "w", encoding="utf-8") as recording:
+        start = time.perf_counter()
+        for delta in text_stream:
+            recording.write(json.dumps({"t": time.perf_counter() - start, "delta": delta}) + "\n")
+            yield delta
+
+
+def replay_text_stream(path, speed=1.0):
+    """
+    Replay a recording made by record_text_stream, in place of a live completion stream.
+
+    Args:
+        path (str): Recording file
+        speed (float): Playback speed relative to the recorded timing; 0 replays instantly
+    """
+    start = time.perf_counter()
+    with open(path, encoding="utf-8") as recording:
+        for line in recording:
+            event = json.loads(line)
+            if speed > 0:
+                wait = event["t"] / speed - (time.perf_counter() - start)
+                if wait > 0:
+                    time.sleep(wait)
+            yield event["delta"]
@@ -0,0 +1,164 @@
+import os
+import numpy as np
+
+# Compiled kernels are used when numba is available. Set WEIBULL_KERNEL_BACKEND=numpy
+# to force the pure-NumPy path (useful for debugging or on platforms without numba).
+try:
+    if os.environ.get("WEIBULL_KERNEL_BACKEND", "").lower() == "numpy":
+        raise ImportError
+    from numba import njit, prange
+    BACKEND = "numba"
+except ImportError:
+    BACKEND = "numpy"
+
+# Below this size the thread start-up cost outweighs the parallel speed-up
+PARALLEL_THRESHOLD = 100_000
+
+
+def _prepare(x, out):
+    """
+    Coerce input to a contiguous float64 array and allocate the output if needed.
+
+    A given `out` must be a C-contiguous float64 array of the same shape as `x`; the
+    compiled kernels write through a flat view of it, which a strided array would not
+    provide.
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    if out is None:
+        out = np.empty_like(x)
+    elif not (isinstance(out, np.ndarray) and out.dtype == np.float64
+              and out.shape == x.shape and out.flags.c_contiguous):
+        raise ValueError("out must be a C-contiguous float64 array with the same shape as x")
+    return x, out
+
+
+if BACKEND == "numba":
+
+    def _pdf_loop(x, shape, scale, out):
+        c = shape / scale
+        for i in prange(x.shape[0]):
+            z = x[i] / scale
+            zs = z ** shape
+            if z > 0.0:
+                out[i] = c * (zs / z) * np.exp(-zs)
+            else:
+                out[i] = c * z ** (shape - 1.0) * np.exp(-zs)
+
+    def _cdf_loop(x, shape, scale, out):
+        for i in prange(x.shape[0]):
+            out[i] = -np.expm1(-((x[i] / scale) ** shape))
+
+    def _hazard_loop(x, shape, scale, out):
+        c = shape / scale
+        for i in prange(x.shape[0]):
+            out[i] = c * (x[i] / scale) ** (shape - 1.0)
+
+    def _loglik_sums_loop(x, shape, scale, eps):
+        sum_log_x = 0.0
+        sum_z = 0.0
+        sum_z_log_z = 0.0
+        log_scale = np.log(scale)
+        for i in prange(x.shape[0]):
+            log_x = np.log(max(x[i], eps))
+            log_u = log_x - log_scale
+            z = np.exp(shape * log_u)
+            sum_log_x += log_x
+            sum_z += z
+            sum_z_log_z += z * log_u
+        return sum_log_x, sum_z, sum_z_log_z
+
+    # Each loop is compiled twice: a serial version for the small arrays the plots use,
+    # and a multi-threaded one for fleet-sized inputs.
+    _serial = {f.__name__: njit(cache=True)(f) for f in
+               (_pdf_loop, _cdf_loop, _hazard_loop, _loglik_sums_loop)}
+    _parallel = {f.__name__: njit(cache=True, parallel=True)(f) for f in
+                 (_pdf_loop, _cdf_loop, _hazard_loop, _loglik_sums_loop)}
+
+    def _dispatch(name, x):
+        return (_parallel if x.size >= PARALLEL_THRESHOLD else _serial)[name]
+
+    def _pdf(x, shape, scale, out):
+        _dispatch("_pdf_loop", x)(x.ravel(), shape, scale, out.ravel())
+
+    def _cdf(x, shape, scale, out):
+        _dispatch("_cdf_loop", x)(x.ravel(), shape, scale, out.ravel())
+
+    def _hazard(x, shape, scale, out):
+        _dispatch("_hazard_loop", x)(x.ravel(), shape, scale, out.ravel())
+
+    def _loglik_sums(x, shape, scale, eps):
+        return _dispatch("_loglik_sums_loop", x)(x.ravel(), shape, scale, eps)
+
+else:
+
+    def _pdf(x, shape, scale, out):
+        np.divide(x, scale, out=out)
+        tail = np.power(out, shape)
+        np.negative(tail, out=tail)
+        np.exp(tail, out=tail)
+        np.power(out, shape - 1.0, out=out)
+        out *= tail
+        out *= shape / scale
+
+    def _cdf(x, shape, scale, out):
+        np.divide(x, scale, out=out)
+        np.power(out, shape, out=out)
+        np.negative(out, out=out)
+        np.expm1(out, out=out)
+        np.negative(out, out=out)
+
+    def _hazard(x, shape, scale, out):
+        np.divide(x, scale, out=out)
+        np.power(out, shape - 1.0, out=out)
+        out *= shape / scale
+
+    def _loglik_sums(x, shape, scale, eps):
+        log_u = np.log(np.maximum(x, eps))
+        sum_log_x = log_u.sum()
+        log_u -= np.log(scale)
+        z = np.exp(shape * log_u)
+        return sum_log_x, z.sum(), np.dot(z, log_u)
+
+
+def weibull_pdf(x, shape, scale, out=None):
+    """Weibull PDF in a single pass. Writes into `out` when given."""
+    if np.ndim(x) == 0:
+        return (shape / scale) * (x / scale)**(shape - 1) * np.exp(-(x / scale)**shape)
+    x, out = _prepare(x, out)
+    _pdf(x, float(shape), float(scale), out)
+    return out
+
+
+def weibull_cdf(x, shape, scale, out=None):
+    """Weibull CDF in a single pass. Writes into `out` when given."""
+    if np.ndim(x) == 0:
+        return 1 - np.exp(-(x / scale)**shape)
+    x, out = _prepare(x, out)
+    _cdf(x, float(shape), float(scale), out)
+    return out
+
+
+def weibull_hazard(x, shape, scale, out=None):
+    """Weibull hazard in a single pass. Writes into `out` when given."""
+    if np.ndim(x) == 0:
+        return (shape / scale) * (x / scale)**(shape - 1)
+    x, out = _prepare(x, out)
+    _hazard(x, float(shape), float(scale), out)
+    return out
+
+
+def weibull_loglik_sums(x, shape, scale, eps=1e-10):
+    """
+    Sufficient statistics for the Weibull log-likelihood and its gradient.
+
+    Args:
+        x (array): Lifetimes (values below `eps` are clamped to `eps`)
+        shape (float): Shape parameter
+        scale (float): Scale parameter
+        eps (float): Lower clamp that keeps log(x) finite
+
+    Returns:
+        tuple: (sum(log x), sum(z), sum(z * log(x / scale))) with z = (x / scale) ** shape
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    return _loglik_sums(x, float(shape), float(scale), float(eps))
@@ -0,0 +1,282 @@
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+import openai
+from httpx import Limits
+from openai import OpenAI, AsyncOpenAI
+
+# One JSON object per line on stderr; set LLM_METRICS_LOG_LEVEL=WARNING to silence
+logger = logging.getLogger("weibullfit.llm")
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(os.environ.get("LLM_METRICS_LOG_LEVEL", "INFO"))
+    logger.propagate = False
+
+
+def load_client_config():
+    """
+    Client settings from the environment.
+
+    LLM_BASE_URL (or OPENAI_BASE_URL) points the client at any OpenAI-compatible
+    server, e.g. a local stub, and LLM_API_KEY overrides OPENAI_API_KEY for it.
+    """
+    return {
+        "api_key": os.environ.get("LLM_API_KEY") or os.environ.get("OPENAI_API_KEY"),
+        "base_url": os.environ.get("LLM_BASE_URL") or os.environ.get("OPENAI_BASE_URL"),
+        "connect_timeout": float(os.environ.get("LLM_CONNECT_TIMEOUT_SECONDS", 10)),
+        "read_timeout": float(os.environ.get("LLM_READ_TIMEOUT_SECONDS", 120)),
+        "max_connections": int(os.environ.get("LLM_MAX_CONNECTIONS", 20)),
+        "max_keepalive_connections": int(os.environ.get("LLM_MAX_KEEPALIVE_CONNECTIONS", 10)),
+        "keepalive_expiry": float(os.environ.get("LLM_KEEPALIVE_EXPIRY_SECONDS", 120)),
+        "max_retries": int(os.environ.get("LLM_MAX_RETRIES", 2)),
+    }
+
+
+class MetricsRecorder:
+    """
+    Collects one structured record per LLM call.
+
+    The most recent records are kept in memory for the admin panel, each record is
+    logged as a JSON line on the "weibullfit.llm" logger, and any registered sinks
+    (e.g. a metrics backend exporter) receive it as a dict.
+    """
+
+    def __init__(self, max_records=1000):
+        self._records = deque(maxlen=max_records)
+        self._sinks = []
+        self._lock = threading.Lock()
+
+    def add_sink(self, sink):
+        """Register a callable that receives every call record."""
+        with self._lock:
+            self._sinks.append(sink)
+
+    def remove_sink(self, sink):
+        with self._lock:
+            self._sinks.remove(sink)
+
+    def record(self, call):
+        with self._lock:
+            self._records.append(call)
+            sinks = list(self._sinks)
+        logger.info(json.dumps(call, default=str))
+        for sink in sinks:
+            try:
+                sink(call)
+            except Exception:
+                logger.exception("LLM metrics sink failed")
+
+    def records(self):
+        """Return the retained call records, oldest first."""
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+# Process-wide recorder shared by every session
+llm_metrics = MetricsRecorder()
+
+# The call being made in the current thread or task, updated by the HTTP hooks
+_current_call = contextvars.ContextVar("llm_current_call", default=None)
+
+
+def _on_request(request):
+    call = _current_call.get()
+    if call is not None:
+        call["attempts"] += 1
+
+
+def _on_response(response):
+    call = _current_call.get()
+    if call is not None:
+        # Response headers have arrived; the body (or stream) follows
+        call["ttfb_seconds"] = time.perf_counter() - call["_started"]
+
+
+async def _on_request_async(request):
+    _on_request(request)
+
+
+async def _on_response_async(response):
+    _on_response(response)
+
+
+@contextmanager
+def active_call(call):
+    """Attribute HTTP requests made inside the block (attempts, time to first byte) to `call`."""
+    token = _current_call.set(call)
+    try:
+        yield call
+    finally:
+        _current_call.reset(token)
+
+
+@contextmanager
+def track_call(operation, model=None, semaphore=None, bind_context=True):
+    """
+    Record metrics for one LLM call made inside the block.
+
+    Queue time is the wait for a slot on `semaphore` (the pooled client's concurrency
+    limit). Time to first byte and SDK retries are captured by the HTTP client hooks.
+    The caller fills in token usage on the yielded record when the response has it.
+
+    Generators that yield inside the block pass bind_context=False and wrap only the
+    request itself in active_call(), so the call is not left set in the consumer's
+    context between yields. A generator closed before finishing records the call
+    as "cancelled".
+
+    Yields:
+        dict: The call record, emitted to llm_metrics when the block exits
+    """
+    call = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "operation": operation,
+        "model": model,
+        "queue_seconds": 0.0,
+        "ttfb_seconds": None,
+        "total_seconds": None,
+        "prompt_tokens": None,
+        "completion_tokens": None,
+        "retries": 0,
+        "attempts": 0,
+        "status": "ok",
+        "error": None,
+    }
+    queued = time.perf_counter()
+    if semaphore is not None:
+        semaphore.acquire()
+    call["_started"] = time.perf_counter()
+    call["queue_seconds"] = call["_started"] - queued
+    try:
+        with active_call(call) if bind_context else nullcontext():
+            yield call
+    except GeneratorExit:
+        call["status"] = "cancelled"
+        raise
+    except BaseException as e:
+        call["status"] = "error"
+        call["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        if semaphore is not None:
+            semaphore.release()
+        call["total_seconds"] = time.perf_counter() - call.pop("_started")
+        call["retries"] += max(call.pop("attempts") - 1, 0)
+        llm_metrics.record(call)
+
+
+def record_usage(call, usage):
+    """Copy token counts from a completion's usage block onto a call record."""
+    if usage is not None:
+        call["prompt_tokens"] = usage.prompt_tokens
+        call["completion_tokens"] = usage.completion_tokens
+
+
+class LLMClientPool:
+    """
+    Process-wide, lazily built OpenAI client with a shared HTTP connection pool.
+
+    Every session reuses the same client, so connections (and TLS sessions) are kept
+    alive between calls. Calls beyond `max_connections` queue on a semaphore, which is
+    what the per-call queue time measures. A custom `client_factory` can replace the
+    OpenAI client entirely, e.g. for a non-OpenAI backend with a compatible API.
+    """
+
+    def __init__(self, config=None, client_factory=None):
+        self._config = config
+        self._client_factory = client_factory
+        self._client = None
+        self._semaphore = None
+        self._lock = threading.Lock()
+
+    @property
+    def config(self):
+        if self._config is None:
+            self._config = load_client_config()
+        return self._config
+
+    def configure(self, config=None, client_factory=None):
+        """Replace the settings or backend; the next call builds a fresh client."""
+        with self._lock:
+            old_client = self._client
+            self._config = config
+            self._client_factory = client_factory
+            self._client = None
+            self._semaphore = None
+        if old_client is not None:
+            old_client.close()
+
+    def _client_kwargs(self, config):
+        if not config["api_key"]:
+            raise ValueError("OPENAI_API_KEY environment variable is not set")
+        return {
+            "api_key": config["api_key"],
+            "base_url": config["base_url"],
+            "timeout": openai.Timeout(config["read_timeout"], connect=config["connect_timeout"]),
+            "max_retries": config["max_retries"],
+        }
+
+    def _limits(self, config):
+        return Limits(
+            max_connections=config["max_connections"],
+            max_keepalive_connections=config["max_keepalive_connections"],
+            keepalive_expiry=config["keepalive_expiry"],
+        )
+
+    def get_client(self):
+        """Return the shared synchronous client, building it on first use."""
+        with self._lock:
+            if self._client is None:
+                config = self.config
+                if self._client_factory is not None:
+                    self._client = self._client_factory(config)
+                else:
+                    self._client = OpenAI(
+                        **self._client_kwargs(config),
+                        http_client=openai.DefaultHttpxClient(
+                            limits=self._limits(config),
+                            event_hooks={"request": [_on_request], "response": [_on_response]},
+                        ),
+                    )
+                self._semaphore = threading.BoundedSemaphore(config["max_connections"])
+            return self._client
+
+    @property
+    def semaphore(self):
+        self.get_client()
+        return self._semaphore
+
+    def new_async_client(self, max_retries=None):
+        """
+        Build an async client with the same settings and telemetry hooks.
+
+        Async clients are bound to the event loop they are used on, so each batch run
+        creates its own and closes it when done.
+        """
+        config = self.config
+        kwargs = self._client_kwargs(config)
+        if max_retries is not None:
+            kwargs["max_retries"] = max_retries
+        return AsyncOpenAI(
+            **kwargs,
+            http_client=openai.DefaultAsyncHttpxClient(
+                limits=self._limits(config),
+                event_hooks={"request": [_on_request_async], "response": [_on_response_async]},
+            ),
+        )
+
+
+# Process-wide pool shared across reruns and sessions
+llm_client_pool = LLMClientPool()
@@ -1,32 +1,122 @@
-import os
 import json
-from openai import OpenAI
+import time
+from contextlib import nullcontext
+from utils.fmea_cache import fmea_cache, fmea_cache_key, normalize_characteristics
+from utils.fmea_library import fmea_library, DEFAULT_MIN_SIMILARITY
+from utils.fmea_stream import FailureModeStreamParser
+from utils.llm_client import llm_client_pool, track_call, active_call, record_usage
 
 # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
 # do not change this unless explicitly requested by the user
 MODEL_NAME = "gpt-4o"
 
+# Bump whenever the prompts below change so cached FMEAs from older prompts are not reused
+PROMPT_VERSION = "1"
+
+# Completion settings shared by every FMEA request
+COMPLETION_OPTIONS = {
+    "response_format": {"type": "json_object"},
+    "temperature": 0.5,  # Lower temperature for more consistent results
+    "max_tokens": 4000  # Ensure we get complete responses
+}
+
 def get_openai_client():
-    """Initialize and return the OpenAI client."""
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY environment variable is not set")
+    """Return the process-wide pooled OpenAI client."""
+    return llm_client_pool.get_client()
+
+def get_async_openai_client(max_retries=0):
+    """
+    Return a new async client sharing the pooled client's settings and telemetry.
+    
+    Retries are left to the caller by default so rate limits can be backed off across
+    a whole batch.
+    """
+    return llm_client_pool.new_async_client(max_retries=max_retries)
+
+def find_stored_fmea(asset_type, characteristics, use_cache=True, use_library=True,
+                     min_similarity=DEFAULT_MIN_SIMILARITY):
+    """
+    Look up an FMEA for a configuration without calling the API.
+    
+    The persistent cache is checked for this exact request first, then the local FMEA
+    library for the nearest stored configuration of the same asset type.
+    
+    Returns:
+        tuple: (fmea_data, info) where info has "hit", "source" ("cache" or "library"),
+               "lookup_seconds" and "seconds_saved", plus "similarity" and
+               "matched_characteristics" for library matches; None when neither has one
+    """
+    characteristics = normalize_characteristics(characteristics)
+    if use_cache:
+        key = fmea_cache_key(MODEL_NAME, PROMPT_VERSION, asset_type, characteristics)
+        cached = fmea_cache.lookup(key)
+        if cached is not None:
+            fmea_data, info = cached
+            return fmea_data, {**info, "source": "cache"}
     
-    return OpenAI(api_key=api_key)
+    if use_library:
+        match = fmea_library.lookup(asset_type, characteristics, min_similarity=min_similarity,
+                                    model=MODEL_NAME, prompt_version=PROMPT_VERSION)
+        if match is not None:
+            fmea_data, details = match
+            return fmea_data, {
+                "hit": True,
+                "source": "library",
+                "lookup_seconds": details["lookup_seconds"],
+                "seconds_saved": 0.0,
+                "similarity": details["similarity"],
+                "matched_characteristics": details["characteristics"],
+            }
+    
+    return None
 
-def generate_fmea_with_gpt(asset_type, characteristics):
+def generate_fmea_with_gpt(asset_type, characteristics, use_cache=True, return_cache_info=False,
+                           use_library=True, min_similarity=DEFAULT_MIN_SIMILARITY):
     """
     Generate FMEA data using GPT for a given asset type and its characteristics.
     
+    Identical requests (same model, prompt version, asset type and characteristics) are
+    served from the persistent FMEA cache instead of calling the API again. Otherwise the
+    nearest configuration in the local FMEA library is used when it is similar enough,
+    and the API is only called when neither has a match. Generated FMEAs are added to
+    the library.
+    
     Args:
         asset_type (str): The type of electrical T&D asset
         characteristics (dict): Operating characteristics of the asset
+        use_cache (bool): Look up and store the result in the FMEA cache
+        return_cache_info (bool): Also return the cache lookup details
+        use_library (bool): Look up and store the result in the FMEA library
+        min_similarity (float): Lowest library similarity (0-1) accepted as a match
     
     Returns:
-        dict: Structured FMEA data with failure modes and Weibull parameters
+        dict: Structured FMEA data with failure modes and Weibull parameters, or
+              (dict, cache info) when return_cache_info is set
     """
-    client = get_openai_client()
+    characteristics = normalize_characteristics(characteristics)
+
+    def create():
+        fmea_data = request_fmea(asset_type, characteristics)
+        if use_library:
+            fmea_library.add(asset_type, characteristics, fmea_data, model=MODEL_NAME,
+                             prompt_version=PROMPT_VERSION)
+        return fmea_data
+    
+    stored = find_stored_fmea(asset_type, characteristics, use_cache, use_library, min_similarity)
+    if stored is not None:
+        fmea_data, cache_info = stored
+    elif use_cache:
+        key = fmea_cache_key(MODEL_NAME, PROMPT_VERSION, asset_type, characteristics)
+        fmea_data, cache_info = fmea_cache.get_or_create(key, create)
+        cache_info["source"] = "cache" if cache_info["hit"] else "generated"
+    else:
+        fmea_data = create()
+        cache_info = {"hit": False, "source": "generated", "lookup_seconds": 0.0, "seconds_saved": 0.0}
     
+    return (fmea_data, cache_info) if return_cache_info else fmea_data
+
+def build_fmea_messages(asset_type, characteristics):
+    """Build the chat messages requesting an FMEA for an asset configuration."""
     # Format characteristics for prompt
     characteristics_str = "\n".join([f"- {key}: {value}" for key, value in characteristics.items()])
     
@@ -82,34 +172,121 @@ def generate_fmea_with_gpt(asset_type, characteristics):
     with appropriate severity, occurrence, detection ratings, and Weibull parameters.
     """
     
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+def parse_fmea_content(content):
+    """Parse and validate the JSON content of an FMEA completion."""
+    fmea_data = json.loads(content)
+    
+    # Validate the structure of the returned data
+    if "failure_modes" not in fmea_data:
+        raise ValueError("OpenAI response missing 'failure_modes' field")
+    
+    # Ensure all failure modes have the required fields
+    for mode in fmea_data["failure_modes"]:
+        # Calculate RPN if not already calculated
+        if "rpn" not in mode and all(k in mode for k in ["severity", "occurrence", "detection"]):
+            mode["rpn"] = mode["severity"] * mode["occurrence"] * mode["detection"]
+    
+    return fmea_data
+
+def request_fmea(asset_type, characteristics):
+    """Request an FMEA from the API, bypassing the cache."""
+    client = get_openai_client()
+    
     try:
         # Make API call to OpenAI
-        response = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.5,  # Lower temperature for more consistent results
-            max_tokens=4000  # Ensure we get complete responses
-        )
+        with track_call("fmea", MODEL_NAME, llm_client_pool.semaphore) as call:
+            response = client.chat.completions.create(
+                model=MODEL_NAME,
+                messages=build_fmea_messages(asset_type, characteristics),
+                **COMPLETION_OPTIONS
+            )
+            record_usage(call, response.usage)
         
         # Parse and return the response
-        content = response.choices[0].message.content
-        fmea_data = json.loads(content)
-        
-        # Validate the structure of the returned data
-        if "failure_modes" not in fmea_data:
-            raise ValueError("OpenAI response missing 'failure_modes' field")
-        
-        # Ensure all failure modes have the required fields
-        for mode in fmea_data["failure_modes"]:
-            # Calculate RPN if not already calculated
-            if "rpn" not in mode and all(k in mode for k in ["severity", "occurrence", "detection"]):
-                mode["rpn"] = mode["severity"] * mode["occurrence"] * mode["detection"]
-        
-        return fmea_data
+        return parse_fmea_content(response.choices[0].message.content)
     
     except Exception as e:
         raise Exception(f"Error in OpenAI FMEA generation: {str(e)}")
+
+def stream_completion_text(asset_type, characteristics):
+    """
+    Yield the text deltas of a streamed FMEA completion from the API.
+    
+    The pool slot is held until the stream ends or the generator is closed, since the
+    connection stays busy until then; closing the generator closes the response.
+    """
+    client = get_openai_client()
+    with track_call("fmea_stream", MODEL_NAME, llm_client_pool.semaphore, bind_context=False) as call:
+        with active_call(call):
+            response = client.chat.completions.create(
+                model=MODEL_NAME,
+                messages=build_fmea_messages(asset_type, characteristics),
+                stream=True,
+                stream_options={"include_usage": True},
+                **COMPLETION_OPTIONS
+            )
+        with response:
+            for chunk in response:
+                # The final chunk carries token usage and no choices
+                record_usage(call, getattr(chunk, "usage", None))
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+def stream_fmea_with_gpt(asset_type, characteristics, use_cache=True, text_stream=None,
+                         use_library=True, min_similarity=DEFAULT_MIN_SIMILARITY):
+    """
+    Generate an FMEA, yielding each failure mode as soon as it is complete.
+    
+    A cached FMEA for the same configuration, or the FMEA library's nearest match, is
+    yielded immediately. Otherwise the completion is streamed and parsed incrementally;
+    once it finishes, the full response is validated and stored in the cache and the
+    library like a non-streamed one. Concurrent identical cache misses share one stream
+    through the cache's single-flight lock, held until the stream finishes or is closed.
+    
+    Args:
+        asset_type (str): The type of electrical T&D asset
+        characteristics (dict): Operating characteristics of the asset
+        use_cache (bool): Look up and store the result in the FMEA cache
+        text_stream (iterable): Optional text deltas to parse instead of calling the API,
+            e.g. replay_text_stream() of a recorded completion
+        use_library (bool): Look up and store the result in the FMEA library
+        min_similarity (float): Lowest library similarity (0-1) accepted as a match
+    
+    Yields:
+        dict: One failure mode at a time, with "rpn" filled in when missing
+    """
+    characteristics = normalize_characteristics(characteristics)
+    stored = find_stored_fmea(asset_type, characteristics, use_cache, use_library, min_similarity)
+    if stored is not None:
+        yield from stored[0]["failure_modes"]
+        return
+    
+    # Concurrent identical misses wait for one stream, then read its cached result
+    key = fmea_cache_key(MODEL_NAME, PROMPT_VERSION, asset_type, characteristics) if use_cache else None
+    with fmea_cache.single_flight(key) if use_cache else nullcontext() as cached:
+        if cached is not None:
+            yield from cached[0]["failure_modes"]
+            return
+        
+        start = time.perf_counter()
+        parser = FailureModeStreamParser()
+        try:
+            for delta in text_stream if text_stream is not None else stream_completion_text(asset_type, characteristics):
+                for mode in parser.feed(delta):
+                    if "rpn" not in mode and all(k in mode for k in ["severity", "occurrence", "detection"]):
+                        mode["rpn"] = mode["severity"] * mode["occurrence"] * mode["detection"]
+                    yield mode
+            fmea_data = parse_fmea_content(parser.full_text())
+        except Exception as e:
+            raise Exception(f"Error in OpenAI FMEA generation: {str(e)}")
+        
+        if use_cache:
+            fmea_cache.put(key, fmea_data, time.perf_counter() - start)
+        if use_library:
+            fmea_library.add(asset_type, characteristics, fmea_data, model=MODEL_NAME,
+                             prompt_version=PROMPT_VERSION)
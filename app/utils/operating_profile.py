@@ -0,0 +1,100 @@
+import numpy as np
+
+# Boltzmann constant in eV/K
+BOLTZMANN_EV = 8.617333262e-5
+
+
+def arrhenius_factor(temperature_c, reference_temperature_c, activation_energy_ev=0.7):
+    """
+    Arrhenius acceleration factor of operating at a temperature relative to a reference.
+
+    Args:
+        temperature_c (array): Operating temperature(s) in °C
+        reference_temperature_c (float): Temperature at which the Weibull eta applies, in °C
+        activation_energy_ev (float): Activation energy of the failure mechanism in eV
+
+    Returns:
+        np.ndarray: Acceleration factor (> 1 means faster aging than the reference)
+    """
+    temperature_k = np.asarray(temperature_c, dtype=float) + 273.15
+    reference_k = float(reference_temperature_c) + 273.15
+    return np.exp(activation_energy_ev / BOLTZMANN_EV * (1 / reference_k - 1 / temperature_k))
+
+
+def inverse_power_law_factor(stress, reference_stress, exponent):
+    """
+    Inverse power law acceleration factor, e.g. for load or voltage stress.
+
+    Returns:
+        np.ndarray: (stress / reference_stress) ** exponent
+    """
+    return (np.asarray(stress, dtype=float) / reference_stress) ** exponent
+
+
+def cumulative_exposure(segment_durations, acceleration_factors, time_points, cyclic=True):
+    """
+    Effective (reference-stress) age accumulated under piecewise-constant stress.
+
+    The schedule is a sequence of segments sharing the same durations for every
+    profile, e.g. 12 months of a year. Each profile has its own acceleration factor
+    per segment. Damage is accumulated segment by segment (cumulative exposure model),
+    evaluated for all profiles and time points in one vectorized pass.
+
+    Args:
+        segment_durations (array): Segment lengths, shape (n_segments,)
+        acceleration_factors (array): Factors, shape (n_profiles, n_segments) or (n_segments,)
+        time_points (array): Calendar times at which to evaluate, shape (n_times,)
+        cyclic (bool): Repeat the schedule indefinitely (seasonal profiles). Otherwise
+            the last segment's factor applies after the schedule ends.
+
+    Returns:
+        np.ndarray: Effective age, shape (n_profiles, n_times) or (n_times,)
+    """
+    durations = np.asarray(segment_durations, dtype=float)
+    factors = np.asarray(acceleration_factors, dtype=float)
+    single_profile = factors.ndim == 1
+    factors = np.atleast_2d(factors)
+    t = np.asarray(time_points, dtype=float)
+
+    boundaries = np.concatenate(([0.0], np.cumsum(durations)))
+    cycle_length = boundaries[-1]
+    # Damage accumulated at each segment boundary, per profile
+    damage_at_boundary = np.zeros((factors.shape[0], len(boundaries)))
+    damage_at_boundary[:, 1:] = np.cumsum(factors * durations, axis=1)
+
+    if cyclic:
+        full_cycles, t_in_cycle = np.divmod(t, cycle_length)
+    else:
+        full_cycles, t_in_cycle = np.zeros_like(t), np.minimum(t, cycle_length)
+
+    # Segment boundaries are shared, so one searchsorted serves every profile
+    segment = np.clip(np.searchsorted(boundaries, t_in_cycle, side='right') - 1, 0, len(durations) - 1)
+    effective_age = (full_cycles[None, :] * damage_at_boundary[:, -1:]
+                     + damage_at_boundary[:, segment]
+                     + factors[:, segment] * (t_in_cycle - boundaries[segment])[None, :])
+
+    if not cyclic:
+        effective_age += factors[:, -1:] * np.maximum(t - cycle_length, 0.0)[None, :]
+
+    return effective_age[0] if single_profile else effective_age
+
+
+def profile_reliability(beta, eta, segment_durations, acceleration_factors, time_points, cyclic=True):
+    """
+    Weibull reliability under a time-varying operating profile.
+
+    R(t) = exp(-(tau(t) / eta) ** beta), where tau is the effective age from
+    cumulative_exposure and eta is the characteristic life at reference stress.
+    beta and eta broadcast against the profile axis, so different asset classes can
+    be evaluated in the same call.
+
+    Returns:
+        np.ndarray: Reliability, shape (n_profiles, n_times) or (n_times,)
+    """
+    effective_age = cumulative_exposure(segment_durations, acceleration_factors, time_points, cyclic=cyclic)
+    beta = np.asarray(beta, dtype=float)
+    eta = np.asarray(eta, dtype=float)
+    if effective_age.ndim == 2:
+        beta = beta.reshape(-1, 1) if beta.ndim else beta
+        eta = eta.reshape(-1, 1) if eta.ndim else eta
+    return np.exp(-(effective_age / eta) ** beta)
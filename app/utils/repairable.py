@@ -0,0 +1,105 @@
+import numpy as np
+from scipy.optimize import brentq
+
+
+def fit_power_law_nhpp(asset_codes, event_times, end_times):
+    """
+    Crow-AMSAA (power-law NHPP) fits for repairable assets, per asset and for the fleet.
+
+    Each asset is observed from age 0 to its end time T_i (time-truncated) and its
+    failure intensity is lambda * beta * t**(beta - 1). Per-asset MLEs are closed form,
+    beta_i = n_i / sum_j ln(T_i / t_ij) and lambda_i = n_i / T_i**beta_i, computed for
+    every asset at once with bincount. The pooled fleet beta solves the score equation
+    N / beta + sum ln t - N * sum T_i**beta ln T_i / sum T_i**beta = 0, which is
+    monotone in beta, so a bracketed root search over per-asset arrays suffices.
+
+    Args:
+        asset_codes (array): Integer asset index of each failure event (0 .. n_assets - 1)
+        event_times (array): Age of the asset at each failure event, 0 < t <= T
+        end_times (array): Observation end age of every asset, including assets
+            without failures
+
+    Returns:
+        dict: Per-asset arrays "n_events", "beta", "beta_unbiased" and "lambda" (nan
+              where an asset has too few events), and "fleet" with the pooled
+              "beta", "lambda", "n_events" and "n_assets"
+    """
+    codes = np.asarray(asset_codes, dtype=np.int64)
+    t = np.asarray(event_times, dtype=float)
+    end = np.asarray(end_times, dtype=float)
+    n_assets = len(end)
+
+    log_t = np.log(t)
+    log_end = np.log(end)
+    n_events = np.bincount(codes, minlength=n_assets)
+    # sum_j ln(T_i / t_ij) = n_i ln T_i - sum_j ln t_ij
+    log_ratio_sum = n_events * log_end - np.bincount(codes, weights=log_t, minlength=n_assets)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        beta = np.where((n_events > 0) & (log_ratio_sum > 0), n_events / log_ratio_sum, np.nan)
+        scale_factor = np.exp(-beta * log_end)
+        lam = n_events * scale_factor
+        # Bias correction for time-truncated data; undefined for a single event
+        beta_unbiased = np.where(n_events > 1, beta * (n_events - 1) / n_events, np.nan)
+
+    total_events = int(n_events.sum())
+    fleet_beta, fleet_lambda = np.nan, np.nan
+    if total_events > 0:
+        total_log_t = log_t.sum()
+        max_log_end = log_end.max()
+
+        def score(b):
+            # Weighted mean of ln T_i with weights T_i**b, shifted for stability
+            weights = np.exp(b * (log_end - max_log_end))
+            return total_events / b + total_log_t - total_events * np.dot(weights, log_end) / weights.sum()
+
+        lower, upper = 1e-3, 10.0
+        while score(upper) > 0 and upper < 1e3:
+            upper *= 10
+        if score(lower) > 0 > score(upper):
+            fleet_beta = brentq(score, lower, upper, xtol=1e-10)
+            fleet_lambda = float(total_events / np.exp(fleet_beta * log_end).sum())
+
+    return {
+        "n_events": n_events,
+        "beta": beta,
+        "beta_unbiased": beta_unbiased,
+        "lambda": lam,
+        "fleet": {
+            "beta": fleet_beta,
+            "lambda": fleet_lambda,
+            "n_events": total_events,
+            "n_assets": n_assets,
+        },
+    }
+
+
+def mean_cumulative_function(event_times, end_times):
+    """
+    Nonparametric mean cumulative number of failures per asset (MCF).
+
+    Each event adds 1 / r(t), where r(t) is the number of assets still under
+    observation at that age, so assets with short histories are not undercounted.
+
+    Returns:
+        tuple: (sorted event ages, MCF at each event age)
+    """
+    t = np.sort(np.asarray(event_times, dtype=float))
+    end = np.sort(np.asarray(end_times, dtype=float))
+    at_risk = len(end) - np.searchsorted(end, t, side='left')
+    return t, np.cumsum(1.0 / np.maximum(at_risk, 1))
+
+
+def decimate_curve(x, y, max_points=2000):
+    """
+    Reduce a monotone cumulative curve to at most max_points for plotting.
+
+    Points are kept at evenly spaced ranks, always including the first and last, so a
+    step curve with n steps is drawn to within n / max_points steps.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) <= max_points:
+        return x, y
+    keep = np.unique(np.linspace(0, len(x) - 1, max_points).round().astype(np.int64))
+    return x[keep], y[keep]
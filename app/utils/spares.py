@@ -0,0 +1,103 @@
+import numpy as np
+
+
+def poisson_binomial_pmf(probabilities, tail_sd=12.0):
+    """
+    Distribution of the number of successes among independent, non-identical trials.
+
+    The generating polynomials (1 - p_i + p_i z) are multiplied pairwise in a balanced
+    tree, each level as one batched FFT convolution over all pairs, so the cost is
+    O(n log^2 n) with no Python loop over trials. Polynomials are truncated at
+    mean + tail_sd standard deviations, beyond which the mass is negligible.
+
+    Args:
+        probabilities (array): Success probability of each trial
+        tail_sd (float): Support width above the mean, in standard deviations
+
+    Returns:
+        np.ndarray: pmf[k] = P(k successes), for k = 0 .. truncation point
+    """
+    p = np.clip(np.asarray(probabilities, dtype=float).ravel(), 0.0, 1.0)
+    support = int(min(len(p), np.ceil(p.sum() + tail_sd * np.sqrt(np.sum(p * (1 - p))) + 20)))
+
+    # Pad with impossible trials to a power of two so every level pairs up evenly
+    n_leaves = 1 << int(np.ceil(np.log2(max(len(p), 1))))
+    polys = np.zeros((n_leaves, 2))
+    polys[:, 0] = 1.0
+    polys[:len(p), 0] = 1 - p
+    polys[:len(p), 1] = p
+
+    while len(polys) > 1:
+        length = min(2 * polys.shape[1] - 1, support + 1)
+        size = 1 << int(np.ceil(np.log2(2 * polys.shape[1] - 1)))
+        spectra = np.fft.rfft(polys, size, axis=1)
+        polys = np.fft.irfft(spectra[0::2] * spectra[1::2], size, axis=1)[:, :length]
+
+    pmf = np.clip(polys[0], 0.0, None)
+    return pmf / pmf.sum()
+
+
+def stock_for_fill_rate(pmf, target_fill_rate):
+    """
+    Smallest stock level whose expected fill rate meets the target.
+
+    Fill rate is the expected fraction of demand met from stock, E[min(D, s)] / E[D],
+    computed for every s at once from the cumulative tail probabilities.
+
+    Returns:
+        tuple: (stock level, achieved fill rate, probability of no stock-out P(D <= s))
+    """
+    pmf = np.asarray(pmf, dtype=float)
+    demand = np.arange(len(pmf))
+    mean_demand = np.dot(demand, pmf)
+    if mean_demand <= 0:
+        return 0, 1.0, 1.0
+
+    # E[min(D, s)] = sum_{j < s} P(D > j)
+    tail = 1 - np.cumsum(pmf)
+    met = np.concatenate(([0.0], np.cumsum(tail)))[:len(pmf)]
+    fill_rate = met / mean_demand
+    stock = int(np.searchsorted(fill_rate, target_fill_rate - 1e-12))
+    stock = min(stock, len(pmf) - 1)
+    return stock, float(fill_rate[stock]), float(np.cumsum(pmf)[stock])
+
+
+def spares_demand_forecast(beta, eta, ages, n_periods=5, period=1.0, target_fill_rate=0.95):
+    """
+    Per-period spare demand distributions and stock levels for one asset class.
+
+    Demand in period k counts the installed assets whose first failure from now falls
+    in that period, P = (R(a + (k-1)h) - R(a + kh)) / R(a) for an asset of age a, so
+    each period's demand is Poisson-binomial over the fleet. Failures of the
+    replacement units themselves are not counted.
+
+    Args:
+        beta (float): Shape parameter
+        eta (float): Scale parameter
+        ages (array): Current ages of the installed assets
+        n_periods (int): Number of future periods
+        period (float): Period length, in the same units as eta
+        target_fill_rate (float): Required fraction of demand met from stock
+
+    Returns:
+        list: One dict per period with the demand pmf, mean demand, and the stock level,
+              fill rate and no-stock-out probability meeting the target
+    """
+    ages = np.asarray(ages, dtype=float)
+    hazard_now = (ages / eta) ** beta
+    forecast = []
+    previous_survival = np.ones_like(ages)
+    for k in range(n_periods):
+        survival = np.exp(hazard_now - ((ages + (k + 1) * period) / eta) ** beta)
+        pmf = poisson_binomial_pmf(previous_survival - survival)
+        stock, fill_rate, no_stockout = stock_for_fill_rate(pmf, target_fill_rate)
+        forecast.append({
+            "period": k + 1,
+            "pmf": pmf,
+            "mean_demand": float(np.dot(np.arange(len(pmf)), pmf)),
+            "stock_level": stock,
+            "fill_rate": fill_rate,
+            "no_stockout_probability": no_stockout,
+        })
+        previous_survival = survival
+    return forecast
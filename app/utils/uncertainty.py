@@ -0,0 +1,80 @@
+import numpy as np
+
+from utils.weibull_functions import fit_weibull_quantile_line
+
+
+def sample_expert_points(min_ages, likely_ages, max_ages, n_samples=20000, seed=None):
+    """
+    Sample expert scenarios from triangular (min, most likely, max) age ranges.
+
+    Each scenario draws one age per elicited percentile. Ages within a scenario are
+    sorted so every sampled set describes a non-decreasing CDF.
+
+    Args:
+        min_ages (array): Minimum ages, one per percentile
+        likely_ages (array): Most likely ages, one per percentile
+        max_ages (array): Maximum ages, one per percentile
+        n_samples (int): Number of scenarios to draw
+        seed (int): Optional random seed for reproducible bands
+
+    Returns:
+        np.ndarray: Sampled ages, shape (n_samples, n_percentiles)
+    """
+    lo = np.asarray(min_ages, dtype=float)
+    mode = np.asarray(likely_ages, dtype=float)
+    hi = np.asarray(max_ages, dtype=float)
+
+    # Inverse-CDF sampling of the triangular distribution, one column per percentile
+    u = np.random.default_rng(seed).random((n_samples, lo.size))
+    width = hi - lo
+    with np.errstate(divide='ignore', invalid='ignore'):
+        split = np.where(width > 0, (mode - lo) / width, 0.5)
+    left = lo + np.sqrt(u * width * (mode - lo))
+    right = hi - np.sqrt((1 - u) * width * (hi - mode))
+    ages = np.where(u < split, left, right)
+
+    ages.sort(axis=1)
+    return ages
+
+
+def fit_expert_scenarios(sampled_ages, fractions):
+    """
+    Fit every sampled scenario with the batched closed-form quantile-line solver.
+
+    Scenarios whose ages collapse to a single value cannot be fitted and are dropped.
+
+    Returns:
+        tuple: (shapes, scales) arrays of the valid fits
+    """
+    shapes, scales = fit_weibull_quantile_line(sampled_ages, fractions)
+    valid = np.isfinite(shapes) & np.isfinite(scales) & (shapes > 0)
+    return shapes[valid], scales[valid]
+
+
+def weibull_curve_bands(shapes, scales, x, curve_type='cdf', percentiles=(5, 50, 95)):
+    """
+    Evaluate all fitted curves on a shared grid and return pointwise percentile bands.
+
+    Args:
+        shapes (array): Shape parameters, one per scenario
+        scales (array): Scale parameters, one per scenario
+        x (array): Shared time grid
+        curve_type (str): 'pdf', 'cdf' or 'hazard'
+        percentiles (tuple): Percentiles to report at each grid point
+
+    Returns:
+        np.ndarray: Band values, shape (len(percentiles), len(x))
+    """
+    k = np.asarray(shapes, dtype=float)[:, None]
+    z = np.asarray(x, dtype=float)[None, :] / np.asarray(scales, dtype=float)[:, None]
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        if curve_type == 'cdf':
+            values = -np.expm1(-z**k)
+        else:
+            values = z**(k - 1)
+            values *= k / np.asarray(scales, dtype=float)[:, None]
+            if curve_type == 'pdf':
+                values *= np.exp(-z**k)
+
+    return np.percentile(values, percentiles, axis=0)
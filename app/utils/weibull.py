@@ -1,5 +1,6 @@
 import numpy as np
 from scipy import stats
+from scipy.special import gamma
 
 def generate_weibull_data(beta, eta, num_points=1000, max_time_multiplier=3.0):
     """
@@ -40,25 +41,114 @@ def generate_weibull_data(beta, eta, num_points=1000, max_time_multiplier=3.0):
         "mttf": mttf
     }
 
-def calculate_system_reliability(component_reliabilities, system_type="series"):
+# Above this many recursion states, k-out-of-n blocks use the FFT product instead
+KOFN_RECURSION_MAX_STATES = 64
+
+def _survivor_count_distribution(r):
+    """
+    P(exactly j survivors), j = 0..n, for independent components with reliabilities r.
+
+    The generating polynomial prod_i (1 - r_i + r_i z) is multiplied out pairwise, all
+    trailing axes at once: low-degree products directly, higher ones with FFTs, for
+    O(n log^2 n) work per time point instead of O(n * k).
+
+    Args:
+        r (np.ndarray): Reliabilities, shape (n_components, ...)
+
+    Returns:
+        np.ndarray: Probabilities, shape (n_coefficients, ...) with n_coefficients >= n + 1
+                    and zeros beyond n survivors
+    """
+    # Coefficients along the last axis, so each product works on contiguous memory
+    polys = np.empty(r.shape + (2,))
+    polys[..., 0] = 1 - r
+    polys[..., 1] = r
+    while polys.shape[0] > 1:
+        if polys.shape[0] % 2:
+            # Pair the odd one out with the constant polynomial 1
+            identity = np.zeros((1,) + polys.shape[1:])
+            identity[..., 0] = 1.0
+            polys = np.concatenate([polys, identity])
+        a, b = polys[0::2], polys[1::2]
+        length = polys.shape[-1]
+        out_length = 2 * length - 1
+        if length <= 16:
+            polys = np.zeros(a.shape[:-1] + (out_length,))
+            for i in range(length):
+                polys[..., i:i + length] += a[..., i:i + 1] * b
+        else:
+            n_fft = 1 << (out_length - 1).bit_length()
+            spectra = np.fft.rfft(a, n=n_fft) * np.fft.rfft(b, n=n_fft)
+            polys = np.fft.irfft(spectra, n=n_fft)[..., :out_length]
+    return np.moveaxis(polys[0], -1, 0)
+
+def k_out_of_n_reliability(component_reliabilities, k):
+    """
+    Probability that at least k of n independent components survive.
+
+    Uses the Poisson-binomial recursion over components, vectorized over any trailing
+    axes (e.g. a time grid), so non-identical components are handled exactly. The cost
+    is O(n * min(k, n - k + 1)) array operations; beyond KOFN_RECURSION_MAX_STATES
+    states the survivor-count distribution is built by FFT polynomial products
+    instead (exact up to floating-point rounding, about 1e-13 absolute), which keeps a
+    10,000-component block on a 50-point grid to about 0.4 s for any k.
+
+    Args:
+        component_reliabilities (array): Reliabilities, shape (n_components, ...)
+        k (int): Minimum number of surviving components required
+
+    Returns:
+        np.ndarray: System reliability with the trailing shape of the input
+    """
+    r = np.asarray(component_reliabilities, dtype=float)
+    n = r.shape[0]
+    if not 0 <= k <= n:
+        raise ValueError(f"k must be between 0 and {n}")
+    if k == 0:
+        return np.ones(r.shape[1:])
+    if min(k, n - k + 1) > KOFN_RECURSION_MAX_STATES:
+        return np.clip(_survivor_count_distribution(r)[k:].sum(axis=0), 0.0, 1.0)
+    if k > n - k + 1:
+        # Cheaper to count failures: at least k survive <=> fewer than n - k + 1 fail
+        return 1 - k_out_of_n_reliability(1 - r, n - k + 1)
+
+    # prob[j] = P(exactly j survivors) for j < k, prob[k] = P(at least k survivors)
+    prob = np.zeros((k + 1,) + r.shape[1:])
+    prob[0] = 1.0
+    for i in range(n):
+        ri = r[i]
+        prob[k] = prob[k] + prob[k - 1] * ri
+        prob[1:k] = prob[1:k] * (1 - ri) + prob[:k - 1] * ri
+        prob[0] = prob[0] * (1 - ri)
+    return prob[k]
+
+def calculate_system_reliability(component_reliabilities, system_type="series", k=None):
     """
     Calculate system reliability based on component reliabilities.
     
     Args:
-        component_reliabilities (list): List of component reliability values
-        system_type (str): 'series' or 'parallel'
+        component_reliabilities (list): List of component reliability values, or an
+            array of shape (n_components, n_times) to evaluate a whole time grid at once
+        system_type (str): 'series', 'parallel' or 'k_out_of_n'
+        k (int): Minimum number of working components for 'k_out_of_n'
     
     Returns:
-        float: System reliability
+        float or np.ndarray: System reliability
     """
+    component_reliabilities = np.asarray(component_reliabilities, dtype=float)
+
     if system_type == "series":
         # In a series system, all components must work for the system to work
-        system_reliability = np.prod(component_reliabilities)
+        system_reliability = np.prod(component_reliabilities, axis=0)
     elif system_type == "parallel":
         # In a parallel system, at least one component must work
-        system_reliability = 1 - np.prod([1 - r for r in component_reliabilities])
+        system_reliability = 1 - np.prod(1 - component_reliabilities, axis=0)
+    elif system_type == "k_out_of_n":
+        if k is None:
+            raise ValueError("k must be provided for a 'k_out_of_n' system")
+        system_reliability = k_out_of_n_reliability(component_reliabilities, k)
     else:
-        raise ValueError("System type must be 'series' or 'parallel'")
+        raise ValueError("System type must be 'series', 'parallel' or 'k_out_of_n'")
     
     return system_reliability
 
@@ -79,3 +169,445 @@ def b_life(beta, eta, percent):
     
     # B-life formula
     return eta * (-np.log(1 - p)) ** (1 / beta)
+
+def evaluate_rbd(block, time_points):
+    """
+    Evaluate a reliability block diagram over a time grid.
+
+    A block is a dict, either a Weibull component
+        {"type": "component", "beta": 2.0, "eta": 40000}
+    or a structure of child blocks
+        {"type": "series" | "parallel", "blocks": [...]}
+        {"type": "k_out_of_n", "k": 2, "blocks": [...]}
+
+    Blocks may be nested to any depth. All Weibull components directly under a
+    structure are evaluated together as one (components x time) array, and a block
+    object referenced from several places in the diagram is evaluated only once.
+    Components are assumed to fail independently.
+
+    Args:
+        block (dict): Root block of the diagram
+        time_points (array): Times at which to evaluate reliability
+
+    Returns:
+        np.ndarray: System reliability at each time point
+    """
+    t = np.asarray(time_points, dtype=float)
+    memo = {}
+
+    def evaluate(node):
+        key = id(node)
+        if key in memo:
+            return memo[key]
+
+        node_type = node.get("type", "component")
+        if node_type == "component":
+            result = np.exp(-(t / node["eta"]) ** node["beta"])
+        else:
+            children = node.get("blocks", [])
+            if not children:
+                raise ValueError(f"'{node_type}' block has no child blocks")
+
+            # Leaf components are broadcast together; nested structures are recursed into
+            leaves = [child for child in children if child.get("type", "component") == "component"]
+            reliabilities = []
+            if leaves:
+                betas = np.array([leaf["beta"] for leaf in leaves], dtype=float)[:, None]
+                etas = np.array([leaf["eta"] for leaf in leaves], dtype=float)[:, None]
+                cumulative_hazard = (t[None, :] / etas) ** betas
+                if node_type == "series":
+                    # Product of survivals is the exponential of the summed cumulative hazards
+                    reliabilities.append(np.exp(-cumulative_hazard.sum(axis=0))[None, :])
+                else:
+                    reliabilities.append(np.exp(-cumulative_hazard))
+            reliabilities.extend(evaluate(child)[None, :] for child in children
+                                 if child.get("type", "component") != "component")
+
+            result = calculate_system_reliability(
+                np.concatenate(reliabilities, axis=0),
+                system_type=node_type,
+                k=node.get("k")
+            )
+
+        memo[key] = result
+        return result
+
+    return evaluate(block)
+
+def _simulate_renewal_chunk(beta, eta, ages, n_replications, horizon, period, seed_sequence):
+    """
+    Simulate renewal processes for one chunk of (replication, asset) lifetimes.
+
+    Returns:
+        np.ndarray: Failure counts, shape (n_replications, n_periods)
+    """
+    rng = np.random.default_rng(seed_sequence)
+    n_periods = int(np.ceil(horizon / period))
+    ages = np.broadcast_to(np.asarray(ages, dtype=float), (n_replications, np.size(ages))).ravel()
+    replication = np.repeat(np.arange(n_replications), ages.size // n_replications)
+    counts = np.zeros(n_replications * n_periods, dtype=np.int64)
+
+    # First failure is conditional on surviving to the current age:
+    # T = eta * ((age / eta) ** beta - ln U) ** (1 / beta) - age
+    u = rng.random(ages.size)
+    clock = eta * ((ages / eta) ** beta - np.log(u)) ** (1 / beta) - ages
+
+    while clock.size:
+        alive = clock < horizon
+        clock = clock[alive]
+        replication = replication[alive]
+        if not clock.size:
+            break
+        period_index = (clock // period).astype(np.int64)
+        counts += np.bincount(replication * n_periods + period_index, minlength=counts.size)
+
+        # Replaced with a new unit; inverse-CDF sample of a fresh lifetime
+        clock = clock + eta * (-np.log(rng.random(clock.size))) ** (1 / beta)
+
+    return counts.reshape(n_replications, n_periods)
+
+def simulate_fleet_failures(fleet, horizon, period=1.0, n_replications=100,
+                            chunk_size=1_000_000, n_workers=1, seed=None):
+    """
+    Monte Carlo forecast of failures, replacements and downtime for a fleet.
+
+    Every asset is run as a renewal process: it fails according to its Weibull
+    distribution, is replaced on failure with a new unit, and the replacement starts
+    a new life. Lifetimes are drawn by vectorized inverse-CDF sampling.
+
+    Work is split into chunks of at most `chunk_size` asset-lifetimes to bound memory.
+    Each chunk gets its own child of one SeedSequence, so results are reproducible for
+    a given seed regardless of `n_workers`.
+
+    Args:
+        fleet (list): One dict per asset class or failure mode, with keys
+            "name", "beta", "eta", "count" and optionally "ages" (current ages,
+            scalar or one per asset, default 0) and "downtime" (per failure)
+        horizon (float): Planning horizon, in the same units as eta
+        period (float): Reporting period length (e.g. 1 year, or 8760 hours)
+        n_replications (int): Number of Monte Carlo replications of the fleet
+        chunk_size (int): Maximum asset-lifetimes simulated per chunk
+        n_workers (int): Number of worker processes (1 runs in-process)
+        seed (int): Seed for reproducible results
+
+    Returns:
+        dict: "period_start", plus "classes" (keyed by name) and "total" entries holding
+              mean and 5th/95th percentile failures, replacements and downtime per period
+    """
+    n_periods = int(np.ceil(horizon / period))
+    jobs = []
+    for class_index, asset_class in enumerate(fleet):
+        count = int(asset_class["count"])
+        ages = np.broadcast_to(np.asarray(asset_class.get("ages", 0.0), dtype=float), (count,))
+        assets_per_chunk = max(1, min(count, chunk_size))
+        reps_per_chunk = max(1, chunk_size // assets_per_chunk)
+        for rep_start in range(0, n_replications, reps_per_chunk):
+            n_reps = min(reps_per_chunk, n_replications - rep_start)
+            for asset_start in range(0, count, assets_per_chunk):
+                jobs.append((class_index, rep_start, n_reps,
+                             ages[asset_start:asset_start + assets_per_chunk]))
+
+    seeds = np.random.SeedSequence(seed).spawn(len(jobs))
+    args = [(fleet[class_index]["beta"], fleet[class_index]["eta"], chunk_ages, n_reps,
+             horizon, period, seeds[i])
+            for i, (class_index, _, n_reps, chunk_ages) in enumerate(jobs)]
+
+    if n_workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            chunk_counts = list(executor.map(_simulate_renewal_chunk, *zip(*args)))
+    else:
+        chunk_counts = [_simulate_renewal_chunk(*job_args) for job_args in args]
+
+    failures = np.zeros((len(fleet), n_replications, n_periods))
+    for (class_index, rep_start, n_reps, _), counts in zip(jobs, chunk_counts):
+        failures[class_index, rep_start:rep_start + n_reps] += counts
+
+    def summarize(class_failures, downtime):
+        return {
+            "failures_mean": class_failures.mean(axis=0),
+            "failures_p05": np.percentile(class_failures, 5, axis=0),
+            "failures_p95": np.percentile(class_failures, 95, axis=0),
+            # Run-to-failure policy: every failure triggers one replacement
+            "replacements_mean": class_failures.mean(axis=0),
+            "downtime_mean": class_failures.mean(axis=0) * downtime,
+        }
+
+    downtimes = np.array([asset_class.get("downtime", 0.0) for asset_class in fleet], dtype=float)
+    total = summarize(failures.sum(axis=0), 0.0)
+    total["downtime_mean"] = (failures.mean(axis=1) * downtimes[:, None]).sum(axis=0)
+
+    return {
+        "period_start": np.arange(n_periods) * period,
+        "classes": {
+            asset_class["name"]: summarize(failures[class_index], downtimes[class_index])
+            for class_index, asset_class in enumerate(fleet)
+        },
+        "total": total,
+    }
+
+def conditional_failure_probability(beta, eta, ages, horizon):
+    """
+    Probability that an asset of a given age fails within the next `horizon`.
+
+    Computes 1 - R(age + horizon) / R(age) through the cumulative hazards, which
+    stays accurate for assets far into the tail of the distribution.
+
+    Args:
+        beta (float): Shape parameter
+        eta (float): Scale parameter
+        ages (array): Current ages of the surviving assets
+        horizon (float): Look-ahead window, in the same units as eta
+
+    Returns:
+        np.ndarray: Conditional failure probability per asset
+    """
+    ages = np.asarray(ages, dtype=float)
+    return -np.expm1((ages / eta) ** beta - ((ages + horizon) / eta) ** beta)
+
+def forecast_expected_failures(beta, eta, ages, n_periods=10, period=1.0, group_codes=None, n_groups=None):
+    """
+    Expected number of failures per period for surviving assets, without replacement.
+
+    Iterates over periods rather than assets, so memory stays at a few vectors of the
+    fleet size. Optional integer group codes aggregate the counts per group.
+
+    Args:
+        beta (float): Shape parameter
+        eta (float): Scale parameter
+        ages (array): Current ages of the surviving assets
+        n_periods (int): Number of future periods to forecast
+        period (float): Period length, in the same units as eta
+        group_codes (array): Optional group index (0..n_groups-1) per asset
+        n_groups (int): Number of groups (defaults to max(group_codes) + 1)
+
+    Returns:
+        np.ndarray: Expected failures, shape (n_periods,) or (n_groups, n_periods)
+    """
+    ages = np.asarray(ages, dtype=float)
+    if group_codes is not None and n_groups is None:
+        n_groups = int(np.max(group_codes)) + 1 if len(group_codes) else 0
+
+    hazard_now = (ages / eta) ** beta
+    previous_survival = np.ones_like(ages)
+    failures = np.zeros((n_periods,) if group_codes is None else (n_groups, n_periods))
+
+    for i in range(n_periods):
+        survival = np.exp(hazard_now - ((ages + (i + 1) * period) / eta) ** beta)
+        failed = previous_survival - survival
+        if group_codes is None:
+            failures[i] = failed.sum()
+        else:
+            failures[:, i] = np.bincount(group_codes, weights=failed, minlength=n_groups)
+        previous_survival = survival
+
+    return failures
+
+def _fft_convolve(a, b, n_out):
+    """Linear convolution along the last axis, truncated to the first n_out terms."""
+    size = 1 << int(np.ceil(np.log2(max(a.shape[-1] + b.shape[-1] - 1, 1))))
+    return np.fft.irfft(np.fft.rfft(a, size) * np.fft.rfft(b, size), size)[..., :n_out]
+
+def _series_inverse(a, n_terms):
+    """First n_terms coefficients of 1 / A(z) (last axis) by Newton iteration with FFT products."""
+    inverse = 1.0 / a[..., :1]
+    terms = 1
+    while terms < n_terms:
+        terms = min(2 * terms, n_terms)
+        correction = -_fft_convolve(a[..., :terms], inverse, terms)
+        correction[..., 0] += 2.0
+        inverse = _fft_convolve(inverse, correction, terms)
+    return inverse
+
+def _renewal_on_grid(beta, eta, horizon, n_steps, method):
+    """
+    Solve the discretized renewal equation on a uniform grid of n_steps intervals.
+
+    beta and eta may be arrays of shape (n,); the solution then has shape (n, n_steps + 1).
+    """
+    t = np.linspace(0, horizon, n_steps + 1)
+    beta = np.asarray(beta, dtype=float)[..., None]
+    eta = np.asarray(eta, dtype=float)[..., None]
+    cdf = -np.expm1(-(t / eta) ** beta)
+    p = np.diff(cdf, prepend=0.0, axis=-1)  # p[i] = P((i-1)h < X <= ih), p[0] = 0
+
+    # Trapezoidal rule on M(t) = F(t) + int_0^t M(t - x) dF(x):
+    # M_n = F_n + sum_i p_i (M_{n-i} + M_{n-i+1}) / 2, i.e. M = F / (1 - Q) with
+    # q_j = (p_j + p_{j+1}) / 2
+    q = 0.5 * p
+    q[..., :-1] += 0.5 * p[..., 1:]
+
+    if method == "direct":
+        renewals = np.zeros_like(cdf)
+        for n in range(1, n_steps + 1):
+            renewals[..., n] = ((cdf[..., n] + (q[..., 1:n + 1] * renewals[..., n - 1::-1]).sum(axis=-1))
+                                / (1 - q[..., 0]))
+    else:
+        one_minus_q = -q
+        one_minus_q[..., 0] += 1.0
+        renewals = _fft_convolve(cdf, _series_inverse(one_minus_q, n_steps + 1), n_steps + 1)
+    return t, renewals
+
+def renewal_function(beta, eta, horizon, n_steps=None, tol=1e-4, max_steps=2**21, method="auto"):
+    """
+    Renewal function M(t) and renewal density m(t) for a Weibull lifetime.
+
+    M(t) is the expected number of failures by time t when every failed unit is
+    replaced with a new one. The renewal equation is discretized with the trapezoidal
+    rule and solved either by direct recursion (short grids) or by FFT-based power
+    series inversion (long grids, O(n log n)).
+
+    The grid is refined by doubling until two successive solutions agree to within
+    `tol` (absolute, in expected failures) or `max_steps` is reached.
+
+    Args:
+        beta (float): Shape parameter
+        eta (float): Scale parameter
+        horizon (float): Time horizon, in the same units as eta
+        n_steps (int): Initial number of grid intervals (default: 1000)
+        tol (float): Target absolute accuracy of M(t)
+        max_steps (int): Upper limit on grid intervals
+        method (str): 'direct', 'fft' or 'auto'
+
+    Returns:
+        dict: Dictionary containing time points, renewal function, renewal density
+              and the achieved error estimate
+    """
+    n_steps = int(n_steps or 1000)
+
+    def solve(steps):
+        chosen = method if method != "auto" else ("direct" if steps <= 2048 else "fft")
+        return _renewal_on_grid(beta, eta, horizon, steps, chosen)
+
+    t, renewals = solve(n_steps)
+    error = np.inf
+    while n_steps < max_steps:
+        fine_t, fine_renewals = solve(2 * n_steps)
+        # Richardson estimate for a second-order scheme
+        error = np.max(np.abs(fine_renewals[::2] - renewals)) / 3
+        t, renewals, n_steps = fine_t, fine_renewals, 2 * n_steps
+        if error <= tol:
+            break
+
+    return {
+        "time": t,
+        "renewal_function": renewals,
+        "renewal_density": np.gradient(renewals, t),
+        "error_estimate": error,
+    }
+
+def optimize_replacement(betas, etas, cost_preventive, cost_failure, policy="age",
+                         num_points=2000, max_age_multiplier=3.0):
+    """
+    Cost-optimal preventive replacement interval for one or many Weibull curves.
+
+    Age replacement replaces a unit at failure or at age T, whichever comes first:
+        C(T) = (Cp * R(T) + Cf * F(T)) / integral_0^T R(t) dt
+    Block replacement replaces every unit at fixed intervals T and on failure:
+        C(T) = (Cp + Cf * M(T)) / T
+    where M is the renewal function.
+
+    All curves are evaluated in one batched call on a grid of ages
+    (0, max_age_multiplier * eta], using the cumulative integral of reliability for
+    the age policy and the batched renewal solver for the block policy.
+
+    Args:
+        betas (array): Shape parameters, one per curve
+        etas (array): Scale parameters, one per curve
+        cost_preventive (float or array): Cost of a planned replacement
+        cost_failure (float or array): Cost of an unplanned (failure) replacement
+        policy (str): 'age' or 'block'
+        num_points (int): Number of grid points per curve
+        max_age_multiplier (float): Grid extends to this multiple of eta
+
+    Returns:
+        dict: Dictionary containing the age grid, cost rate per unit time, optimal
+              replacement age (inf when preventive replacement does not pay off),
+              the optimal cost rate and the run-to-failure cost rate, one row per curve
+    """
+    betas = np.atleast_1d(np.asarray(betas, dtype=float))
+    etas = np.atleast_1d(np.asarray(etas, dtype=float))
+    cost_preventive = np.broadcast_to(np.asarray(cost_preventive, dtype=float), betas.shape)[:, None]
+    cost_failure = np.broadcast_to(np.asarray(cost_failure, dtype=float), betas.shape)[:, None]
+
+    # Work on a grid normalized by eta so every curve shares the same time points
+    u = np.linspace(0, max_age_multiplier, num_points + 1)
+    ages = u[None, :] * etas[:, None]
+
+    if policy == "age":
+        reliability = np.exp(-u[None, :] ** betas[:, None])
+        # Cumulative trapezoid of R(t) gives the expected cycle length for every T at once
+        cycle_length = np.zeros_like(reliability)
+        cycle_length[:, 1:] = np.cumsum((reliability[:, 1:] + reliability[:, :-1]) * 0.5, axis=1) * (u[1] * etas[:, None])
+        cycle_cost = cost_preventive * reliability + cost_failure * (1 - reliability)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cost_rate = cycle_cost / cycle_length
+    elif policy == "block":
+        _, renewals = _renewal_on_grid(betas, np.ones_like(betas), max_age_multiplier, num_points, "fft")
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cost_rate = (cost_preventive + cost_failure * renewals) / ages
+    else:
+        raise ValueError("Policy must be 'age' or 'block'")
+    cost_rate[:, 0] = np.inf
+
+    run_to_failure = cost_failure[:, 0] / (etas * gamma(1 + 1 / betas))
+
+    best = np.argmin(cost_rate, axis=1)
+    rows = np.arange(len(betas))
+    optimal_cost = cost_rate[rows, best]
+    # No interior optimum (or no saving) means running to failure is the better policy
+    worthwhile = (best < num_points) & (optimal_cost < run_to_failure)
+    optimal_age = np.where(worthwhile, ages[rows, best], np.inf)
+
+    return {
+        "ages": ages,
+        "cost_rate": cost_rate,
+        "optimal_age": optimal_age,
+        "optimal_cost_rate": np.where(worthwhile, optimal_cost, run_to_failure),
+        "run_to_failure_cost_rate": run_to_failure,
+    }
+
+def competing_risks(betas, etas, time_points):
+    """
+    Combine independent Weibull failure modes acting on the same asset.
+
+    All mode hazards are evaluated together as one (modes x time) array. The asset
+    survives only if it survives every mode, so R(t) = exp(-sum_i H_i(t)). Each mode's
+    cumulative incidence is its share of the failures in every interval, taken in
+    proportion to its cumulative-hazard increment.
+
+    Args:
+        betas (array): Shape parameters, one per failure mode
+        etas (array): Scale parameters, one per failure mode
+        time_points (array): Increasing time grid starting at 0
+
+    Returns:
+        dict: Dictionary containing system reliability, cause-specific cumulative
+              incidence (modes x time), mode hazards and the index of the dominant
+              (highest-hazard) mode at each time
+    """
+    betas = np.asarray(betas, dtype=float)[:, None]
+    etas = np.asarray(etas, dtype=float)[:, None]
+    t = np.asarray(time_points, dtype=float)[None, :]
+
+    cumulative_hazard = (t / etas) ** betas
+    system_reliability = np.exp(-cumulative_hazard.sum(axis=0))
+
+    hazard_step = np.diff(cumulative_hazard, axis=1)
+    total_step = hazard_step.sum(axis=0)
+    failed_step = -np.diff(system_reliability)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share = np.where(total_step > 0, hazard_step / total_step, 0.0)
+    incidence = np.zeros_like(cumulative_hazard)
+    incidence[:, 1:] = np.cumsum(share * failed_step, axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hazard = (betas / etas) * (t / etas) ** (betas - 1)
+
+    return {
+        "time": t[0],
+        "system_reliability": system_reliability,
+        "cumulative_incidence": incidence,
+        "hazard": hazard,
+        "dominant_mode": np.argmax(hazard, axis=0),
+    }
@@ -1,39 +1,95 @@
 import numpy as np
 from scipy import stats
 from scipy.optimize import curve_fit
+from utils import kernels
 
-def weibull_pdf(x, shape, scale):
+def weibull_pdf(x, shape, scale, out=None):
     """Calculate Weibull PDF values."""
-    return (shape / scale) * (x / scale)**(shape - 1) * np.exp(-(x / scale)**shape)
+    return kernels.weibull_pdf(x, shape, scale, out=out)
 
-def weibull_cdf(x, shape, scale):
+def weibull_cdf(x, shape, scale, out=None):
     """Calculate Weibull CDF values."""
-    return 1 - np.exp(-(x / scale)**shape)
+    return kernels.weibull_cdf(x, shape, scale, out=out)
 
-def weibull_hazard(x, shape, scale):
+def weibull_hazard(x, shape, scale, out=None):
     """Calculate Weibull Hazard Function values."""
-    return (shape / scale) * (x / scale)**(shape - 1)
+    return kernels.weibull_hazard(x, shape, scale, out=out)
 
-def fit_weibull_to_points(x_points, y_points):
-    """Fit Weibull parameters to given CDF points."""
-    try:
-        # For CDF fitting, we use the CDF function
-        def weibull_cdf_fit(x, shape, scale):
-            return 1 - np.exp(-(x / scale)**shape)
-
-        # Fit using CDF points
-        popt, _ = curve_fit(
-            weibull_cdf_fit, 
-            x_points, 
-            y_points, 
-            p0=[2, np.mean(x_points)],  # Better initial guess
-            bounds=([0.1, 0.1], [50, 100])  # Reasonable bounds
-        )
-        return popt[0], popt[1]  # shape, scale
-    except RuntimeError as e:
-        print(f"Fitting error: {str(e)}")
+def fit_weibull_quantile_line(x_points, y_points, weights=None):
+    """
+    Closed-form weighted least-squares fit of the Weibull quantile line.
+
+    Linearizes the CDF as ln(-ln(1 - F)) = shape * ln(x) - shape * ln(scale) and solves
+    the weighted regression of the left side on ln(x) directly. Leading axes are
+    broadcast, so a stack of point sets (..., n_points) is fitted in one call.
+
+    Args:
+        x_points (array): Ages, shape (..., n_points)
+        y_points (array): Cumulative failure fractions in (0, 1), broadcastable to x_points
+        weights (array): Optional non-negative weights, broadcastable to x_points
+
+    Returns:
+        tuple: (shape, scale) arrays with the leading shape of the inputs
+    """
+    log_x = np.log(np.asarray(x_points, dtype=float))
+    y_lin = np.log(-np.log1p(-np.asarray(y_points, dtype=float)))
+    log_x, y_lin = np.broadcast_arrays(log_x, y_lin)
+    w = np.ones_like(log_x) if weights is None else np.broadcast_to(np.asarray(weights, dtype=float), log_x.shape)
+
+    sw = w.sum(axis=-1)
+    mean_x = (w * log_x).sum(axis=-1) / sw
+    mean_y = (w * y_lin).sum(axis=-1) / sw
+    dx = log_x - mean_x[..., None]
+    dy = y_lin - mean_y[..., None]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shape = (w * dx * dy).sum(axis=-1) / (w * dx * dx).sum(axis=-1)
+        scale = np.exp(mean_x - mean_y / shape)
+    return shape, scale
+
+def fit_weibull_to_points(x_points, y_points, weights=None, refine=False):
+    """
+    Fit Weibull parameters to any number of (age, cumulative fraction) CDF points.
+
+    The closed-form quantile-line solution is used directly unless `refine` is set,
+    in which case it seeds an unbounded nonlinear least-squares fit on the CDF itself.
+    """
+    x_points = np.asarray(x_points, dtype=float)
+    y_points = np.asarray(y_points, dtype=float)
+
+    if len(x_points) < 2 or len(np.unique(x_points)) < 2:
+        print("Fitting error: need at least two points with distinct ages")
+        return None, None
+    if np.any(x_points <= 0) or np.any((y_points <= 0) | (y_points >= 1)):
+        print("Fitting error: ages must be positive and fractions strictly between 0 and 1")
+        return None, None
+
+    shape, scale = fit_weibull_quantile_line(x_points, y_points, weights)
+    shape, scale = float(shape), float(scale)
+    if not (np.isfinite(shape) and np.isfinite(scale) and shape > 0):
+        print("Fitting error: points do not describe an increasing CDF")
         return None, None
 
+    if refine:
+        try:
+            def weibull_cdf_fit(x, shape, scale):
+                return 1 - np.exp(-(x / scale)**shape)
+
+            sigma = None if weights is None else 1 / np.sqrt(np.asarray(weights, dtype=float))
+            popt, _ = curve_fit(
+                weibull_cdf_fit,
+                x_points,
+                y_points,
+                p0=[shape, scale],  # Closed-form solution as the starting point
+                sigma=sigma,
+                bounds=([1e-6, 1e-12], [np.inf, np.inf])
+            )
+            shape, scale = float(popt[0]), float(popt[1])
+        except RuntimeError as e:
+            print(f"Fitting error: {str(e)}")
+
+    return shape, scale
+
 def generate_weibull_curve(shape, scale, num_points=100, curve_type='pdf'):
     """Generate points for plotting a Weibull curve."""
     def find_truncation_point(shape, scale):
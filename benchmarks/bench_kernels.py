@@ -0,0 +1,51 @@
+"""
+Benchmark the Weibull curve and likelihood kernels on a 10M-element input.
+
+Run from the repository root:
+    python benchmarks/bench_kernels.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from utils import kernels  # noqa: E402
+
+N = 10_000_000
+SHAPE, SCALE = 2.5, 40.0
+
+
+def measure(label, func, *args, **kwargs):
+    """Time one call after a warm-up call and report the peak traced allocation."""
+    func(*args, **kwargs)  # warm-up (triggers JIT compilation on the numba backend)
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {elapsed * 1000:9.1f} ms   peak alloc {peak / 1e6:9.2f} MB")
+
+
+def main():
+    print(f"backend: {kernels.BACKEND}, n = {N:,}")
+    x = np.random.default_rng(0).weibull(SHAPE, N) * SCALE
+    out = np.empty_like(x)
+
+    measure("pdf (out=)", kernels.weibull_pdf, x, SHAPE, SCALE, out=out)
+    measure("cdf (out=)", kernels.weibull_cdf, x, SHAPE, SCALE, out=out)
+    measure("hazard (out=)", kernels.weibull_hazard, x, SHAPE, SCALE, out=out)
+    measure("loglik sums", kernels.weibull_loglik_sums, x, SHAPE, SCALE)
+
+    reference = (SHAPE / SCALE) * (x / SCALE)**(SHAPE - 1) * np.exp(-(x / SCALE)**SHAPE)
+    measure("pdf (plain numpy)", lambda: (SHAPE / SCALE) * (x / SCALE)**(SHAPE - 1) * np.exp(-(x / SCALE)**SHAPE))
+    kernels.weibull_pdf(x, SHAPE, SCALE, out=out)
+    print(f"max abs diff vs numpy: {np.max(np.abs(out - reference)):.3e}")
+
+
+if __name__ == "__main__":
+    main()
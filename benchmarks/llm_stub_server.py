@@ -0,0 +1,224 @@
+"""
+Local OpenAI-compatible stub of the chat-completions endpoint used for FMEA generation.
+
+Returns schema-valid FMEA JSON for the requested asset type, with configurable latency,
+error rates and streaming speed, so the FMEA page and load tests can run without the
+real API. Point the app at it with:
+    LLM_BASE_URL=http://127.0.0.1:8900/v1 OPENAI_API_KEY=stub streamlit run app/Home.py
+
+Run from the repository root:
+    python benchmarks/llm_stub_server.py --port 8900 --latency 2.0 --rate-limit-rate 0.05
+"""
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from utils.asset_data import get_default_failure_modes  # noqa: E402
+
+GENERIC_MODES = [
+    ("Insulation Degradation", "Thermal aging and moisture ingress", "Reduced dielectric strength, flashover"),
+    ("Contact Wear", "Repeated switching and arcing", "Increased contact resistance, overheating"),
+    ("Mechanism Failure", "Lubricant breakdown and spring fatigue", "Failure to operate on demand"),
+    ("Corrosion", "Environmental exposure and coating damage", "Loss of structural or electrical integrity"),
+    ("Seal Leakage", "Gasket aging and thermal cycling", "Loss of insulating medium, contamination"),
+    ("Control Circuit Fault", "Component aging and wiring damage", "Loss of protection or remote control"),
+    ("Bushing Failure", "Partial discharge and moisture", "Internal flashover, possible fire"),
+    ("Overheating", "Overloading and cooling failure", "Accelerated aging, trip or failure"),
+]
+
+
+class StubSettings:
+    """Behaviour of the stub; adjustable at runtime by tests."""
+
+    def __init__(self, latency=1.0, latency_jitter=0.2, ttfb=0.3, chars_per_second=2000.0,
+                 error_rate=0.0, rate_limit_rate=0.0, n_modes=8, seed=None):
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.ttfb = ttfb
+        self.chars_per_second = chars_per_second
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.n_modes = n_modes
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def draw(self):
+        with self.lock:
+            self.requests += 1
+            return self.rng.random(), max(0.0, self.rng.gauss(self.latency, self.latency * self.latency_jitter))
+
+
+def fmea_content(asset_type, n_modes):
+    """Deterministic, schema-valid FMEA JSON for an asset type."""
+    rng = random.Random(asset_type)
+    modes = []
+    for mode in get_default_failure_modes(asset_type):
+        modes.append({
+            field: mode[field]
+            for field in ("failure_mode", "cause", "effect", "severity", "occurrence", "detection",
+                          "weibull_beta", "weibull_eta", "recommendations")
+        })
+    for name, cause, effect in GENERIC_MODES:
+        if len(modes) >= n_modes:
+            break
+        if any(mode["failure_mode"] == name for mode in modes):
+            continue
+        modes.append({
+            "failure_mode": name,
+            "cause": cause,
+            "effect": effect,
+            "severity": rng.randint(3, 10),
+            "occurrence": rng.randint(2, 8),
+            "detection": rng.randint(2, 8),
+            "weibull_beta": round(rng.uniform(0.8, 4.0), 2),
+            "weibull_eta": rng.randrange(20000, 200000, 1000),
+            "recommendations": "Condition monitoring and periodic inspection",
+        })
+    for mode in modes[:n_modes]:
+        mode["rpn"] = mode["severity"] * mode["occurrence"] * mode["detection"]
+        mode["mttf"] = round(mode["weibull_eta"] * math.gamma(1 + 1 / mode["weibull_beta"]))
+    return json.dumps({"failure_modes": modes[:n_modes]}, indent=2)
+
+
+def make_handler(settings):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def send_json(self, status, payload):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            if status == 429:
+                self.send_header("Retry-After", "1")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def send_event(self, payload):
+            chunk = f"data: {payload}\n\n".encode()
+            self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            self.wfile.flush()
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self.send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "not_found"}})
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            draw, latency = settings.draw()
+
+            if draw < settings.rate_limit_rate:
+                self.send_json(429, {"error": {"message": "Rate limit reached (stub)", "type": "rate_limit_error"}})
+                return
+            if draw < settings.rate_limit_rate + settings.error_rate:
+                self.send_json(500, {"error": {"message": "Internal error (stub)", "type": "server_error"}})
+                return
+
+            user_message = next((m["content"] for m in body.get("messages", []) if m["role"] == "user"), "")
+            match = re.search(r"Generate an FMEA for a (.+?) with", user_message)
+            content = fmea_content(match.group(1) if match else "Unknown Asset", settings.n_modes)
+            usage = {"prompt_tokens": len(json.dumps(body.get("messages", []))) // 4,
+                     "completion_tokens": len(content) // 4}
+            usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+            completion_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+            model = body.get("model", "stub")
+
+            if not body.get("stream"):
+                time.sleep(latency)
+                self.send_json(200, {
+                    "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": content}}],
+                    "usage": usage,
+                })
+                return
+
+            time.sleep(settings.ttfb)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            piece = 40
+            delay = piece / settings.chars_per_second if settings.chars_per_second > 0 else 0.0
+            for start in range(0, len(content), piece):
+                try:
+                    self.send_event(json.dumps({
+                        "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {"content": content[start:start + piece]},
+                                     "finish_reason": None}],
+                    }))
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client closed a stream it no longer needs
+                    self.close_connection = True
+                    return
+                time.sleep(delay)
+            if body.get("stream_options", {}).get("include_usage"):
+                self.send_event(json.dumps({
+                    "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                    "choices": [], "usage": usage,
+                }))
+            self.send_event("[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+            # Clients drop a finished stream's connection; don't wait for another request on it
+            self.close_connection = True
+
+    return StubHandler
+
+
+def start_stub_server(settings=None, host="127.0.0.1", port=0):
+    """
+    Start the stub on a background thread.
+
+    Returns:
+        tuple: (server, base_url); call server.shutdown() to stop it
+    """
+    settings = settings or StubSettings()
+    server = ThreadingHTTPServer((host, port), make_handler(settings))
+    server.daemon_threads = True
+    server.settings = settings
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=1.0, help="Mean seconds per non-streamed completion")
+    parser.add_argument("--latency-jitter", type=float, default=0.2, help="Latency standard deviation, relative to the mean")
+    parser.add_argument("--ttfb", type=float, default=0.3, help="Seconds before the first streamed chunk")
+    parser.add_argument("--chars-per-second", type=float, default=2000.0, help="Streaming speed")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 429")
+    parser.add_argument("--modes", type=int, default=8, help="Failure modes per FMEA")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    settings = StubSettings(args.latency, args.latency_jitter, args.ttfb, args.chars_per_second,
+                            args.error_rate, args.rate_limit_rate, args.modes, args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(settings))
+    server.daemon_threads = True
+    print(f"FMEA stub listening on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Load test of the FMEA flow: generation, Weibull computation and export per session.
+
+Simulates N concurrent sessions, each doing what the FMEA page does after "Generate
+FMEA": request an FMEA through the pooled LLM client, build the per-mode Weibull
+curves, the competing-risks system curve and renewal functions, and produce the CSV,
+Excel and JSON exports. By default an in-process stub serves the completions. The
+FMEA cache and library live in a temporary directory for the run, so --use-cache
+never reads or writes the real ones.
+
+Run from the repository root:
+    python benchmarks/load_test_fmea.py --sessions 20 --latency 2.0
+    python benchmarks/load_test_fmea.py --sessions 50 --stream --rate-limit-rate 0.05
+    python benchmarks/load_test_fmea.py --base-url http://127.0.0.1:8900/v1
+"""
+import argparse
+import gc
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from llm_stub_server import StubSettings, start_stub_server  # noqa: E402
+
+STAGES = ("generation", "weibull", "export", "session")
+ASSET_TYPES = ["Power Transformer", "Circuit Breaker", "Recloser", "Load Tap Changer", "Underground Cable"]
+RENEWAL_HORIZON_HOURS = 10 * 8760
+
+
+def run_session(session_id, stream, use_cache):
+    """One user's pass through the FMEA page; returns stage timings and the session's state."""
+    from utils.openai_service import generate_fmea_with_gpt, stream_fmea_with_gpt
+    from utils.weibull import generate_weibull_data, competing_risks, renewal_function
+    from utils.export import get_csv_download, get_excel_download
+    from utils.fmea_results import FMEAResultStore
+
+    asset_type = ASSET_TYPES[session_id % len(ASSET_TYPES)]
+    characteristics = {"Voltage Class": "138kV", "Session": session_id}
+    timings = {}
+    start = time.perf_counter()
+
+    if stream:
+        failure_modes = list(stream_fmea_with_gpt(asset_type, characteristics, use_cache=use_cache, use_library=False))
+    else:
+        failure_modes = generate_fmea_with_gpt(
+            asset_type, characteristics, use_cache=use_cache, use_library=False
+        )["failure_modes"]
+    timings["generation"] = time.perf_counter() - start
+
+    stage = time.perf_counter()
+    weibull_data = {
+        mode["failure_mode"]: generate_weibull_data(mode["weibull_beta"], mode["weibull_eta"])
+        for mode in failure_modes
+    }
+    betas = np.array([mode["weibull_beta"] for mode in failure_modes])
+    etas = np.array([mode["weibull_eta"] for mode in failure_modes])
+    system = competing_risks(betas, etas, np.linspace(0, etas.max() * 3, 500))
+    renewal = {
+        mode["failure_mode"]: renewal_function(mode["weibull_beta"], mode["weibull_eta"], RENEWAL_HORIZON_HOURS)
+        for mode in failure_modes
+    }
+    timings["weibull"] = time.perf_counter() - stage
+
+    stage = time.perf_counter()
+    fmea_df = FMEAResultStore(failure_modes).table
+    exports = {
+        "csv": get_csv_download(fmea_df, "fmea")[0],
+        "excel": get_excel_download(fmea_df, "fmea")[0],
+        "json": json.dumps({"fmea": failure_modes, "weibull": weibull_data}).encode(),
+    }
+    timings["export"] = time.perf_counter() - stage
+    timings["session"] = time.perf_counter() - start
+
+    state = {"fmea_results": failure_modes, "weibull_data": weibull_data,
+             "system": system, "renewal": renewal, "exports": exports}
+    return timings, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent sessions")
+    parser.add_argument("--rounds", type=int, default=1, help="Times each session repeats the flow")
+    parser.add_argument("--stream", action="store_true", help="Use streaming generation")
+    parser.add_argument("--use-cache", action="store_true", help="Allow FMEA cache hits (off: every call reaches the endpoint)")
+    parser.add_argument("--base-url", default=None, help="Existing OpenAI-compatible endpoint; default starts a stub")
+    parser.add_argument("--latency", type=float, default=1.0, help="Stub: mean seconds per completion")
+    parser.add_argument("--ttfb", type=float, default=0.3, help="Stub: seconds before the first streamed chunk")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Stub: fraction of HTTP 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Stub: fraction of HTTP 429 responses")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Measure memory with tracemalloc (precise, but slows the numeric stages many times over)")
+    args = parser.parse_args()
+
+    server = None
+    if args.base_url is None:
+        server, args.base_url = start_stub_server(StubSettings(
+            latency=args.latency, ttfb=args.ttfb, error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate, seed=0
+        ))
+    os.environ["LLM_BASE_URL"] = args.base_url
+    # Sessions write generations to the FMEA cache and library; both read their path
+    # at import, so point them at a scratch directory before the first app import
+    scratch = tempfile.TemporaryDirectory(prefix="fmea_load_test_")
+    os.environ["FMEA_CACHE_PATH"] = os.path.join(scratch.name, "fmea_cache.sqlite3")
+    os.environ["FMEA_LIBRARY_PATH"] = os.path.join(scratch.name, "fmea_library.sqlite3")
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ.setdefault("LLM_METRICS_LOG_LEVEL", "WARNING")
+    os.environ.setdefault("LLM_MAX_CONNECTIONS", str(max(args.sessions, 20)))
+
+    from utils.llm_client import llm_metrics
+
+    # Warm imports and the pooled client so they are not attributed to the first sessions
+    run_session(0, args.stream, use_cache=False)
+    llm_metrics.clear()
+
+    gc.collect()
+    # Peak RSS in KB on Linux; only grows, so the delta is the peak added by the sessions
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if args.trace_memory:
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+
+    timings = {stage: [] for stage in STAGES}
+    states = []
+    errors = []
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        futures = [pool.submit(run_session, i, args.stream, args.use_cache)
+                   for _ in range(args.rounds) for i in range(args.sessions)]
+        for future in futures:
+            try:
+                session_timings, state = future.result()
+            except Exception as e:
+                errors.append(str(e))
+                continue
+            for stage in STAGES:
+                timings[stage].append(session_timings[stage])
+            states.append(state)
+    wall = time.perf_counter() - wall_start
+
+    gc.collect()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if args.trace_memory:
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    if server is not None:
+        server.shutdown()
+    scratch.cleanup()
+
+    completed = len(states)
+    print(f"endpoint: {args.base_url}   sessions: {args.sessions} x {args.rounds} rounds   "
+          f"stream: {args.stream}   cache: {args.use_cache}")
+    print(f"completed {completed}, failed {len(errors)} in {wall:.2f} s ({completed / wall:.2f} sessions/s)")
+    print(f"{'stage':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for stage in STAGES:
+        if timings[stage]:
+            p50, p95, p99 = np.percentile(timings[stage], [50, 95, 99]) * 1000
+            print(f"{stage:<12}{p50:10.1f}{p95:10.1f}{p99:10.1f}{max(timings[stage]) * 1000:10.1f}")
+
+    calls = llm_metrics.records()
+    if calls:
+        ttfb = [call["ttfb_seconds"] for call in calls if call["ttfb_seconds"] is not None]
+        queue = [call["queue_seconds"] for call in calls]
+        print(f"LLM calls: {len(calls)}, retries {sum(call['retries'] for call in calls)}, "
+              f"ttfb p50/p95 {np.percentile(ttfb, 50) * 1000:.0f}/{np.percentile(ttfb, 95) * 1000:.0f} ms, "
+              f"queue p95 {np.percentile(queue, 95) * 1000:.0f} ms")
+    if completed:
+        print(f"memory per session: peak RSS growth {(peak_rss - baseline_rss) / completed / 1024:.2f} MB")
+        if args.trace_memory:
+            print(f"memory per session: retained {(retained - baseline) / completed / 1e6:.2f} MB, "
+                  f"peak {(peak - baseline) / completed / 1e6:.2f} MB (traced Python allocations)")
+    for error in errors[:5]:
+        print(f"error: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import json
+import os
+
+from utils.fmea_stream import FailureModeStreamParser, replay_text_stream
+from utils.openai_service import stream_fmea_with_gpt
+
+# Streamed completion for a Circuit Breaker, recorded with record_text_stream(); the
+# response has a "notes" object after the failure_modes array
+RECORDING = os.path.join(os.path.dirname(__file__), "data", "fmea_stream_circuit_breaker.jsonl")
+
+
+def test_replayed_stream_yields_every_failure_mode():
+    full_text = "".join(replay_text_stream(RECORDING, speed=0))
+    expected = json.loads(full_text)["failure_modes"]
+
+    modes = list(stream_fmea_with_gpt(
+        "Circuit Breaker", {"Voltage Class": "138kV"}, use_cache=False, use_library=False,
+        text_stream=replay_text_stream(RECORDING, speed=0)
+    ))
+
+    assert [mode["failure_mode"] for mode in modes] == [mode["failure_mode"] for mode in expected]
+    assert all(mode["rpn"] == mode["severity"] * mode["occurrence"] * mode["detection"] for mode in modes)
+
+
+def test_parser_stops_at_the_end_of_the_array():
+    text = (
+        '{"failure_modes": [{"failure_mode": "A", "notes": ["]", {"x": 1}]}, {"other": 1}, '
+        '{"failure_mode": "B"}], "notes": {"model": "m"}}'
+    )
+    for step in (1, 5, len(text)):
+        parser = FailureModeStreamParser()
+        modes = []
+        for start in range(0, len(text), step):
+            modes.extend(parser.feed(text[start:start + step]))
+        assert [mode["failure_mode"] for mode in modes] == ["A", "B"]
+        assert parser.full_text() == text
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+from scipy.stats import weibull_min
+
+from components.mle_fitting import fit_weibull_mle
+
+
+@pytest.mark.parametrize("scale", [0.01, 1.0, 1000.0, 1e4, 1e6])
+@pytest.mark.parametrize("shape", [0.7, 1.5, 3.5])
+def test_fit_matches_scipy_whatever_the_time_unit(shape, scale):
+    lifetimes = weibull_min.rvs(shape, scale=scale, size=500, random_state=np.random.default_rng(7))
+
+    fitted_shape, fitted_scale = fit_weibull_mle(lifetimes)
+    expected_shape, _, expected_scale = weibull_min.fit(lifetimes, floc=0)
+
+    assert fitted_shape == pytest.approx(expected_shape, rel=1e-3)
+    assert fitted_scale == pytest.approx(expected_scale, rel=1e-3)
+
+
+def test_fit_is_invariant_to_the_time_unit():
+    lifetimes = weibull_min.rvs(2.0, scale=1.0, size=200, random_state=np.random.default_rng(11))
+
+    shape_hours, scale_hours = fit_weibull_mle(lifetimes * 8760)
+    shape_years, scale_years = fit_weibull_mle(lifetimes)
+
+    assert shape_hours == pytest.approx(shape_years, rel=1e-4)
+    assert scale_hours == pytest.approx(scale_years * 8760, rel=1e-4)